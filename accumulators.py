@@ -0,0 +1,513 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from duplicates import DuplicateAccumulator
+from quality import QualityAccumulator, factorize_labels
+from sketches import SketchAccumulator
+from text_kernel import code_points, count_words, text_lengths_and_word_counts
+from vocabulary import VocabularyAccumulator
+
+# 저장된 통계 상태 형식이 바뀌면 올려서 이전 상태 파일을 잘못 읽지 않도록 함
+STATE_VERSION = 3
+# CSV를 읽을 때 고정하는 컬럼 타입: 덩어리/샤드마다 타입을 따로 추론하면 결측 레이블이 있는
+# 덩어리만 float(2.0)이 되어 레이블 키가 달라지므로 text, target은 문자열로 읽음
+CSV_DTYPES = {"text": str, "target": str}
+
+
+class TextStatsAccumulator:
+    """텍스트 길이/단어 수 통계를 위한 병합 가능한 누적기"""
+
+    def __init__(self):
+        self.count = 0
+        self.length_sum = 0
+        self.word_sum = 0
+        # 길이별 행 수 (행을 빼도 최솟값/최댓값을 정확히 유지하기 위함)
+        self.length_counts = {}
+
+    @property
+    def length_min(self):
+        return min(self.length_counts) if self.length_counts else None
+
+    @property
+    def length_max(self):
+        return max(self.length_counts) if self.length_counts else None
+
+    def update(self, texts):
+        """텍스트 Series 한 덩어리를 누적"""
+        lengths, word_counts = text_lengths_and_word_counts(texts.dropna())
+        self.update_arrays(lengths, word_counts)
+
+    def update_arrays(self, lengths, word_counts):
+        """미리 계산된 길이/단어 수 배열을 누적"""
+        if len(lengths) == 0:
+            return
+        self.count += len(lengths)
+        self.length_sum += int(lengths.sum())
+        self.word_sum += int(word_counts.sum())
+        histogram = np.bincount(lengths)
+        for length in np.flatnonzero(histogram).tolist():
+            self.length_counts[length] = self.length_counts.get(length, 0) + int(
+                histogram[length]
+            )
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합"""
+        self.count += other.count
+        self.length_sum += other.length_sum
+        self.word_sum += other.word_sum
+        for length, count in other.length_counts.items():
+            self.length_counts[length] = self.length_counts.get(length, 0) + count
+        return self
+
+    def subtract(self, other):
+        """다른 누적기에 누적된 행들을 이 상태에서 제거"""
+        self.count -= other.count
+        self.length_sum -= other.length_sum
+        self.word_sum -= other.word_sum
+        for length, count in other.length_counts.items():
+            remaining = self.length_counts.get(length, 0) - count
+            if remaining < 0:
+                raise ValueError("제거할 행이 기준 통계 상태에 없습니다")
+            if remaining:
+                self.length_counts[length] = remaining
+            else:
+                del self.length_counts[length]
+        return self
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "length_sum": self.length_sum,
+            "word_sum": self.word_sum,
+            "length_counts": sorted(self.length_counts.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        accumulator = cls()
+        accumulator.count = state["count"]
+        accumulator.length_sum = state["length_sum"]
+        accumulator.word_sum = state["word_sum"]
+        accumulator.length_counts = dict(
+            (length, count) for length, count in state["length_counts"]
+        )
+        return accumulator
+
+    def result(self):
+        """text_statistics 형식의 결과 반환"""
+        if self.count == 0:
+            nan = float("nan")
+            return {
+                "avg_length": nan,
+                "max_length": nan,
+                "min_length": nan,
+                "total_words": 0,
+                "avg_words": nan,
+            }
+        return {
+            "avg_length": self.length_sum / self.count,
+            "max_length": self.length_max,
+            "min_length": self.length_min,
+            "total_words": self.word_sum,
+            "avg_words": self.word_sum / self.count,
+        }
+
+
+def _to_json_label(label):
+    """numpy 스칼라 레이블을 JSON으로 저장 가능한 파이썬 값으로 변환"""
+    return label.item() if isinstance(label, np.generic) else label
+
+
+def _canonical_label_list(labels):
+    """저장된 상태의 레이블 목록을 정규 문자열로 변환 (이전 버전 상태의 숫자 레이블 호환)"""
+    codes, canonical = factorize_labels(labels)
+    return canonical[codes].tolist()
+
+
+class TargetAccumulator:
+    """
+    타겟 레이블 빈도를 위한 병합 가능한 누적기
+    레이블은 정규 문자열로 누적하므로 CSV("2")와 DataFrame(2, 2.0)에서 만든 상태를 병합해도 같은 레이블이 된다.
+    """
+
+    def __init__(self):
+        # 레이블 최초 등장 순서를 유지 (value_counts의 동률 정렬 순서와 일치)
+        self.counts = {}
+        self.total = 0
+
+    def update(self, targets):
+        """타겟 Series 한 덩어리를 누적"""
+        self.total += len(targets)
+        codes, labels = factorize_labels(targets)
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        for label, count in zip(labels.tolist(), counts.tolist()):
+            self.counts[label] = self.counts.get(label, 0) + count
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합"""
+        self.total += other.total
+        for label, count in other.counts.items():
+            self.counts[label] = self.counts.get(label, 0) + count
+        return self
+
+    def subtract(self, other):
+        """다른 누적기에 누적된 행들을 이 상태에서 제거"""
+        self.total -= other.total
+        for label, count in other.counts.items():
+            remaining = self.counts.get(label, 0) - count
+            if remaining < 0:
+                raise ValueError("제거할 행이 기준 통계 상태에 없습니다")
+            if remaining:
+                self.counts[label] = remaining
+            else:
+                del self.counts[label]
+        return self
+
+    def to_dict(self):
+        # 최초 등장 순서를 유지하도록 [레이블, 개수] 목록으로 저장
+        return {
+            "total": self.total,
+            "counts": [
+                [_to_json_label(label), count] for label, count in self.counts.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        accumulator = cls()
+        accumulator.total = state["total"]
+        if state["counts"]:
+            labels, counts = zip(*state["counts"])
+            for label, count in zip(_canonical_label_list(labels), counts):
+                accumulator.counts[label] = accumulator.counts.get(label, 0) + count
+        return accumulator
+
+    def result(self):
+        """target_distribution 형식의 결과 반환"""
+        target_counts = dict(
+            sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        )
+        return {
+            "class_distribution": target_counts,
+            "num_classes": len(target_counts),
+            "class_balance": {
+                str(label): count / self.total for label, count in target_counts.items()
+            },
+        }
+
+
+class ClassTextStatsAccumulator:
+    """
+    타겟 레이블별 텍스트 길이/단어 수 분포를 위한 병합 가능한 누적기
+
+    (레이블, 값)별 행 수 히스토그램만 보관하므로 크기는 레이블 수 x 서로 다른 길이 수로 제한되며,
+    평균/최솟값/최댓값/분위수를 모든 레이블에 대해 한 번의 벡터 연산으로 정확히 계산한다.
+    레이블은 TargetAccumulator와 같이 정규 문자열로 누적한다.
+    """
+
+    QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+    def __init__(self):
+        self.length_counts = self._empty()
+        self.word_counts = self._empty()
+
+    @staticmethod
+    def _empty():
+        return pd.Series(
+            [],
+            index=pd.MultiIndex.from_arrays([[], []], names=["target", "value"]),
+            dtype=np.int64,
+        )
+
+    @staticmethod
+    def _histogram(targets, values):
+        """(레이블, 값) 쌍별 행 수 (결측 레이블 제외)"""
+        codes, labels = factorize_labels(targets)
+        valid = codes >= 0
+        width = int(values.max()) + 1 if len(values) else 1
+        pairs, counts = np.unique(
+            codes[valid].astype(np.int64) * width + values[valid], return_counts=True
+        )
+        index = pd.MultiIndex.from_arrays(
+            [np.asarray(labels, dtype=object)[pairs // width], pairs % width],
+            names=["target", "value"],
+        )
+        return pd.Series(counts.astype(np.int64), index=index)
+
+    @staticmethod
+    def _combine(a, b, sign=1):
+        combined = a.add(sign * b, fill_value=0).astype(np.int64)
+        if (combined < 0).any():
+            raise ValueError("제거할 행이 기준 통계 상태에 없습니다")
+        return combined[combined > 0]
+
+    def update_arrays(self, targets, lengths, word_counts):
+        """결측치를 제외한 텍스트의 타겟과 미리 계산된 길이/단어 수 배열을 누적"""
+        targets = np.asarray(targets, dtype=object)
+        self.length_counts = self._combine(
+            self.length_counts, self._histogram(targets, lengths)
+        )
+        self.word_counts = self._combine(
+            self.word_counts, self._histogram(targets, word_counts)
+        )
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합"""
+        self.length_counts = self._combine(self.length_counts, other.length_counts)
+        self.word_counts = self._combine(self.word_counts, other.word_counts)
+        return self
+
+    def subtract(self, other):
+        """다른 누적기에 누적된 행들을 이 상태에서 제거"""
+        self.length_counts = self._combine(self.length_counts, other.length_counts, -1)
+        self.word_counts = self._combine(self.word_counts, other.word_counts, -1)
+        return self
+
+    @staticmethod
+    def _to_rows(counts):
+        return [
+            [_to_json_label(label), int(value), int(count)]
+            for (label, value), count in counts.items()
+        ]
+
+    @staticmethod
+    def _from_rows(rows):
+        if not rows:
+            return ClassTextStatsAccumulator._empty()
+        labels, values, counts = zip(*rows)
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.asarray(_canonical_label_list(labels), dtype=object),
+                np.asarray(values, dtype=np.int64),
+            ],
+            names=["target", "value"],
+        )
+        counts = pd.Series(np.asarray(counts, dtype=np.int64), index=index)
+        return counts.groupby(level=["target", "value"], sort=False).sum()
+
+    def to_dict(self):
+        return {
+            "length_counts": self._to_rows(self.length_counts),
+            "word_counts": self._to_rows(self.word_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        accumulator = cls()
+        accumulator.length_counts = cls._from_rows(state["length_counts"])
+        accumulator.word_counts = cls._from_rows(state["word_counts"])
+        return accumulator
+
+    @classmethod
+    def _summarize(cls, counts, labels):
+        """
+        레이블별 히스토그램에서 평균/최솟값/최댓값/분위수를 한 번에 계산
+        분위수는 np.percentile 기본값(linear)과 같은 보간을 사용
+        """
+        table = counts.reset_index(name="count")
+        table["code"] = pd.Categorical(table["target"], categories=labels).codes
+        table = table.sort_values(["code", "value"], kind="stable")
+        codes = table["code"].to_numpy()
+        values = table["value"].to_numpy(dtype=np.float64)
+        weights = table["count"].to_numpy()
+
+        totals = np.bincount(codes, weights=weights, minlength=len(labels))
+        cumulative = np.cumsum(weights)
+        offsets = np.cumsum(totals) - totals
+        first = np.searchsorted(cumulative, offsets, side="right")
+        last = np.searchsorted(cumulative, offsets + totals - 1, side="right")
+        summary = {
+            "num_samples": totals.astype(np.int64),
+            "mean": np.bincount(codes, weights=values * weights, minlength=len(labels))
+            / totals,
+            "min": values[first],
+            "max": values[last],
+        }
+        for name, q in cls.QUANTILES.items():
+            rank = q * (totals - 1)
+            lower = values[
+                np.searchsorted(cumulative, offsets + np.floor(rank), side="right")
+            ]
+            upper = values[
+                np.searchsorted(cumulative, offsets + np.ceil(rank), side="right")
+            ]
+            summary[name] = lower + (upper - lower) * (rank - np.floor(rank))
+        return summary
+
+    def result(self, labels):
+        """
+        class_text_statistics 형식의 결과 반환
+        labels: 결과에 기록할 레이블 순서 (텍스트가 있는 레이블만 기록)
+        """
+        present = set(self.length_counts.index.get_level_values("target"))
+        labels = [label for label in labels if label in present]
+        if not labels:
+            return {}
+        lengths = self._summarize(self.length_counts, labels)
+        words = self._summarize(self.word_counts, labels)
+        stats = ["mean", "min", "max", *self.QUANTILES]
+
+        def _value(summary, name, i):
+            value = summary[name][i]
+            return int(value) if name in ("min", "max") else float(value)
+
+        return {
+            str(label): {
+                "num_samples": int(lengths["num_samples"][i]),
+                "length": {name: _value(lengths, name, i) for name in stats},
+                "words": {name: _value(words, name, i) for name in stats},
+            }
+            for i, label in enumerate(labels)
+        }
+
+
+class DatasetAccumulator:
+    """
+    generate_full_metadata에 필요한 모든 통계를 담는 병합 가능한 상태
+    approximate: True면 분위수/고유 텍스트 수/빈출 텍스트 스케치도 함께 누적
+    duplicates: True면 완전/근사 중복 보고서를 위한 텍스트 해시와 MinHash 밴드 키도 누적
+    vocabulary: True 또는 VocabularyAccumulator 옵션 dict면 어휘/빈출 토큰/bigram 요약도 누적
+    quality: True 또는 QualityAccumulator 옵션 dict면 품질 검사 결과도 누적
+    """
+
+    def __init__(
+        self, approximate=False, duplicates=False, vocabulary=False, quality=False
+    ):
+        self.columns = None
+        self.num_rows = 0
+        self.text = TextStatsAccumulator()
+        self.target = TargetAccumulator()
+        self.class_text = ClassTextStatsAccumulator()
+        self.sketches = SketchAccumulator() if approximate else None
+        self.duplicates = DuplicateAccumulator() if duplicates else None
+        self.vocabulary = (
+            VocabularyAccumulator(
+                **(vocabulary if isinstance(vocabulary, dict) else {})
+            )
+            if vocabulary
+            else None
+        )
+        self.quality = (
+            QualityAccumulator(**(quality if isinstance(quality, dict) else {}))
+            if quality
+            else None
+        )
+
+    def update(self, chunk):
+        """DataFrame 한 덩어리를 누적"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        self.num_rows += len(chunk)
+        # 길이/단어 수는 덩어리마다 한 번만 계산하여 모든 통계에서 재사용
+        # 인덱스가 중복된 DataFrame(concat 결과 등)에서도 같은 행을 고르도록 레이블이 아닌 위치로 선택
+        mask = chunk["text"].notna().to_numpy()
+        texts = chunk["text"][mask]
+        codepoints, lengths = code_points(texts)
+        word_counts = count_words(codepoints, lengths)
+        self.text.update_arrays(lengths, word_counts)
+        self.target.update(chunk["target"])
+        targets = chunk["target"][mask]
+        self.class_text.update_arrays(targets, lengths, word_counts)
+        if self.sketches:
+            self.sketches.update(texts, lengths, word_counts)
+        if self.duplicates:
+            self.duplicates.update(texts, targets)
+        if self.vocabulary:
+            self.vocabulary.update(texts, targets)
+        if self.quality:
+            self.quality.update(chunk, texts, codepoints, lengths)
+        return self
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합 (데이터셋 순서대로 병합해야 함)"""
+        if self.columns is None:
+            self.columns = other.columns
+        self.num_rows += other.num_rows
+        self.text.merge(other.text)
+        self.target.merge(other.target)
+        self.class_text.merge(other.class_text)
+        if self.sketches and other.sketches:
+            self.sketches.merge(other.sketches)
+        if self.duplicates and other.duplicates:
+            self.duplicates.merge(other.duplicates)
+        if self.vocabulary and other.vocabulary:
+            self.vocabulary.merge(other.vocabulary)
+        if self.quality and other.quality:
+            self.quality.merge(other.quality)
+        return self
+
+    def subtract(self, other):
+        """다른 누적기에 누적된 행들을 이 상태에서 제거 (정확한 통계만 지원)"""
+        if self.sketches or self.duplicates or self.vocabulary or self.quality:
+            raise ValueError(
+                "근사 통계, 중복 보고서, 어휘 통계, 품질 검사는 행 제거를 지원하지 않습니다"
+            )
+        self.num_rows -= other.num_rows
+        self.text.subtract(other.text)
+        self.target.subtract(other.target)
+        self.class_text.subtract(other.class_text)
+        return self
+
+    def to_dict(self):
+        """정확한 통계 상태를 JSON으로 저장 가능한 dict로 변환 (스케치/중복/어휘/품질 검사 상태는 제외)"""
+        return {
+            "version": STATE_VERSION,
+            "columns": self.columns,
+            "num_rows": self.num_rows,
+            "text": self.text.to_dict(),
+            "target": self.target.to_dict(),
+            "class_text": self.class_text.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"지원하지 않는 통계 상태 버전: {state.get('version')}")
+        accumulator = cls()
+        accumulator.columns = state["columns"]
+        accumulator.num_rows = state["num_rows"]
+        accumulator.text = TextStatsAccumulator.from_dict(state["text"])
+        accumulator.target = TargetAccumulator.from_dict(state["target"])
+        accumulator.class_text = ClassTextStatsAccumulator.from_dict(
+            state["class_text"]
+        )
+        return accumulator
+
+
+def accumulate(chunks, on_chunk=None, **options):
+    """
+    DataFrame 덩어리들을 순서대로 읽어 DatasetAccumulator로 누적
+    on_chunk: 덩어리 하나를 누적할 때마다 현재 상태를 인자로 호출되는 콜백
+    options: DatasetAccumulator 옵션
+    """
+    state = DatasetAccumulator(**options)
+    for chunk in chunks:
+        state.update(chunk)
+        if on_chunk:
+            on_chunk(state)
+    return state
+
+
+def read_csv_chunks(source, chunksize, **kwargs):
+    """CSV를 chunksize 행 단위로 읽는 이터레이터"""
+    kwargs.setdefault("dtype", CSV_DTYPES)
+    return pd.read_csv(source, chunksize=chunksize, **kwargs)
+
+
+def state_path_for(metadata_path):
+    """메타데이터 JSON 옆에 저장할 통계 상태 파일 경로 (metadata.json -> metadata.state.json)"""
+    root, _ = os.path.splitext(metadata_path)
+    return f"{root}.state.json"
+
+
+def save_state(state, path):
+    """병합 가능한 통계 상태를 JSON 파일로 저장"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f, ensure_ascii=False)
+
+
+def load_state(path):
+    """save_state로 저장한 통계 상태 읽기"""
+    with open(path, encoding="utf-8") as f:
+        return DatasetAccumulator.from_dict(json.load(f))
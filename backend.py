@@ -1,27 +1,128 @@
-import pandas as pd
-import numpy as np
-import json
+import asyncio
+import contextlib
+import contextvars
+import hashlib
 import io
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from starlette.formparsers import MultiPartException, MultiPartParser
 from metadata_generator import MetadataGenerator
-from drive_manager import GoogleDriveManager
+from preview import preview_metadata
+from jobs import JobManager, FAILED
+from cache import MetadataCache
+from catalog import DatasetCatalog
+from columnar import FORMATS
+from compression import CODECS, MIMETYPE_CODECS
+from config import setting
+from metadata_model import SCHEMA_VERSION
+from storage import get_storage
+from instrumentation import (
+    REQUEST_LATENCY,
+    REQUESTS,
+    Profile,
+    activate,
+    registry,
+    stage,
+)
+
+# 작업 하나가 한 번에 파싱하는 최대 행 수 (행 단위 상한이므로 메모리 사용량은 행 길이에 비례)
+STREAM_CHUNKSIZE = int(os.getenv("METADATA_STREAM_CHUNKSIZE", "100000"))
+# 업로드 파일 중 메모리에 유지할 최대 바이트 수 (초과분은 디스크 임시 파일로 스풀)
+SPOOL_MAX_SIZE = int(os.getenv("METADATA_SPOOL_MAX_SIZE", str(1024 * 1024)))
+# 동시에 실행할 수 있는 메타데이터 생성 작업 수
+JOB_WORKERS = int(os.getenv("METADATA_JOB_WORKERS", "4"))
+
+
+# 미리보기 표본 최대 행 수와 입력을 읽는 시간 상한(초) - /preview 요청에서 지정할 수 있는 최댓값
+PREVIEW_SAMPLE_SIZE = int(os.getenv("METADATA_PREVIEW_SAMPLE_SIZE", "10000"))
+PREVIEW_BUDGET_SECONDS = float(os.getenv("METADATA_PREVIEW_BUDGET_SECONDS", "2.0"))
+
+job_manager = JobManager(max_workers=JOB_WORKERS)
+# 데이터셋 내용 해시 기반 통계 캐시(메모리 LRU + 디스크)와 드라이브에 올린 파일의 로컬 카탈로그(SQLite)
+# import만으로 실행 디렉토리에 파일을 만들지 않도록 앱 시작 시(lifespan) open_stores에서 연다
+metadata_cache = None
+catalog = None
+
+
+def open_stores():
+    """settings.yaml의 cache/catalog 항목(환경 변수가 우선)으로 통계 캐시와 카탈로그를 연다 (이미 열려 있으면 유지)"""
+    global metadata_cache, catalog
+    if metadata_cache is None:
+        metadata_cache = MetadataCache(
+            setting("cache", "dir", "METADATA_CACHE_DIR", "./cache"),
+            int(
+                setting(
+                    "cache", "memory_bytes", "METADATA_CACHE_MEMORY_BYTES", 64 * 1024**2
+                )
+            ),
+            int(setting("cache", "disk_bytes", "METADATA_CACHE_DISK_BYTES", 1024**3)),
+        )
+    if catalog is None:
+        catalog = DatasetCatalog(
+            setting("catalog", "path", "METADATA_CATALOG_PATH", "./catalog.sqlite3")
+        )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(open_stores)
+    yield
+
+
+class _UploadParser(MultiPartParser):
+    """업로드 파일을 spool_max_size 바이트까지만 메모리에 두는 멀티파트 파서"""
 
+    def __init__(self, headers, stream, spool_max_size, **kwargs):
+        super().__init__(headers, stream, **kwargs)
+        self.spool_max_size = spool_max_size
 
-# NumPy 타입을 처리하기 위한 커스텀 JSONEncoder
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super().default(obj)
 
+class SpoolingRequest(Request):
+    """멀티파트 본문을 SPOOL_MAX_SIZE 기준으로 스풀하는 요청 (Starlette 전역 설정은 바꾸지 않음)"""
 
-app = FastAPI()
+    def __init__(self, scope, receive):
+        super().__init__(scope, receive)
+        self._upload_form = None
+
+    async def form(self, **kwargs):
+        content_type = self.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return await super().form(**kwargs)
+        if self._upload_form is None:
+            parser = _UploadParser(
+                self.headers, self.stream(), SPOOL_MAX_SIZE, **kwargs
+            )
+            try:
+                self._upload_form = await parser.parse()
+            except MultiPartException as exc:
+                raise HTTPException(status_code=400, detail=exc.message)
+        return self._upload_form
+
+
+class SpoolingRoute(APIRoute):
+    """엔드포인트에 SpoolingRequest를 넘기는 라우트"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request):
+            return await handler(SpoolingRequest(request.scope, request.receive))
+
+        return route_handler
+
+
+app = FastAPI(lifespan=lifespan)
+# 라우트를 등록하기 전에 지정해야 모든 엔드포인트에 적용됨
+app.router.route_class = SpoolingRoute
 
 # CORS 설정
 app.add_middleware(
@@ -33,9 +134,37 @@ app.add_middleware(
 )
 
 
-@app.post("/generate_metadata")
-async def generate_metadata(
-    file: UploadFile = File(...),
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """요청 수와 지연 시간을 라우트 경로 템플릿(/jobs/{job_id} 등) 단위로 기록"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUESTS.inc(method=request.method, route=path, status=status)
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start, method=request.method, route=path
+        )
+
+
+def _quality_option(quality, expected_labels):
+    """
+    quality/expected_labels 폼 필드를 MetadataGenerator의 quality 옵션으로 변환
+    expected_labels: 허용하는 레이블을 쉼표로 구분한 문자열 (예: "0,1,2")
+    """
+    if not quality:
+        return None
+    labels = [label.strip() for label in (expected_labels or "").split(",")]
+    labels = [label for label in labels if label]
+    return {"expected_labels": labels} if labels else True
+
+
+def metadata_form(
     creator: str = Form(None),
     datasetname: str = Form(None),
     description: str = Form(None),
@@ -43,59 +172,563 @@ async def generate_metadata(
     labeling_methods: str = Form(None),
     augmentation_methods: str = Form(None),
     is_gdrive_upload: bool = Form(None),
+    compression: str = Form(None),
+    approximate: bool = Form(None),
+    duplicates: bool = Form(None),
+    vocabulary: bool = Form(None),
+    quality: bool = Form(None),
+    expected_labels: str = Form(None),
+    profile: bool = Form(None),
+    preview: bool = Form(None),
+):
+    """메타데이터 생성 요청의 폼 필드"""
+    return {
+        "creator": creator,
+        "datasetname": datasetname,
+        "description": description,
+        "preprocessing_steps": preprocessing_steps,
+        "labeling_methods": labeling_methods,
+        "augmentation_methods": augmentation_methods,
+        "is_gdrive_upload": is_gdrive_upload,
+        "compression": compression,
+        "approximate": approximate,
+        "duplicates": duplicates,
+        "vocabulary": vocabulary,
+        "quality": _quality_option(quality, expected_labels),
+        "profile": profile,
+        "preview": preview,
+    }
+
+
+def _option_key(name, value):
+    """캐시 키에 넣을 옵션 이름 (True가 아닌 옵션 값은 값의 해시를 붙여 구분)"""
+    if value is True:
+        return name
+    digest = hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+    return f"{name}_{digest[:16]}"
+
+
+def cache_key_for(content_hash, **options):
+    """
+    데이터셋 내용 해시와 켜진 통계 옵션으로 캐시 키 생성
+    메타데이터 스키마 버전도 포함하여 통계 항목이 바뀌면 이전 버전의 캐시 항목을 쓰지 않음
+    """
+    enabled = [
+        _option_key(name, value) for name, value in sorted(options.items()) if value
+    ]
+    return "-".join([content_hash, f"v{SCHEMA_VERSION}"] + enabled)
+
+
+def _check_content_hash(content_hash):
+    """클라이언트가 보낸 SHA-256 해시 검증 (캐시 파일 이름에 쓰이므로 형식을 엄격히 확인)"""
+    if not re.fullmatch(r"[0-9a-f]{64}", content_hash or ""):
+        raise ValueError("content_hash는 소문자 16진수 SHA-256 해시여야 합니다")
+    return content_hash
+
+
+def find_uploaded_dataset(storage, content_hash, content_md5=None):
+    """
+    같은 내용 해시로 이미 업로드한 데이터셋 파일을 카탈로그에서 찾고 저장소에 그대로 있는지 확인
+    반환: 카탈로그 행 (없으면 None)
+    """
+    _, candidates = catalog.search(content_hash=content_hash, kind="dataset", limit=10)
+    for candidate in candidates:
+        file = storage.get_file(candidate["file_id"])
+        if file is None or file.get("trashed"):
+            # 저장소에서 지워진 파일은 카탈로그에서도 정리
+            catalog.apply_changes([{"fileId": candidate["file_id"], "removed": True}])
+            continue
+        # 압축 없이 올린 파일은 저장소가 계산한 md5Checksum으로 같은 바이트인지 한 번 더 확인
+        if (
+            content_md5
+            and file.get("md5Checksum")
+            and file.get("mimeType") not in MIMETYPE_CODECS
+            and file["md5Checksum"] != content_md5
+        ):
+            continue
+        return candidate
+    return None
+
+
+def _input_suffix(filename):
+    """업로드 파일 이름의 확장자 (지원하는 컬럼 기반 포맷이 아니면 .csv)"""
+    _, ext = os.path.splitext(filename or "")
+    return ext.lower() if ext.lower() in FORMATS else ".csv"
+
+
+def _spool_upload(fileobj, suffix=".csv", block_size=1 << 20):
+    """
+    요청이 끝나도 작업이 읽을 수 있도록 업로드 파일을 임시 파일로 복사
+    복사하면서 캐시 키로 쓸 내용 해시를 함께 계산
+    반환: (임시 파일 경로, SHA-256 해시)
+    """
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    # 입력 포맷은 확장자로 판별하므로 원본 확장자를 유지
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        for block in iter(lambda: fileobj.read(block_size), b""):
+            digest.update(block)
+            tmp.write(block)
+    return tmp.name, digest.hexdigest()
+
+
+def run_metadata_job(
+    job,
+    path,
+    content_hash=None,
+    creator=None,
+    datasetname=None,
+    description=None,
+    preprocessing_steps=None,
+    labeling_methods=None,
+    augmentation_methods=None,
+    is_gdrive_upload=None,
+    compression=None,
+    approximate=None,
+    duplicates=None,
+    vocabulary=None,
+    quality=None,
+    preview=None,
+    statistics=None,
+    existing_dataset=None,
+    profile=None,
 ):
+    """
+    메타데이터 생성 및 GDrive 업로드 작업 (작업 풀에서 실행)
+    path: 스풀한 업로드 파일 (해시 핸드셰이크로 본문 없이 제출한 경우 None)
+    statistics: 제출 시 조회한 캐시된 통계 (본문 없이 제출한 경우)
+    existing_dataset: 드라이브에 이미 있는 같은 내용의 데이터셋 파일 (카탈로그 행)
+    preview: True면 전체 스캔과 동시에 표본 미리보기를 계산해 작업 상태(job.preview)로 먼저 공개
+    profile: 제출 시 활성화한 Profile (지정하면 단계별 기록을 응답의 _profile로 반환)
+    """
+    preview_thread = None
     try:
-        # CSV 파일 읽기
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
+        if compression and compression not in CODECS:
+            raise ValueError(f"지원하지 않는 압축 코덱: {compression}")
+        # 압축은 드라이브에 올리는 데이터셋 파일에만 적용됨
+        compression = compression if is_gdrive_upload else None
 
-        # 메타데이터 생성
-        metadata_generator = MetadataGenerator(df)
+        _, suffix = os.path.splitext(path or "")
+        with open(path, "rb") if path else contextlib.nullcontext() as f:
+            size = (os.path.getsize(path) if path else 0) or 1
 
-        # JSON 문자열을 파이썬 객체로 파싱
-        preprocessing_dict = (
-            json.loads(preprocessing_steps) if preprocessing_steps else None
-        )
-        labeling_dict = json.loads(labeling_methods) if labeling_methods else None
-        augmentation_dict = (
-            json.loads(augmentation_methods) if augmentation_methods else None
-        )
+            # 같은 내용의 데이터셋을 이미 처리했다면 캐시된 통계를 재사용하고,
+            # 아니면 STREAM_CHUNKSIZE 행 단위로 읽으며 통계를 계산하고 읽은 바이트로 진행률 보고
+            job.update(stage="statistics")
+            # 캐시 키에는 계산되는 통계 종류를 결정하는 옵션도 포함
+            cache_key = content_hash and cache_key_for(
+                content_hash,
+                approximate=approximate,
+                duplicates=duplicates,
+                vocabulary=vocabulary,
+                quality=quality,
+            )
+            cached_statistics = statistics
+            if cached_statistics is None and cache_key:
+                with stage("cache_lookup"):
+                    cached_statistics = metadata_cache.get(cache_key)
+
+            # 컬럼 기반 포맷은 필요한 컬럼만 메모리 맵으로 읽도록 경로를 그대로 전달
+            columnar = suffix in FORMATS
+            # 캐시된 통계가 있으면 정확한 결과가 곧바로 나오므로 미리보기는 생략
+            # 전체 스캔을 늦추지 않도록 미리보기는 별도 스레드에서 스캔과 동시에 계산
+            if preview and cached_statistics is None and f is not None:
+                preview_thread = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(_run_preview, job, path),
+                    daemon=True,
+                )
+                preview_thread.start()
 
-        metadata = metadata_generator.generate_full_metadata(
-            creator=creator,
-            datasetname=datasetname,
-            description=description,
-            preprocessing_steps=preprocessing_dict,
-            labeling_methods=labeling_dict,
-            augmentation_methods=augmentation_dict,
+            if is_gdrive_upload:
+                storage = get_storage()
+                # 같은 바이트가 이미 드라이브에 있으면 데이터셋은 다시 올리지 않고
+                # 메타데이터의 압축 정보도 기존 파일 기준으로 기록
+                if existing_dataset is None and content_hash:
+                    with stage("storage_lookup"):
+                        existing_dataset = find_uploaded_dataset(storage, content_hash)
+                if existing_dataset is not None:
+                    compression = MIMETYPE_CODECS.get(existing_dataset["mime_type"])
+
+            metadata_generator = MetadataGenerator(
+                None if f is None else path if columnar else f,
+                chunksize=STREAM_CHUNKSIZE,
+                progress_callback=(
+                    None
+                    if columnar or f is None
+                    else lambda state: job.update(progress=0.8 * f.tell() / size)
+                ),
+                statistics=cached_statistics,
+                approximate=bool(approximate),
+                duplicates=bool(duplicates),
+                vocabulary=bool(vocabulary),
+                quality=quality or False,
+            )
+
+            # JSON 문자열을 파이썬 객체로 파싱
+            preprocessing_dict = (
+                json.loads(preprocessing_steps) if preprocessing_steps else None
+            )
+            labeling_dict = json.loads(labeling_methods) if labeling_methods else None
+            augmentation_dict = (
+                json.loads(augmentation_methods) if augmentation_methods else None
+            )
+
+            with stage("generate_metadata"):
+                metadata_generator.generate_full_metadata(
+                    creator=creator,
+                    datasetname=datasetname,
+                    description=description,
+                    preprocessing_steps=preprocessing_dict,
+                    labeling_methods=labeling_dict,
+                    augmentation_methods=augmentation_dict,
+                    compression=compression,
+                )
+            if cache_key and cached_statistics is None:
+                with stage("cache_store"):
+                    metadata_cache.put(
+                        cache_key, metadata_generator.compute_statistics()
+                    )
+
+            # 응답은 JSONResponse가 한 번만 인코딩하므로 여기서는 dict로만 변환
+            metadata_model = metadata_generator.to_model()
+            response_content = metadata_model.to_dict()
+
+            # GDrive 업로드
+            if is_gdrive_upload:
+                job.update(stage="gdrive_upload", progress=0.8)
+                folder_id = storage.create_folder(f"{creator}-{datasetname}")
+                # 카탈로그 항목을 changes 피드에서도 알아볼 수 있도록 파일에 속성으로 기록
+                properties = {
+                    "creator": creator,
+                    "datasetname": datasetname,
+                    "content_hash": content_hash,
+                }
+                # 원본 업로드 바이트와 메타데이터 JSON을 재인코딩 없이 동시에 업로드
+                # (드라이브에 이미 있는 데이터셋은 제외)
+                streams, kinds = [], []
+                if existing_dataset is None:
+                    f.seek(0)
+                    streams.append(
+                        (
+                            f,
+                            f"{datasetname}{suffix}",
+                            FORMATS[suffix][1] if columnar else "text/csv",
+                            compression,
+                            dict(properties, kind="dataset"),
+                        )
+                    )
+                    kinds.append("dataset")
+                # save_metadata로 저장한 파일과 같은 바이트
+                with stage("json_encode"):
+                    json_bytes = metadata_model.to_json().encode("utf-8")
+                streams.append(
+                    (
+                        io.BytesIO(json_bytes),
+                        f"{datasetname}_metadata.json",
+                        "application/json",
+                        None,
+                        dict(properties, kind="metadata"),
+                    )
+                )
+                kinds.append("metadata")
+
+                # 파일별 업로드 진행률의 평균을 작업 진행률(0.8~1.0)에 반영
+                upload_progress = {}
+
+                def _on_upload_progress(filename, progress):
+                    upload_progress[filename] = progress
+                    job.update(
+                        progress=0.8
+                        + 0.2 * sum(upload_progress.values()) / len(streams)
+                    )
+
+                with stage("gdrive_upload"):
+                    uploads = storage.upload_streams(
+                        streams, folder_id, progress_callback=_on_upload_progress
+                    )
+                for upload, kind in zip(uploads, kinds):
+                    if upload["status"] == "uploaded":
+                        catalog.record(
+                            dict(upload, parents=[folder_id]),
+                            kind=kind,
+                            **properties,
+                        )
+                if existing_dataset is not None:
+                    uploads.insert(
+                        0,
+                        {
+                            "name": existing_dataset["name"],
+                            "id": existing_dataset["file_id"],
+                            "status": "reused",
+                        },
+                    )
+                    kinds.insert(0, "dataset")
+
+                response_content["gdrive_url"] = storage.folder_url(folder_id)
+                # 새 폴더에는 메타데이터만 있을 수 있으므로(재사용한 데이터셋은 원래 폴더에 있음)
+                # 데이터셋 파일의 ID와 위치를 따로 알려줌
+                for upload, kind in zip(uploads, kinds):
+                    if kind == "dataset" and upload["id"]:
+                        response_content["gdrive_dataset_id"] = upload["id"]
+                        response_content["gdrive_dataset_url"] = storage.file_url(
+                            upload["id"]
+                        )
+                response_content["gdrive_uploads"] = uploads
+
+                if any(
+                    upload["status"] not in ("uploaded", "reused") for upload in uploads
+                ):
+                    return 207, _with_profile(response_content, profile)
+            job.update(stage="done")
+            return 200, _with_profile(response_content, profile)
+    finally:
+        # 미리보기는 스캔과 동시에 시작해 읽기 시간 상한(PREVIEW_BUDGET_SECONDS) 안에 읽기를 멈추므로
+        # 최대 그만큼만 기다린 뒤 스풀 파일 삭제 (읽기가 멈춘 미리보기는 기다리지 않고 버림)
+        if preview_thread is not None:
+            preview_thread.join(timeout=PREVIEW_BUDGET_SECONDS)
+            if preview_thread.is_alive():
+                print("Preview did not finish in time; deleting the spooled upload")
+        if path:
+            os.remove(path)
+
+
+def _run_preview(job, path):
+    """표본 미리보기를 계산해 작업 상태(job.preview)로 공개 (실패해도 전체 스캔에는 영향 없음)"""
+    try:
+        with stage("preview"):
+            job.preview = preview_metadata(
+                path, PREVIEW_SAMPLE_SIZE, PREVIEW_BUDGET_SECONDS
+            )
+    except Exception as e:
+        print(f"Error generating preview: {str(e)}")
+
+
+def _with_profile(response_content, profile):
+    if profile is not None:
+        response_content["_profile"] = profile.to_dict()
+    return response_content
+
+
+def _lookup_known_dataset(form, content_hash, content_md5):
+    """
+    해시 핸드셰이크: 본문 없이 제출한 데이터셋의 통계가 캐시에 있고, 드라이브 업로드를 요청했다면
+    같은 바이트가 드라이브에도 있는지 확인
+    반환: (캐시된 통계, 드라이브의 기존 데이터셋 파일) - 본문이 필요하면 None
+    """
+    statistics = metadata_cache.get(
+        cache_key_for(
+            content_hash,
+            approximate=form["approximate"],
+            duplicates=form["duplicates"],
+            vocabulary=form["vocabulary"],
+            quality=form["quality"],
+        )
+    )
+    if statistics is None:
+        return None
+    existing_dataset = None
+    if form["is_gdrive_upload"]:
+        existing_dataset = find_uploaded_dataset(
+            get_storage(), content_hash, content_md5
         )
+        if existing_dataset is None:
+            return None
+    return statistics, existing_dataset
 
-        # NumPy 타입을 포함한 JSON 직렬화
-        json_str = json.dumps(metadata, cls=NumpyEncoder, indent=4, ensure_ascii=False)
-        response_content = json.loads(json_str)
 
-        # GDrive 업로드
-        if is_gdrive_upload:
-            drive_manager = GoogleDriveManager()
-            folder_id = drive_manager.create_folder(f"{creator}-{datasetname}")
-            uploaded_df = drive_manager.upload_dataframe(
-                df, f"{datasetname}.csv", folder_id
+async def _submit_job(file, form, content_hash=None, content_md5=None):
+    """
+    작업 제출 (본문 없이 해시만 보냈는데 서버에 그 데이터셋이 없으면 None)
+    content_hash, content_md5: 파일 없이 제출할 때 클라이언트가 계산한 SHA-256, MD5
+    """
+    # profile 폼 필드가 켜져 있으면 업로드 스풀부터 작업 끝까지의 단계를 기록
+    # (작업은 제출한 쪽의 컨텍스트에서 실행되므로 활성화한 Profile이 그대로 이어짐)
+    form = dict(form)
+    profile = Profile() if form.pop("profile") else None
+    with activate(profile):
+        if file is None:
+            with stage("hash_lookup"):
+                known = await run_in_threadpool(
+                    _lookup_known_dataset,
+                    form,
+                    _check_content_hash(content_hash),
+                    content_md5,
+                )
+            if known is None:
+                return None
+            statistics, existing_dataset = known
+            return job_manager.submit(
+                run_metadata_job,
+                None,
+                content_hash,
+                statistics=statistics,
+                existing_dataset=existing_dataset,
+                profile=profile,
+                **form,
             )
-            uploaded_json = drive_manager.upload_json_data(
-                json_str, f"{datasetname}_metadata.json", folder_id
+        with stage("spool_upload"):
+            path, content_hash = await run_in_threadpool(
+                _spool_upload, file.file, _input_suffix(file.filename)
             )
+        return job_manager.submit(
+            run_metadata_job, path, content_hash, profile=profile, **form
+        )
+
+
+def _job_result_response(job):
+    """완료된 작업의 결과를 기존 /generate_metadata 응답 형식으로 변환"""
+    if job.status == FAILED:
+        return JSONResponse(status_code=400, content={"error": job.error})
+    return JSONResponse(status_code=job.status_code, content=job.result)
+
+
+def _upload_required_response():
+    return JSONResponse(
+        status_code=404,
+        content={
+            "error": "서버에 없는 데이터셋입니다. 파일과 함께 다시 요청하세요",
+            "upload_required": True,
+        },
+    )
+
+
+@app.post("/generate_metadata")
+async def generate_metadata(
+    file: UploadFile = File(None),
+    form: dict = Depends(metadata_form),
+    content_hash: str = Form(None),
+    content_md5: str = Form(None),
+):
+    """
+    작업을 제출하고 완료될 때까지 (이벤트 루프를 막지 않고) 기다린 뒤 결과 반환
+    파일 대신 content_hash(와 content_md5)만 보내면 서버에 있는 데이터셋으로 처리하고,
+    없으면 upload_required와 함께 404 반환
+    """
+    try:
+        job = await _submit_job(file, form, content_hash, content_md5)
+        if job is None:
+            return _upload_required_response()
+        await asyncio.wrap_future(job.future)
+        return _job_result_response(job)
+    except Exception as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(None),
+    form: dict = Depends(metadata_form),
+    content_hash: str = Form(None),
+    content_md5: str = Form(None),
+):
+    """메타데이터 생성 작업 제출 후 작업 ID 반환 (해시만 보내는 방식은 /generate_metadata와 같음)"""
+    try:
+        job = await _submit_job(file, form, content_hash, content_md5)
+        if job is None:
+            return _upload_required_response()
+        return job.to_dict()
+    except Exception as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 및 진행률 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "job not found"})
+    return job.to_dict()
 
-            gdrive_url = f"https://drive.google.com/drive/folders/{folder_id}"
-            response_content["gdrive_url"] = gdrive_url
 
-            if not uploaded_df or not uploaded_json:
-                return JSONResponse(status_code=207, content=response_content)
-        return JSONResponse(content=response_content)
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """완료된 작업의 메타데이터 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "job not found"})
+    if not job.done:
+        return JSONResponse(status_code=409, content=job.to_dict())
+    return _job_result_response(job)
 
+
+@app.post("/preview")
+async def preview_dataset(
+    file: UploadFile = File(...),
+    sample_size: int = Form(PREVIEW_SAMPLE_SIZE),
+    budget_seconds: float = Form(PREVIEW_BUDGET_SECONDS),
+):
+    """
+    저수지 표본으로 text_statistics, target_distribution과 신뢰구간을 추정 (파일 크기와 무관하게
+    budget_seconds 안에 읽기를 멈춤)
+    """
+    try:
+        path, _ = await run_in_threadpool(
+            _spool_upload, file.file, _input_suffix(file.filename)
+        )
+        try:
+            return await run_in_threadpool(
+                preview_metadata,
+                path,
+                min(max(sample_size, 1), PREVIEW_SAMPLE_SIZE),
+                min(max(budget_seconds, 0.0), PREVIEW_BUDGET_SECONDS),
+            )
+        finally:
+            os.remove(path)
     except Exception as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """요청/단계별 지연 시간 히스토그램과 처리 행 수, 업로드 바이트 카운터 (Prometheus 형식)"""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/catalog")
+async def search_catalog(
+    name: str = None,
+    creator: str = None,
+    datasetname: str = None,
+    content_hash: str = None,
+    kind: str = None,
+    created_after: str = None,
+    created_before: str = None,
+    limit: int = 100,
+    offset: int = 0,
+):
+    """업로드한 데이터셋/메타데이터 파일을 로컬 카탈로그에서 검색 (드라이브 호출 없음)"""
+    total, files = catalog.search(
+        name=name,
+        creator=creator,
+        datasetname=datasetname,
+        content_hash=content_hash,
+        kind=kind,
+        created_after=created_after,
+        created_before=created_before,
+        limit=min(max(limit, 1), 1000),
+        offset=max(offset, 0),
+    )
+    return {"total": total, "files": files}
+
+
+@app.post("/catalog/sync")
+async def sync_catalog():
+    """저장소 changes 피드에서 마지막 동기화 이후의 변경 사항을 카탈로그에 반영"""
+    try:
+        return await run_in_threadpool(lambda: catalog.sync(get_storage()))
+    except Exception as e:
+        return JSONResponse(status_code=502, content={"error": str(e)})
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """통계 캐시 계층별 히트/미스 카운터와 사용량 조회"""
+    return metadata_cache.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
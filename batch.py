@@ -0,0 +1,240 @@
+"""
+여러 데이터셋의 메타데이터 일괄 생성
+
+디렉토리나 glob 패턴에 해당하는 데이터셋 파일마다 메타데이터 JSON을 프로세스 풀에서 생성하고
+전체 결과를 manifest.json에 기록한다. 파일과 설정이 바뀌지 않은 데이터셋은 다시 생성하지 않는다.
+
+    python batch.py data/augmented --config batch.yaml --output-dir output/batch --workers 4
+    python batch.py "data/**/*.csv" --config batch.yaml --force
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import yaml
+from columnar import FORMATS
+from metadata_generator import MetadataGenerator
+from parallel import DEFAULT_CHUNKSIZE
+
+DATASET_EXTENSIONS = [".csv"] + list(FORMATS)
+MANIFEST_NAME = "manifest.json"
+# 설정 파일에서 사용할 수 있는 항목
+CONFIG_KEYS = {
+    "creator",
+    "description",
+    "preprocessing_steps",
+    "labeling_methods",
+    "augmentation_methods",
+    "approximate",
+    "duplicates",
+    "vocabulary",
+    "quality",
+    "chunksize",
+}
+
+
+def load_config(path):
+    """creator, 전처리/라벨링/증강 설명 등 모든 데이터셋에 공통으로 적용할 설정 (YAML 또는 JSON)"""
+    if path is None:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    unknown = set(config) - CONFIG_KEYS
+    if unknown:
+        raise ValueError(f"알 수 없는 설정 항목: {', '.join(sorted(unknown))}")
+    return config
+
+
+def _input_root(pattern):
+    """glob 패턴에서 와일드카드가 나오기 전까지의 디렉토리 (디렉토리 입력은 그 자신)"""
+    if os.path.isdir(pattern):
+        return pattern
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    root = os.sep.join(parts) if parts else "."
+    return root if os.path.isdir(root) else os.path.dirname(root) or "."
+
+
+def find_datasets(inputs):
+    """
+    디렉토리(하위 디렉토리 포함), glob 패턴, 파일 경로에서 지원하는 데이터셋 파일 탐색
+    반환: {데이터셋 절대 경로: 입력 루트 디렉토리 기준 상대 경로}
+    """
+    datasets = {}
+    for pattern in inputs:
+        root = _input_root(pattern)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            _, ext = os.path.splitext(path)
+            if os.path.isfile(path) and ext.lower() in DATASET_EXTENSIONS:
+                datasets.setdefault(os.path.abspath(path), os.path.relpath(path, root))
+    return datasets
+
+
+def _output_paths(datasets, output_dir):
+    """입력 루트 기준 상대 경로를 출력 디렉토리에 그대로 옮긴 메타데이터 파일 경로"""
+    outputs = {}
+    for path, relative in datasets.items():
+        root, _ = os.path.splitext(relative)
+        output_path = os.path.join(output_dir, f"{root}_metadata.json")
+        if output_path in outputs.values():
+            raise ValueError(f"메타데이터 파일 이름이 겹치는 데이터셋: {path}")
+        outputs[path] = output_path
+    return outputs
+
+
+def _fingerprint(path, config):
+    """파일 크기, 수정 시각, 설정이 같으면 같은 값 (최신 여부 판단용)"""
+    stat = os.stat(path)
+    key = json.dumps(
+        {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "config": config},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {entry["dataset"]: entry for entry in manifest.get("datasets", [])}
+
+
+def _write_manifest(output_dir, config, entries):
+    """중간에 중단되어도 완료된 데이터셋은 건너뛸 수 있도록 임시 파일에 쓴 뒤 교체"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "config": config,
+        "datasets": entries,
+    }
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+    return manifest
+
+
+def generate_one(path, output_path, config):
+    """프로세스 풀 워커: 데이터셋 하나의 메타데이터 생성 및 저장"""
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    datasetname, _ = os.path.splitext(os.path.basename(path))
+    metadata_generator = MetadataGenerator(
+        path,
+        output_path=output_path,
+        chunksize=config.get("chunksize", DEFAULT_CHUNKSIZE),
+        approximate=bool(config.get("approximate")),
+        duplicates=bool(config.get("duplicates")),
+        vocabulary=config.get("vocabulary") or False,
+        quality=config.get("quality") or False,
+    )
+    metadata = metadata_generator.generate_full_metadata(
+        creator=config.get("creator"),
+        datasetname=datasetname,
+        description=config.get("description"),
+        preprocessing_steps=config.get("preprocessing_steps"),
+        labeling_methods=config.get("labeling_methods"),
+        augmentation_methods=config.get("augmentation_methods"),
+    )
+    metadata_generator.save_metadata()
+    return {
+        "total_samples": int(metadata["total_samples"]),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_batch(inputs, config, output_dir, num_workers=None, force=False):
+    """
+    데이터셋마다 메타데이터를 생성하고 manifest 반환
+    num_workers: 동시에 처리할 데이터셋 수 (기본값: CPU 수)
+    force: True면 최신 상태인 데이터셋도 다시 생성
+    """
+    datasets = find_datasets(inputs)
+    outputs = _output_paths(datasets, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    previous = _load_manifest(output_dir)
+
+    entries = {}
+    pending = {}
+    for path in datasets:
+        # 실행 위치와 무관하도록 경로는 manifest 기준 상대 경로로 기록
+        dataset = os.path.relpath(path, output_dir)
+        entry = {
+            "dataset": dataset,
+            "metadata": os.path.relpath(outputs[path], output_dir),
+            "status": "pending",
+            "fingerprint": _fingerprint(path, config),
+        }
+        before = previous.get(dataset)
+        if (
+            not force
+            and before is not None
+            and before.get("status") in ("generated", "skipped")
+            and before.get("fingerprint") == entry["fingerprint"]
+            and os.path.exists(outputs[path])
+        ):
+            entries[path] = dict(before, status="skipped")
+        else:
+            entries[path] = entry
+            pending[path] = entry
+
+    print(
+        f"{len(datasets)} datasets: {len(pending)} to generate, "
+        f"{len(datasets) - len(pending)} up to date"
+    )
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {
+            executor.submit(generate_one, path, outputs[path], config): path
+            for path in pending
+        }
+        for future in as_completed(futures):
+            entry = pending[futures[future]]
+            try:
+                entry.update(future.result(), status="generated")
+                print(f"Metadata generated: {entry['dataset']} -> {entry['metadata']}")
+            except Exception as e:
+                entry.update(status="failed", error=str(e))
+                print(f"Error generating metadata for {entry['dataset']}: {str(e)}")
+            _write_manifest(output_dir, config, [entries[path] for path in datasets])
+    return _write_manifest(output_dir, config, [entries[path] for path in datasets])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 데이터셋의 메타데이터 일괄 생성")
+    parser.add_argument(
+        "inputs", nargs="+", help="데이터셋 디렉토리, glob 패턴 또는 파일 경로"
+    )
+    parser.add_argument(
+        "--config", help="creator, 전처리/라벨링/증강 설명 등 공통 설정 YAML 파일"
+    )
+    parser.add_argument("--output-dir", default="output/batch")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="동시에 처리할 데이터셋 수"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="최신 상태인 데이터셋도 다시 생성"
+    )
+    args = parser.parse_args()
+
+    manifest = run_batch(
+        args.inputs,
+        load_config(args.config),
+        args.output_dir,
+        num_workers=args.workers,
+        force=args.force,
+    )
+    if any(entry["status"] == "failed" for entry in manifest["datasets"]):
+        sys.exit(1)
@@ -0,0 +1,360 @@
+"""
+메타데이터 생성 성능 벤치마크
+
+합성 한국어 텍스트 분류 CSV를 생성한 뒤 시나리오별로 별도 프로세스에서 실행하여
+실행 시간, 처리량(rows/s), 최대 메모리(RSS)를 JSON 결과 파일에 기록한다.
+엔드포인트 시나리오는 구글 드라이브 대신 로컬 가짜 드라이브 서버(fake_drive.py)로 업로드한다.
+
+    python benchmark.py generate data/bench_1m.csv --rows 1000000 --skew 1.0
+    python benchmark.py run --rows 10000 1000000 --output benchmark_results.json
+    python benchmark.py run --rows 1000000 --compare benchmark_results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import yaml
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ["metadata_generator", "endpoint"]
+# 한글 음절 범위 (가 ~ 힣)
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def _vocabulary(rng, size):
+    """1~4음절 한글 단어로 구성된 합성 어휘"""
+    lengths = rng.integers(1, 5, size=size)
+    syllables = rng.integers(_HANGUL_FIRST, _HANGUL_LAST + 1, size=lengths.sum())
+    words = "".join(map(chr, syllables))
+    ends = np.cumsum(lengths)
+    return np.array(
+        [words[end - length : end] for end, length in zip(ends, lengths)], dtype=object
+    )
+
+
+def _zipf_probabilities(size, exponent):
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def generate_dataset(
+    path,
+    num_rows,
+    num_classes=7,
+    skew=0.0,
+    mean_words=6.0,
+    length_sigma=0.5,
+    vocabulary_size=20_000,
+    seed=0,
+    chunksize=100_000,
+):
+    """
+    합성 한국어 텍스트 분류 CSV(ID, text, target) 생성
+
+    skew: 클래스 분포의 지프 지수 (0이면 균등, 클수록 앞쪽 클래스에 치우침)
+    mean_words, length_sigma: 행별 단어 수의 로그정규 분포 중앙값과 표준편차
+    단어 빈도도 지프 분포를 따르며, 큰 데이터셋도 chunksize 행씩 나누어 기록한다.
+    """
+    rng = np.random.default_rng(seed)
+    words = _vocabulary(rng, vocabulary_size)
+    word_probabilities = _zipf_probabilities(vocabulary_size, 1.1)
+    class_probabilities = _zipf_probabilities(num_classes, skew)
+    id_width = len(str(num_rows))
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("ID,text,target\n")
+        for start in range(0, num_rows, chunksize):
+            size = min(chunksize, num_rows - start)
+            word_counts = np.maximum(
+                np.rint(rng.lognormal(np.log(mean_words), length_sigma, size)), 1
+            ).astype(np.int64)
+            tokens = words[
+                rng.choice(
+                    vocabulary_size, size=word_counts.sum(), p=word_probabilities
+                )
+            ]
+            targets = rng.choice(num_classes, size=size, p=class_probabilities)
+            texts = np.split(tokens, np.cumsum(word_counts)[:-1])
+            f.write(
+                "".join(
+                    f"{start + i:0{id_width}d},{' '.join(text)},{target}\n"
+                    for i, (text, target) in enumerate(zip(texts, targets))
+                )
+            )
+    return path
+
+
+def _peak_rss_mb():
+    # 리눅스는 KB, macOS는 바이트 단위
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _write_stub_settings(workdir, api_endpoint):
+    """가짜 드라이브 서버를 가리키는 settings.yaml과 만료되지 않는 가짜 토큰 생성"""
+    settings_dir = os.path.join(workdir, "settings")
+    os.makedirs(settings_dir, exist_ok=True)
+    token_path = os.path.join(settings_dir, "token.json")
+    with open(token_path, "w") as f:
+        json.dump(
+            {
+                "token": "benchmark",
+                "refresh_token": "benchmark",
+                "client_id": "benchmark",
+                "client_secret": "benchmark",
+                "expiry": "2999-01-01T00:00:00Z",
+            },
+            f,
+        )
+    with open(os.path.join(settings_dir, "settings.yaml"), "w") as f:
+        yaml.safe_dump(
+            {
+                "gdrive": {
+                    "token": token_path,
+                    "credentials": os.path.join(settings_dir, "credentials.json"),
+                    "folder_id": "benchmark",
+                    "api_endpoint": api_endpoint,
+                }
+            },
+            f,
+        )
+
+
+def _run_metadata_generator(path, chunksize, num_workers):
+    from metadata_generator import MetadataGenerator
+
+    stages = {}
+    start = time.perf_counter()
+    metadata_generator = MetadataGenerator(
+        path,
+        output_path=os.path.join(os.getcwd(), "metadata.json"),
+        chunksize=chunksize,
+        num_workers=num_workers,
+    )
+    metadata_generator.generate_full_metadata(creator="benchmark")
+    stages["generate_full_metadata"] = time.perf_counter() - start
+    start = time.perf_counter()
+    metadata_generator.save_metadata()
+    stages["save_metadata"] = time.perf_counter() - start
+    return stages
+
+
+def _run_endpoint(path, chunksize, num_workers):
+    from fastapi.testclient import TestClient
+    import backend
+
+    # with 블록 안에서 앱 시작 훅(통계 캐시/카탈로그 열기)이 실행됨
+    with TestClient(backend.app) as client, open(path, "rb") as f:
+        start = time.perf_counter()
+        response = client.post(
+            "/generate_metadata",
+            files={"file": (os.path.basename(path), f, "text/csv")},
+            data={
+                "creator": "benchmark",
+                "datasetname": "benchmark",
+                "is_gdrive_upload": "true",
+            },
+        )
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/generate_metadata 실패: {response.text[:500]}")
+    return {"generate_metadata_request": elapsed}
+
+
+def _scenario_worker(scenario, path, workdir, chunksize, num_workers, queue):
+    """별도 프로세스에서 시나리오 하나를 실행 (최대 RSS를 시나리오별로 측정하기 위함)"""
+    try:
+        # drive_manager는 현재 디렉토리의 settings/settings.yaml을 읽으므로 작업 디렉토리로 이동
+        os.chdir(workdir)
+        sys.path.insert(0, BASE_DIR)
+        os.environ["METADATA_CACHE_DIR"] = tempfile.mkdtemp(dir=workdir)
+        run = {"metadata_generator": _run_metadata_generator, "endpoint": _run_endpoint}
+        # 모듈 임포트 시간은 측정에서 제외
+        __import__("backend" if scenario == "endpoint" else "metadata_generator")
+        start = time.perf_counter()
+        stages = run[scenario](path, chunksize, num_workers)
+        wall = time.perf_counter() - start
+        queue.put(
+            {"wall_seconds": wall, "stages": stages, "peak_rss_mb": _peak_rss_mb()}
+        )
+    except Exception as e:
+        queue.put({"error": repr(e)})
+
+
+def run_scenario(scenario, path, workdir, chunksize=None, num_workers=None):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(
+        target=_scenario_worker,
+        args=(scenario, path, workdir, chunksize, num_workers, queue),
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    rows,
+    scenarios=SCENARIOS,
+    data_dir="benchmark_data",
+    chunksize=None,
+    num_workers=None,
+    repeat=1,
+    **dataset_options,
+):
+    """데이터셋 크기별로 시나리오를 실행하고 결과 dict 반환"""
+    import fake_drive
+
+    os.makedirs(data_dir, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="benchmark_")
+    # 가짜 드라이브 서버는 측정 대상 프로세스 밖(이 프로세스)에서 실행하고 업로드 내용은 버림
+    server, _ = fake_drive.serve(port=0, keep_contents=False)
+    _write_stub_settings(workdir, f"http://localhost:{server.server_address[1]}/")
+
+    results = {
+        "revision": _git_revision(),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            "chunksize": chunksize,
+            "num_workers": num_workers,
+            **dataset_options,
+        },
+        "runs": [],
+    }
+    try:
+        for num_rows in rows:
+            name = "_".join(
+                [f"bench_{num_rows}"]
+                + [f"{key}{value}" for key, value in sorted(dataset_options.items())]
+            )
+            path = os.path.abspath(os.path.join(data_dir, f"{name}.csv"))
+            if not os.path.exists(path):
+                print(f"Generating {path}")
+                generate_dataset(path, num_rows, **dataset_options)
+            for scenario in scenarios:
+                for _ in range(repeat):
+                    result = run_scenario(
+                        scenario, path, workdir, chunksize, num_workers
+                    )
+                    run = {
+                        "scenario": scenario,
+                        "rows": num_rows,
+                        "bytes": os.path.getsize(path),
+                        **result,
+                    }
+                    if "wall_seconds" in result:
+                        run["rows_per_second"] = num_rows / result["wall_seconds"]
+                    results["runs"].append(run)
+                    print(json.dumps(run, ensure_ascii=False))
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare_results(current, baseline):
+    """같은 시나리오/행 수의 이전 결과와 처리량, 최대 메모리 비교"""
+    previous = {
+        (run["scenario"], run["rows"]): run
+        for run in baseline["runs"]
+        if "wall_seconds" in run
+    }
+    for run in current["runs"]:
+        before = previous.get((run["scenario"], run["rows"]))
+        if before is None or "wall_seconds" not in run:
+            continue
+        speed = run["rows_per_second"] / before["rows_per_second"]
+        memory = run["peak_rss_mb"] / before["peak_rss_mb"]
+        print(
+            f"{run['scenario']:<20} {run['rows']:>10} rows  "
+            f"throughput x{speed:.2f}  peak RSS x{memory:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메타데이터 생성 성능 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def _dataset_arguments(subparser):
+        subparser.add_argument("--classes", type=int, default=7, help="클래스 수")
+        subparser.add_argument(
+            "--skew", type=float, default=0.0, help="클래스 분포 지프 지수 (0: 균등)"
+        )
+        subparser.add_argument(
+            "--mean-words", type=float, default=6.0, help="행별 단어 수 중앙값"
+        )
+        subparser.add_argument(
+            "--length-sigma", type=float, default=0.5, help="행별 단어 수 로그 표준편차"
+        )
+        subparser.add_argument("--seed", type=int, default=0)
+
+    generate_parser = subparsers.add_parser("generate", help="합성 데이터셋만 생성")
+    generate_parser.add_argument("path")
+    generate_parser.add_argument("--rows", type=int, default=10_000)
+    _dataset_arguments(generate_parser)
+
+    run_parser = subparsers.add_parser("run", help="벤치마크 실행")
+    run_parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    run_parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS
+    )
+    run_parser.add_argument("--chunksize", type=int, default=None)
+    run_parser.add_argument("--num-workers", type=int, default=None)
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--data-dir", default="benchmark_data")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    _dataset_arguments(run_parser)
+
+    args = parser.parse_args()
+    dataset_options = {
+        "num_classes": args.classes,
+        "skew": args.skew,
+        "mean_words": args.mean_words,
+        "length_sigma": args.length_sigma,
+        "seed": args.seed,
+    }
+    if args.command == "generate":
+        generate_dataset(args.path, args.rows, **dataset_options)
+    else:
+        results = run_benchmarks(
+            args.rows,
+            scenarios=args.scenarios,
+            data_dir=args.data_dir,
+            chunksize=args.chunksize,
+            num_workers=args.num_workers,
+            repeat=args.repeat,
+            **dataset_options,
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                compare_results(results, json.load(f))
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from metadata_model import to_native
+
+
+class CacheTier:
+    """히트/미스 카운터를 가진 캐시 계층 공통 부분"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class MemoryTier(CacheTier):
+    """크기 기준으로 오래 사용하지 않은 항목부터 제거하는 메모리 LRU 캐시"""
+
+    def __init__(self, max_bytes):
+        super().__init__(max_bytes)
+        self._entries = OrderedDict()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class DiskTier(CacheTier):
+    """
+    디렉토리에 항목별 파일로 저장하는 영구 캐시
+    파일 수정 시각을 마지막 사용 시각으로 사용하여 크기 초과 시 오래된 것부터 제거
+    """
+
+    def __init__(self, directory, max_bytes):
+        super().__init__(max_bytes)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._files())
+
+    @property
+    def size(self):
+        return sum(entry.stat().st_size for entry in self._files())
+
+    def _files(self):
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        ]
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in files)
+        for entry in files:
+            if size <= self.max_bytes:
+                break
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+
+
+class MetadataCache:
+    """
+    데이터셋 내용 해시를 키로 스캔이 필요한 통계(MetadataGenerator.compute_statistics)를
+    저장하는 2계층(메모리 LRU + 디스크) 캐시
+    """
+
+    def __init__(self, directory, memory_bytes, disk_bytes):
+        self.memory = MemoryTier(memory_bytes)
+        self.disk = DiskTier(directory, disk_bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """캐시된 통계 반환 (없으면 None)"""
+        with self._lock:
+            value = self.memory.get(key)
+            if value is None:
+                value = self.disk.get(key)
+                if value is not None:
+                    self.memory.put(key, value)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key, statistics):
+        """통계 저장"""
+        value = json.dumps(to_native(statistics), ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self.memory.put(key, value)
+            self.disk.put(key, value)
+
+    def stats(self):
+        """계층별 히트/미스 카운터와 사용량"""
+        with self._lock:
+            return {"memory": self.memory.stats(), "disk": self.disk.stats()}
@@ -0,0 +1,214 @@
+import sqlite3
+import threading
+
+# 카탈로그 항목임을 나타내는 appProperties 키 (값: dataset 또는 metadata)
+KIND_PROPERTY = "kind"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT,
+    dataset_name TEXT,
+    creator TEXT,
+    content_hash TEXT,
+    folder_id TEXT,
+    mime_type TEXT,
+    size INTEGER,
+    md5_checksum TEXT,
+    created_time TEXT,
+    modified_time TEXT
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+CREATE INDEX IF NOT EXISTS files_creator ON files (creator, created_time);
+CREATE INDEX IF NOT EXISTS files_created_time ON files (created_time);
+CREATE INDEX IF NOT EXISTS files_content_hash ON files (content_hash);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+_COLUMNS = [
+    "file_id",
+    "name",
+    "kind",
+    "dataset_name",
+    "creator",
+    "content_hash",
+    "folder_id",
+    "mime_type",
+    "size",
+    "md5_checksum",
+    "created_time",
+    "modified_time",
+]
+
+
+def _row(file, **properties):
+    """Drive 파일 정보(와 appProperties 또는 직접 지정한 속성)를 카탈로그 행으로 변환"""
+    app_properties = dict(file.get("appProperties") or {})
+    app_properties.update({key: value for key, value in properties.items() if value})
+    parents = file.get("parents") or [None]
+    return {
+        "file_id": file["id"],
+        "name": file.get("name"),
+        "kind": app_properties.get(KIND_PROPERTY),
+        "dataset_name": app_properties.get("datasetname"),
+        "creator": app_properties.get("creator"),
+        "content_hash": app_properties.get("content_hash"),
+        "folder_id": parents[0],
+        "mime_type": file.get("mimeType"),
+        "size": int(file["size"]) if file.get("size") is not None else None,
+        "md5_checksum": file.get("md5Checksum"),
+        "created_time": file.get("createdTime"),
+        "modified_time": file.get("modifiedTime") or file.get("createdTime"),
+    }
+
+
+class DatasetCatalog:
+    """
+    백엔드가 저장소(드라이브 등)에 올린 데이터셋/메타데이터 파일의 로컬 SQLite 카탈로그
+
+    업로드할 때 직접 기록하고, 다른 곳에서 생긴 변경(삭제, 이름 변경, 다른 인스턴스의 업로드)은
+    저장소의 changes 피드를 저장해 둔 페이지 토큰부터 읽어 반영한다. 조회는 저장소를 호출하지 않는다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _upsert(self, row):
+        placeholders = ", ".join(f":{column}" for column in _COLUMNS)
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {column})"
+            for column in _COLUMNS[1:]
+        )
+        self._conn.execute(
+            f"INSERT INTO files ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(file_id) DO UPDATE SET {updates}",
+            row,
+        )
+
+    def record(
+        self, file, kind=None, creator=None, datasetname=None, content_hash=None
+    ):
+        """업로드한 파일 기록 (file: id, name 등 Drive 파일 필드를 가진 dict)"""
+        row = _row(
+            file,
+            kind=kind,
+            creator=creator,
+            datasetname=datasetname,
+            content_hash=content_hash,
+        )
+        with self._lock, self._conn:
+            self._upsert(row)
+
+    def apply_changes(self, changes, page_token=None):
+        """
+        changes 피드의 변경 목록을 한 트랜잭션으로 반영하고 반영한 항목 수 반환
+        page_token: 지정하면 같은 트랜잭션에서 다음에 읽을 페이지 토큰으로 저장
+        """
+        applied = 0
+        with self._lock, self._conn:
+            for change in changes:
+                file = change.get("file")
+                if change.get("removed") or file is None or file.get("trashed"):
+                    cursor = self._conn.execute(
+                        "DELETE FROM files WHERE file_id = ?", (change["fileId"],)
+                    )
+                    applied += cursor.rowcount
+                    continue
+                # 카탈로그 속성이 붙은 파일과 이미 기록된 파일만 반영
+                known = self._conn.execute(
+                    "SELECT 1 FROM files WHERE file_id = ?", (file["id"],)
+                ).fetchone()
+                if known or KIND_PROPERTY in (file.get("appProperties") or {}):
+                    self._upsert(_row(file))
+                    applied += 1
+            if page_token is not None:
+                self._set_state("page_token", page_token)
+        return applied
+
+    def _set_state(self, key, value):
+        self._conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @property
+    def page_token(self):
+        """다음 동기화에서 읽기 시작할 changes 피드 페이지 토큰 (아직 동기화한 적 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_state WHERE key = 'page_token'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, storage):
+        """
+        저장된 페이지 토큰 이후의 저장소 변경 사항을 반영 (페이지마다 커밋하므로 중단되어도 이어서 진행)
+        처음 동기화할 때는 현재 시점의 시작 토큰만 저장한다 (그 전 업로드는 record로 기록됨).
+        """
+        page_token = self.page_token
+        if page_token is None:
+            page_token = storage.get_start_page_token()
+            with self._lock, self._conn:
+                self._set_state("page_token", page_token)
+            return {"applied": 0, "page_token": page_token}
+        applied = 0
+        for changes, next_token in storage.iter_changes(page_token):
+            applied += self.apply_changes(changes, next_token)
+            page_token = next_token
+        return {"applied": applied, "page_token": page_token}
+
+    def search(
+        self,
+        name=None,
+        creator=None,
+        datasetname=None,
+        content_hash=None,
+        kind=None,
+        created_after=None,
+        created_before=None,
+        limit=100,
+        offset=0,
+    ):
+        """
+        조건에 맞는 파일을 최근 생성 순으로 조회 (name은 파일 이름 접두사, 나머지는 일치 조건)
+        created_after/created_before: RFC 3339 시각 문자열 (예: 2024-01-01T00:00:00Z)
+        반환: (조건에 맞는 전체 개수, 파일 목록)
+        """
+        conditions, params = [], []
+        if name:
+            # 접두사 조건을 범위 조건으로 바꾸어 name 인덱스를 사용
+            conditions.append("name >= ? AND name < ?")
+            params += [name, name + "\U0010ffff"]
+        for column, value in (
+            ("creator", creator),
+            ("dataset_name", datasetname),
+            ("content_hash", content_hash),
+            ("kind", kind),
+        ):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if created_after:
+            conditions.append("created_time >= ?")
+            params.append(created_after)
+        if created_before:
+            conditions.append("created_time < ?")
+            params.append(created_before)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM files {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM files {where} "
+                "ORDER BY created_time DESC, file_id LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return total, [dict(row) for row in rows]
@@ -0,0 +1,93 @@
+import os
+
+# 확장자: (포맷 이름, mimetype)
+FORMATS = {
+    ".parquet": ("parquet", "application/vnd.apache.parquet"),
+    ".feather": ("feather", "application/vnd.apache.arrow.file"),
+    ".arrow": ("ipc", "application/vnd.apache.arrow.file"),
+}
+# 통계 계산에 필요한 컬럼 (이 컬럼만 읽음)
+STAT_COLUMNS = ["text", "target"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError(
+            "Parquet/Feather/Arrow 입력을 사용하려면 pyarrow 패키지를 설치하세요"
+        )
+    return pyarrow
+
+
+def detect_format(source):
+    """경로 확장자로 컬럼 기반 포맷 이름 판별 (CSV 등 그 외는 None)"""
+    if not isinstance(source, (str, os.PathLike)):
+        return None
+    _, ext = os.path.splitext(os.fspath(source))
+    return FORMATS.get(ext.lower(), (None, None))[0]
+
+
+def _open_ipc(pa, path):
+    """Arrow IPC 파일(Feather v2)을 메모리 맵으로 열기 (IPC 스트림 형식이면 스트림 리더)"""
+    source = pa.memory_map(os.fspath(path))
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def schema_columns(path):
+    """데이터를 읽지 않고 스키마에서 전체 컬럼 목록 반환"""
+    pa = _pyarrow()
+    if detect_format(path) == "parquet":
+        return pa.parquet.read_schema(path, memory_map=True).names
+    return _open_ipc(pa, path).schema.names
+
+
+def row_count(path):
+    """데이터를 읽지 않고 파일 메타데이터에서 전체 행 수 반환 (IPC 스트림 형식이면 None)"""
+    pa = _pyarrow()
+    if detect_format(path) == "parquet":
+        return pa.parquet.ParquetFile(path, memory_map=True).metadata.num_rows
+    reader = _open_ipc(pa, path)
+    if isinstance(reader, pa.ipc.RecordBatchFileReader):
+        return sum(
+            reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+        )
+    return None
+
+
+def _ipc_batches(reader):
+    if isinstance(reader, _pyarrow().ipc.RecordBatchFileReader):
+        return (reader.get_batch(i) for i in range(reader.num_record_batches))
+    return iter(reader)
+
+
+def iter_columnar_chunks(path, chunksize=None, columns=STAT_COLUMNS):
+    """
+    Parquet/Feather/Arrow 파일에서 필요한 컬럼만 읽어 DataFrame 덩어리로 순회
+    chunksize: 지정하면 최대 chunksize 행 단위로, 없으면 한 번에 읽음
+    """
+    pa = _pyarrow()
+    if detect_format(path) == "parquet":
+        parquet_file = pa.parquet.ParquetFile(path, memory_map=True)
+        if chunksize is None:
+            yield parquet_file.read(columns=columns).to_pandas()
+            return
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    # 메모리 맵 위의 레코드 배치에서 필요한 컬럼만 골라 변환 (나머지 컬럼은 읽지 않음)
+    reader = _open_ipc(pa, path)
+    if chunksize is None:
+        yield reader.read_all().select(columns).to_pandas()
+        return
+    for batch in _ipc_batches(reader):
+        batch = batch.select(columns)
+        for start in range(0, batch.num_rows, chunksize):
+            yield batch.slice(start, chunksize).to_pandas()
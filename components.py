@@ -1,14 +1,11 @@
 import streamlit as st
-import os.path
-import yaml
+from config import setting
 
-with open(os.path.join("./settings", "settings.yaml")) as f:
-    CFG = yaml.safe_load(f)
-
-username_options = CFG["components"]["username"]
-labeling_options = CFG["components"]["labeling"]
-preprocessing_options = CFG["components"]["preprocessing"]
-augmentation_options = CFG["components"]["augmentation"]
+# settings.yaml의 components 항목 (없으면 직접 입력만 가능)
+username_options = setting("components", "username", default=[])
+labeling_options = setting("components", "labeling", default=[])
+preprocessing_options = setting("components", "preprocessing", default=[])
+augmentation_options = setting("components", "augmentation", default=[])
 
 
 def create_custom_input(label, key, options, other_option="직접 입력"):
@@ -0,0 +1,100 @@
+import zlib
+
+# 코덱 이름: (파일 확장자, mimetype)
+CODECS = {
+    "gzip": (".gz", "application/gzip"),
+    "zstd": (".zst", "application/zstd"),
+}
+MIMETYPE_CODECS = {mimetype: codec for codec, (_, mimetype) in CODECS.items()}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd 압축을 사용하려면 zstandard 패키지를 설치하세요")
+    return zstandard
+
+
+class _ZstdCompressor:
+    """zstandard 스트리밍 압축기를 zlib 압축 객체와 같은 인터페이스로 감싼 것"""
+
+    def __init__(self):
+        self._compressor = _zstandard().ZstdCompressor().compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+def compressor(codec):
+    """compress(data)/flush()를 가진 스트리밍 압축 객체 생성"""
+    if codec == "gzip":
+        return zlib.compressobj(wbits=31)
+    if codec == "zstd":
+        return _ZstdCompressor()
+    raise ValueError(f"지원하지 않는 압축 코덱: {codec}")
+
+
+def decompressor(codec):
+    """decompress(data)를 가진 스트리밍 압축 해제 객체 생성"""
+    if codec == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if codec == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj()
+    raise ValueError(f"지원하지 않는 압축 코덱: {codec}")
+
+
+class CompressingReader:
+    """
+    원본 바이너리 스트림을 읽으면서 압축된 바이트를 순차적으로 내주는 읽기 객체
+    압축 결과 전체를 메모리에 만들지 않고 아직 전송 확인되지 않은 구간만 보관한다.
+    """
+
+    def __init__(self, stream, codec, block_size=1 << 20):
+        self.stream = stream
+        self.block_size = block_size
+        self._compressor = compressor(codec)
+        self._buffer = bytearray()
+        self._buffer_start = 0
+        self._eof = False
+        self.source_bytes = 0
+        self.output_bytes = 0
+
+    def read_at(self, begin, length):
+        """
+        압축 스트림의 [begin, begin + length) 구간 반환
+        begin 이전 구간은 다시 요청되지 않는다고 보고 버퍼에서 버린다.
+        """
+        if begin < self._buffer_start:
+            raise ValueError("이미 버린 압축 구간은 다시 읽을 수 없습니다")
+        del self._buffer[: begin - self._buffer_start]
+        self._buffer_start = begin
+        while len(self._buffer) < length and not self._eof:
+            block = self.stream.read(self.block_size)
+            if block:
+                self.source_bytes += len(block)
+                compressed = self._compressor.compress(block)
+            else:
+                compressed = self._compressor.flush()
+                self._eof = True
+            self.output_bytes += len(compressed)
+            self._buffer += compressed
+        return bytes(self._buffer[:length])
+
+
+class DecompressingWriter:
+    """쓰는 바이트를 압축 해제하여 대상 파일 객체에 기록하는 쓰기 객체"""
+
+    def __init__(self, fileobj, codec):
+        self.fileobj = fileobj
+        self._decompressor = decompressor(codec)
+
+    def write(self, data):
+        self.fileobj.write(self._decompressor.decompress(data))
+        return len(data)
+
+    def close(self):
+        self.fileobj.close()
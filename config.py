@@ -0,0 +1,38 @@
+import os
+import threading
+import yaml
+
+# 설정 파일 경로 (기본값: 실행 디렉토리의 settings/settings.yaml)
+SETTINGS_PATH = os.getenv(
+    "METADATA_SETTINGS_PATH", os.path.join("./settings", "settings.yaml")
+)
+
+_settings = {}
+_settings_lock = threading.Lock()
+
+
+def load_settings(path=None):
+    """
+    settings.yaml 내용 (경로별로 처음 호출할 때 한 번만 읽음)
+    파일이 없으면 빈 dict를 반환하므로, 필요한 항목이 없을 때의 오류는 그 항목을 쓰는 쪽에서 발생한다.
+    """
+    path = path or SETTINGS_PATH
+    with _settings_lock:
+        if path not in _settings:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    _settings[path] = yaml.safe_load(f) or {}
+            except FileNotFoundError:
+                _settings[path] = {}
+        return _settings[path]
+
+
+def setting(section, key, env=None, default=None):
+    """
+    설정값 하나 (환경 변수 env > settings.yaml의 section.key > default 순)
+    예: setting("cache", "dir", "METADATA_CACHE_DIR", "./cache")
+    """
+    if env and os.getenv(env) is not None:
+        return os.getenv(env)
+    value = (load_settings().get(section) or {}).get(key)
+    return default if value is None else value
@@ -1,30 +1,133 @@
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaFileUpload, MediaIoBaseDownload
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
+from googleapiclient.http import MediaUpload, build_http
+from google_auth_httplib2 import AuthorizedHttp
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.client import HTTPException
+import httplib2
 import os.path
 import io
-import yaml
+import json
+import mimetypes
+import random
+import threading
+import time
+from compression import CODECS, MIMETYPE_CODECS, CompressingReader, DecompressingWriter
+from config import load_settings
+from instrumentation import BYTES_UPLOADED, stage
+from storage import FOLDER_MIMETYPE, StorageBackend
 
 SCOPES = [
     "https://www.googleapis.com/auth/drive.file",
     "https://www.googleapis.com/auth/drive",
 ]
 
-with open(os.path.join("./settings", "settings.yaml")) as f:
-    CFG = yaml.safe_load(f)
+CFG = load_settings()
 TOKEN = CFG["gdrive"]["token"]
 CREDENTIALS = CFG["gdrive"]["credentials"]
 FOLDER_ID = CFG["gdrive"]["folder_id"]
-
-
-class GoogleDriveManager:
-    def __init__(self):
-        self.service = self.get_drive_service()
-        self.root_folder_id = FOLDER_ID
-
-    def get_drive_service(self):
+# 요청 간에 재사용할 인증된 HTTP 연결 최대 개수
+MAX_CONNECTIONS = CFG["gdrive"].get("max_connections", 8)
+# 만료까지 이 시간보다 적게 남으면 미리 토큰 갱신
+REFRESH_MARGIN = timedelta(seconds=CFG["gdrive"].get("refresh_margin", 300))
+# 재개 가능한 업로드의 청크 크기 (256KB의 배수)
+UPLOAD_CHUNKSIZE = CFG["gdrive"].get("upload_chunksize", 8 * 1024 * 1024)
+# 일시적 오류 발생 시 청크 하나당 최대 재시도 횟수와 지수 백오프 기본/최대 대기 시간 (초)
+UPLOAD_MAX_RETRIES = CFG["gdrive"].get("upload_max_retries", 5)
+UPLOAD_BACKOFF = CFG["gdrive"].get("upload_backoff", 1.0)
+UPLOAD_MAX_BACKOFF = CFG["gdrive"].get("upload_max_backoff", 32.0)
+# 테스트용 가짜 Drive 서버 등 다른 API 엔드포인트를 사용할 때 지정
+API_ENDPOINT = CFG["gdrive"].get("api_endpoint")
+
+# 목록/변경 사항 조회 시 한 페이지의 최대 항목 수
+LIST_PAGE_SIZE = CFG["gdrive"].get("list_page_size", 1000)
+# 업로드 결과와 변경 사항 조회에서 받아올 파일 필드
+FILE_FIELDS = (
+    "id, name, mimeType, parents, size, md5Checksum, createdTime, modifiedTime, "
+    "trashed, appProperties"
+)
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# 업로드 세션이 만료되어 처음부터 다시 시작해야 하는 상태 코드
+EXPIRED_SESSION_STATUS = {404, 410}
+
+
+class ChunkedMediaUpload(MediaIoBaseUpload):
+    """
+    청크마다 스트림에서 바이트를 읽어 보내는 재개 가능한 업로드 미디어
+    MediaIoBaseUpload는 스트림 조각을 그대로 요청 본문으로 넘기므로 next_chunk(num_retries=...)가
+    같은 청크를 다시 보낼 때 이미 읽은 조각이 비어 있게 된다. 바이트로 읽어 두면 재시도해도 같은 본문을 보낸다.
+    """
+
+    def has_stream(self):
+        return False
+
+
+class CompressingMediaUpload(MediaUpload):
+    """
+    원본 스트림을 읽으면서 압축한 바이트를 보내는 재개 가능한 업로드 미디어
+    압축 후 크기를 미리 알 수 없으므로 크기 미지정(*)으로 청크 업로드한다.
+    """
+
+    def __init__(self, stream, codec, chunksize=None):
+        super().__init__()
+        self._reader = CompressingReader(stream, codec)
+        self._mimetype = CODECS[codec][1]
+        self._chunksize = chunksize or UPLOAD_CHUNKSIZE
+        stream.seek(0, os.SEEK_END)
+        self._source_size = stream.tell()
+        stream.seek(0)
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return None
+
+    def resumable(self):
+        return True
+
+    def getbytes(self, begin, length):
+        return self._reader.read_at(begin, length)
+
+    def has_stream(self):
+        return False
+
+    def uploaded_size(self):
+        """지금까지 만든 압축 바이트 수 (업로드가 끝나면 압축 후 전체 크기)"""
+        return self._reader.output_bytes
+
+    def source_progress(self):
+        """원본 스트림 기준 진행률 (압축 후 전체 크기를 모르므로 대신 사용)"""
+        if not self._source_size:
+            return 1.0
+        return self._reader.source_bytes / self._source_size
+
+
+class DriveServicePool:
+    """
+    프로세스 전체에서 공유하는 Drive 서비스, 인증 정보, 인증된 HTTP 연결 풀
+    httplib2.Http는 스레드 안전하지 않으므로 요청마다 풀에서 연결을 하나씩 빌려 사용
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = []
+        self._creds = None
+        self._service = None
+
+    def _load_credentials(self):
         creds = None
         # 토큰 파일 존재 확인
         if os.path.exists(TOKEN):
@@ -44,12 +147,106 @@ class GoogleDriveManager:
                     prompt="consent",
                 )
                 creds = flow.run_local_server(port=0)
+            self._save_credentials(creds)
+        return creds
+
+    def _save_credentials(self, creds):
+        # 토큰 저장
+        with open(TOKEN, "w") as token:
+            token.write(creds.to_json())
+
+    def credentials(self):
+        """캐시된 인증 정보 반환 (만료가 가까우면 미리 갱신)"""
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load_credentials()
+            expiry = self._creds.expiry
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if (
+                self._creds.refresh_token
+                and expiry is not None
+                and expiry - now < REFRESH_MARGIN
+            ):
+                self._creds.refresh(Request())
+                self._save_credentials(self._creds)
+            return self._creds
+
+    @property
+    def service(self):
+        """최초 한 번만 생성하는 Drive v3 서비스 객체"""
+        creds = self.credentials()
+        with self._lock:
+            if self._service is None:
+                self._service = _build_service(creds)
+            return self._service
+
+    @contextmanager
+    def connection(self):
+        """풀에서 인증된 HTTP 연결을 빌려 사용 후 반납"""
+        creds = self.credentials()
+        with self._slots:
+            with self._lock:
+                http = self._idle.pop() if self._idle else None
+            if http is None:
+                # build_http는 재개 가능한 업로드의 308 응답을 리다이렉트로 처리하지 않음
+                http = AuthorizedHttp(creds, http=build_http())
+            try:
+                yield http
+            finally:
+                with self._lock:
+                    self._idle.append(http)
+
+
+def _build_service(creds):
+    """Drive v3 서비스 생성 (API_ENDPOINT 지정 시 업로드 URL까지 해당 서버로 향하도록 설정)"""
+    if not API_ENDPOINT:
+        return build("drive", "v3", credentials=creds, cache_discovery=False)
+    document = json.loads(get_static_doc("drive", "v3"))
+    document["rootUrl"] = API_ENDPOINT
+    return build_from_document(document, credentials=creds)
+
+
+def _is_transient_error(error):
+    """재시도하면 성공할 수 있는 네트워크/서버 오류인지 판단"""
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUS
+    return isinstance(
+        error,
+        (
+            httplib2.HttpLib2Error,
+            HTTPException,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_drive_pool():
+    """프로세스 전체에서 공유하는 DriveServicePool 반환"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriveServicePool()
+        return _pool
+
+
+class GoogleDriveManager(StorageBackend):
+    def __init__(self):
+        self.pool = get_drive_pool()
+        self.service = self.get_drive_service()
+        self.root_folder_id = FOLDER_ID
 
-            # 토큰 저장
-            with open(TOKEN, "w") as token:
-                token.write(creds.to_json())
+    def get_drive_service(self):
+        return self.pool.service
 
-        return build("drive", "v3", credentials=creds)
+    def _execute(self, request):
+        """풀에서 빌린 연결로 API 요청 실행"""
+        with self.pool.connection() as http:
+            return request.execute(http=http)
 
     def list_folder_files(self, folder_id=None):
         """폴더 내 파일 목록 조회"""
@@ -58,125 +255,222 @@ class GoogleDriveManager:
         query = f"'{folder_id}' in parents and trashed=false"
 
         try:
-            results = (
-                self.service.files()
-                .list(
-                    q=query,
-                    pageSize=100,
-                    fields="nextPageToken, files(id, name, mimeType, modifiedTime, size)",
+            # 결과가 잘리지 않도록 nextPageToken을 따라 모든 페이지 조회
+            files = []
+            page_token = None
+            while True:
+                results = self._execute(
+                    self.service.files().list(
+                        q=query,
+                        pageSize=LIST_PAGE_SIZE,
+                        pageToken=page_token,
+                        fields="nextPageToken, files(id, name, mimeType, modifiedTime, size)",
+                    )
                 )
-                .execute()
-            )
-
-            return results.get("files", [])
+                files.extend(results.get("files", []))
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    return files
         except Exception as e:
             print(f"Error listing files: {str(e)}")
             return []
 
-    def upload_file(self, file_path, folder_id=None):
-        """파일 업로드"""
+    def get_file(self, file_id):
+        """파일 정보 조회 (없으면 None, 그 외 오류는 예외 발생)"""
         try:
-            file_metadata = {"name": os.path.basename(file_path)}
-            if not folder_id:
-                folder_id = self.root_folder_id
-            file_metadata["parents"] = [folder_id]
-
-            media = MediaFileUpload(file_path, resumable=True)
-
-            file = (
-                self.service.files()
-                .create(body=file_metadata, media_body=media, fields="id, name")
-                .execute()
+            return self._execute(
+                self.service.files().get(fileId=file_id, fields=FILE_FIELDS)
             )
-
-            print(
-                f"File uploaded successfully: {file.get('name')} (ID: {file.get('id')})"
-            )
-            return file
-        except Exception as e:
-            print(f"Error uploading file: {str(e)}")
-            return None
-
-    def upload_json_data(self, json_string, filename, folder_id=None):
-        """직렬화된 JSON string 직접 업로드"""
-        try:
-            # 메모리 스트림으로 변환
-            file_stream = io.BytesIO(json_string.encode("utf-8"))
-
-            # 파일 메타데이터 설정
-            file_metadata = {"name": filename, "mimeType": "application/json"}
-            if folder_id:
-                file_metadata["parents"] = [folder_id]
-
-            # 미디어 객체 생성
-            media = MediaIoBaseUpload(
-                file_stream, mimetype="application/json", resumable=True
+        except HttpError as e:
+            if e.resp.status == 404:
+                return None
+            raise
+
+    def get_start_page_token(self):
+        """지금 이후의 변경 사항부터 조회하기 위한 changes 피드 시작 토큰"""
+        response = self._execute(self.service.changes().getStartPageToken())
+        return response["startPageToken"]
+
+    def iter_changes(self, page_token):
+        """
+        page_token 이후의 변경 사항을 페이지 단위로 순회 (실패 시 예외 발생)
+        반환: (변경 목록, 다음 페이지 토큰) 순회 - 마지막 페이지의 토큰은
+              이후 변경 사항을 조회할 때 사용할 newStartPageToken
+        """
+        while page_token:
+            response = self._execute(
+                self.service.changes().list(
+                    pageToken=page_token,
+                    pageSize=LIST_PAGE_SIZE,
+                    includeRemoved=True,
+                    spaces="drive",
+                    fields=(
+                        "nextPageToken, newStartPageToken, "
+                        f"changes(fileId, removed, time, file({FILE_FIELDS}))"
+                    ),
+                )
             )
+            next_token = response.get("nextPageToken")
+            new_start_token = response.get("newStartPageToken")
+            yield response.get("changes", []), next_token or new_start_token
+            page_token = next_token
 
-            # 파일 업로드
-            file = (
-                self.service.files()
-                .create(body=file_metadata, media_body=media, fields="id, name")
-                .execute()
+    def upload_file(self, file_path, folder_id=None):
+        """로컬 파일을 청크 단위 재개 가능한 업로드로 전송 (실패 시 예외 발생)"""
+        mimetype = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        with open(file_path, "rb") as stream:
+            file = self._upload_stream(
+                stream,
+                os.path.basename(file_path),
+                mimetype,
+                folder_id or self.root_folder_id,
             )
+        print(f"File uploaded successfully: {file.get('name')} (ID: {file.get('id')})")
+        return file
+
+    def _upload_stream(
+        self,
+        stream,
+        filename,
+        mimetype,
+        folder_id=None,
+        progress_callback=None,
+        compression=None,
+        properties=None,
+    ):
+        """
+        바이너리 스트림을 청크 단위 재개 가능한 업로드로 전송 (실패 시 예외 발생)
+        일시적 오류 응답은 클라이언트의 num_retries로 같은 청크를 재시도하고, 전송 중 연결 오류는
+        서버가 받은 위치를 조회해 이어서 업로드한다. 세션이 만료되면 새 세션으로 처음부터 다시 보낸다.
+        progress_callback: 청크 하나를 보낼 때마다 진행률(0~1)을 인자로 호출
+        compression: "gzip" 또는 "zstd" 지정 시 업로드하면서 스트리밍 압축
+                     (파일명에 확장자가 붙고 mimetype이 코덱에 맞게 바뀜)
+        properties: 파일에 붙일 appProperties (changes 피드에서 카탈로그 항목을 식별하는 데 사용)
+        """
+        if compression:
+            filename += CODECS[compression][0]
+            mimetype = CODECS[compression][1]
+
+        # 파일 메타데이터 설정
+        file_metadata = {"name": filename, "mimeType": mimetype}
+        if folder_id:
+            file_metadata["parents"] = [folder_id]
+        if properties:
+            file_metadata["appProperties"] = {
+                key: str(value) for key, value in properties.items() if value
+            }
 
-            print(
-                f"JSON file uploaded successfully: {file.get('name')} (ID: {file.get('id')})"
+        def new_request():
+            """스트림 처음부터 보내는 새 업로드 요청 (미디어 객체도 새로 생성)"""
+            stream.seek(0)
+            if compression:
+                media = CompressingMediaUpload(stream, compression)
+            else:
+                media = ChunkedMediaUpload(
+                    stream,
+                    mimetype=mimetype,
+                    chunksize=UPLOAD_CHUNKSIZE,
+                    resumable=True,
+                )
+            request = self.service.files().create(
+                body=file_metadata, media_body=media, fields=FILE_FIELDS
             )
-            return file
+            return request, media
+
+        request, media = new_request()
+
+        # 파일 업로드
+        with stage("drive_upload"), self.pool.connection() as http:
+            response = None
+            retries = 0
+            while response is None:
+                try:
+                    status, response = request.next_chunk(
+                        http=http, num_retries=UPLOAD_MAX_RETRIES
+                    )
+                except Exception as e:
+                    expired = (
+                        isinstance(e, HttpError)
+                        and e.resp.status in EXPIRED_SESSION_STATUS
+                        and request.resumable_uri is not None
+                    )
+                    if not (expired or _is_transient_error(e)):
+                        raise
+                    if retries >= UPLOAD_MAX_RETRIES:
+                        raise
+                    if expired:
+                        # 업로드 세션이 만료되면 처음부터 새 세션으로 업로드
+                        request, media = new_request()
+                    retries += 1
+                    delay = min(UPLOAD_BACKOFF * 2 ** (retries - 1), UPLOAD_MAX_BACKOFF)
+                    print(
+                        f"Retrying upload of {filename} in {delay:.1f}s "
+                        f"({retries}/{UPLOAD_MAX_RETRIES}): {str(e)}"
+                    )
+                    time.sleep(delay * random.uniform(0.5, 1.0))
+                    continue
+                retries = 0
+                if status and progress_callback:
+                    progress_callback(
+                        media.source_progress() if compression else status.progress()
+                    )
+        BYTES_UPLOADED.inc(media.uploaded_size() if compression else media.size())
+        if progress_callback:
+            progress_callback(1.0)
+        return response
 
-        except Exception as e:
-            print(f"Error uploading JSON data: {str(e)}")
-            return None
+    def upload_json_data(self, json_string, filename, folder_id=None):
+        """직렬화된 JSON string 직접 업로드 (실패 시 예외 발생)"""
+        # 메모리 스트림으로 변환
+        file_stream = io.BytesIO(json_string.encode("utf-8"))
+        file = self._upload_stream(file_stream, filename, "application/json", folder_id)
+        print(
+            f"JSON file uploaded successfully: {file.get('name')} (ID: {file.get('id')})"
+        )
+        return file
 
     def upload_dataframe(self, dataframe, filename, folder_id=None):
-        """Pandas DataFrame 직접 업로드"""
-        try:
-            # DataFrame을 CSV 스트림으로 변환
-            buffer = io.StringIO()
-            dataframe.to_csv(buffer, index=False)
-            file_stream = io.BytesIO(buffer.getvalue().encode("utf-8"))
-
-            # 파일 메타데이터 설정
-            file_metadata = {"name": filename, "mimeType": "text/csv"}
-            if folder_id:
-                file_metadata["parents"] = [folder_id]
-
-            # 미디어 객체 생성
-            media = MediaIoBaseUpload(file_stream, mimetype="text/csv", resumable=True)
-
-            # 파일 업로드
-            file = (
-                self.service.files()
-                .create(body=file_metadata, media_body=media, fields="id, name")
-                .execute()
-            )
-
-            print(
-                f"DataFrame uploaded successfully: {file.get('name')} (ID: {file.get('id')})"
-            )
-            return file
-
-        except Exception as e:
-            print(f"Error uploading DataFrame: {str(e)}")
-            return None
-
-    def download_file(self, file_id, output_path):
-        """파일 다운로드"""
+        """Pandas DataFrame 직접 업로드 (실패 시 예외 발생)"""
+        # DataFrame을 바이트 CSV 스트림으로 바로 직렬화
+        file_stream = io.BytesIO()
+        dataframe.to_csv(file_stream, index=False, encoding="utf-8")
+        file_stream.seek(0)
+        file = self._upload_stream(file_stream, filename, "text/csv", folder_id)
+        print(
+            f"DataFrame uploaded successfully: {file.get('name')} (ID: {file.get('id')})"
+        )
+        return file
+
+    def upload_fileobj(self, fileobj, filename, mimetype, folder_id=None):
+        """파일 객체를 메모리로 복사하지 않고 그대로 업로드 (실패 시 예외 발생)"""
+        file = self._upload_stream(fileobj, filename, mimetype, folder_id)
+        print(f"File uploaded successfully: {file.get('name')} (ID: {file.get('id')})")
+        return file
+
+    def download_file(self, file_id, output_path, decompress=True):
+        """파일 다운로드 (압축 업로드한 파일은 기본적으로 받으면서 압축 해제)"""
         try:
             # 파일 메타데이터 가져오기
-            file_metadata = self.service.files().get(fileId=file_id).execute()
+            file_metadata = self._execute(
+                self.service.files().get(fileId=file_id, fields="id, name, mimeType")
+            )
 
             # 파일 다운로드
-            request = self.service.files().get_media(fileId=file_id)
-            fh = io.FileIO(output_path, "wb")
-            downloader = MediaIoBaseDownload(fh, request)
-
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-                if status:
-                    print(f"Download {int(status.progress() * 100)}%")
+            with self.pool.connection() as http:
+                request = self.service.files().get_media(fileId=file_id)
+                request.http = http
+                fh = io.FileIO(output_path, "wb")
+                codec = MIMETYPE_CODECS.get(file_metadata.get("mimeType"))
+                if decompress and codec:
+                    fh = DecompressingWriter(fh, codec)
+                downloader = MediaIoBaseDownload(fh, request)
+
+                done = False
+                while done is False:
+                    status, done = downloader.next_chunk()
+                    if status:
+                        print(f"Download {int(status.progress() * 100)}%")
+                fh.close()
 
             print(f"File downloaded successfully: {file_metadata.get('name')}")
             return True
@@ -189,15 +483,16 @@ class GoogleDriveManager:
         try:
             file_metadata = {
                 "name": folder_name,
-                "mimeType": "application/vnd.google-apps.folder",
+                "mimeType": FOLDER_MIMETYPE,
             }
             if not parent_folder_id:
                 parent_folder_id = self.root_folder_id
             file_metadata["parents"] = [parent_folder_id]
 
-            file = (
-                self.service.files().create(body=file_metadata, fields="id").execute()
-            )
+            with stage("drive_create_folder"):
+                file = self._execute(
+                    self.service.files().create(body=file_metadata, fields="id")
+                )
 
             print(f"Folder created successfully with ID: {file.get('id')}")
             return file.get("id")
@@ -205,15 +500,21 @@ class GoogleDriveManager:
             print(f"Error creating folder: {str(e)}")
             return None
 
-    # def delete_file(self, file_id):
-    #     """파일 삭제"""
-    #     try:
-    #         self.service.files().delete(fileId=file_id).execute()
-    #         print(f"File with ID {file_id} deleted successfully")
-    #         return True
-    #     except Exception as e:
-    #         print(f"Error deleting file: {str(e)}")
-    #         return False
+    def folder_url(self, folder_id):
+        return f"https://drive.google.com/drive/folders/{folder_id}"
+
+    def file_url(self, file_id):
+        return f"https://drive.google.com/file/d/{file_id}/view"
+
+    def delete_file(self, file_id):
+        """파일 삭제"""
+        try:
+            self._execute(self.service.files().delete(fileId=file_id))
+            print(f"File with ID {file_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"Error deleting file: {str(e)}")
+            return False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+import numpy as np
+import pandas as pd
+from sketches import hash_texts
+from text_kernel import code_points, mix64
+
+# 코드포인트(최대 0x10FFFF)는 21비트에 들어가므로 3-gram은 64비트 정수 하나로 정확히 표현됨
+_CODEPOINT_BITS = 21
+_FNV_PRIME = np.uint64(0x100000001B3)
+# 유사도를 한 번에 추정하는 후보 쌍 수
+_PAIR_BATCH = 1 << 19
+
+
+def _permutations(num_perm, seed=0):
+    """MinHash용 multiply-shift 해시 계수 (모든 프로세스에서 같은 값이어야 하므로 시드 고정)"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def shingle_hashes(texts, shingle_size=3):
+    """
+    텍스트별 문자 n-gram을 64비트 정수로 변환
+
+    n보다 짧은 텍스트는 텍스트 전체를 n-gram 하나로 취급한다.
+    반환: (shingles uint64 배열, 행별 shingle 시작 위치)
+    """
+    codepoints, lengths = code_points(texts)
+    counts = np.maximum(lengths - shingle_size + 1, 1)
+    offsets = np.cumsum(counts) - counts
+    row_starts = np.cumsum(lengths) - lengths
+    positions = np.arange(counts.sum()) - np.repeat(offsets - row_starts, counts)
+    row_ends = np.repeat(row_starts + lengths, counts)
+
+    padded = np.concatenate([codepoints, np.zeros(shingle_size, dtype=np.uint32)])
+    shingles = np.zeros(len(positions), dtype=np.uint64)
+    for j in range(shingle_size):
+        # 실제 문자는 1 이상, 텍스트 끝을 넘어간 자리는 0으로 채움
+        chars = padded[positions + j].astype(np.uint64) + np.uint64(1)
+        chars[positions + j >= row_ends] = 0
+        shingles = (shingles << np.uint64(_CODEPOINT_BITS)) | chars
+    return shingles, offsets
+
+
+def minhash_signatures(texts, num_perm, shingle_size=3):
+    """
+    텍스트별 b-bit MinHash 서명 계산 (각 최솟값의 하위 8비트만 보관)
+    반환: (텍스트 수, num_perm) uint8 배열
+    """
+    shingles, offsets = shingle_hashes(texts, shingle_size)
+    shingles = mix64(shingles)
+    a, b = _permutations(num_perm)
+    signatures = np.empty((len(offsets), num_perm), dtype=np.uint8)
+    for i in range(num_perm):
+        hashed = (shingles * a[i] + b[i]) >> np.uint64(32)
+        signatures[:, i] = np.minimum.reduceat(hashed, offsets) & np.uint64(0xFF)
+    return signatures
+
+
+def estimate_similarity(signatures, u, v):
+    """두 서명 집합의 행 쌍 (u, v)별 자카드 유사도 추정 (8비트 우연 일치 보정)"""
+    matches = (
+        np.count_nonzero(signatures[u] == signatures[v], axis=1) / signatures.shape[1]
+    )
+    return (matches - 1 / 256) / (1 - 1 / 256)
+
+
+def _connected_components(num_nodes, u, v, labels=None):
+    """
+    간선 (u, v)로 연결된 노드들을 같은 레이블(구성 요소의 최소 노드 번호)로 묶음
+    labels: 이전 호출의 결과 (지정하면 그 군집에 간선을 더 이어 붙임)
+    """
+    labels = np.arange(num_nodes) if labels is None else labels.copy()
+    while True:
+        lu, lv = labels[u], labels[v]
+        changed = lu != lv
+        if not changed.any():
+            return labels
+        u, v = u[changed], v[changed]
+        np.minimum.at(labels, np.maximum(lu, lv)[changed], np.minimum(lu, lv)[changed])
+        # 포인터 점프로 각 노드가 루트를 직접 가리키도록 압축
+        while True:
+            parents = labels[labels]
+            if np.array_equal(parents, labels):
+                break
+            labels = parents
+
+
+class DuplicateAccumulator:
+    """
+    완전 중복(텍스트 해시)과 근사 중복(MinHash + LSH 밴딩) 보고서를 위한 병합 가능한 누적기
+
+    행마다 텍스트 해시와 8비트 MinHash 서명만 보관하므로 메모리는 행당 num_perm + 8바이트 정도다.
+    LSH 밴드 버킷이 같은 텍스트 쌍을 모두 후보로 보고, 서명으로 추정한 문자 n-gram 자카드 유사도가
+    threshold 이상인 후보끼리 연결하여 군집을 만든다. 버킷 하나의 비교 쌍 수는 max_bucket_size로 제한한다.
+    """
+
+    def __init__(
+        self,
+        shingle_size=3,
+        num_perm=64,
+        bands=16,
+        threshold=0.8,
+        batch_size=50_000,
+        max_bucket_size=32,
+    ):
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.max_bucket_size = max_bucket_size
+        self.text_hashes = []
+        self.signatures = []
+        self.targets = []
+
+    def update(self, texts, targets):
+        """결측치를 제외한 텍스트 Series와 같은 행의 타겟을 누적"""
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts.iloc[start : start + self.batch_size]
+            hashes = hash_texts(batch)
+            # 같은 텍스트는 서명도 같으므로 덩어리 안의 고유 텍스트만 MinHash 계산
+            _, first, inverse = np.unique(
+                hashes, return_index=True, return_inverse=True
+            )
+            signatures = minhash_signatures(
+                batch.iloc[first], self.num_perm, self.shingle_size
+            )
+            self.text_hashes.append(hashes)
+            self.signatures.append(signatures[inverse])
+            self.targets.append(
+                targets.iloc[start : start + self.batch_size].to_numpy(dtype=object)
+            )
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합 (데이터셋 순서대로 병합해야 함)"""
+        self.text_hashes.extend(other.text_hashes)
+        self.signatures.extend(other.signatures)
+        self.targets.extend(other.targets)
+        return self
+
+    def _band_keys(self, signatures):
+        """서명을 밴드 단위로 묶은 64비트 버킷 키"""
+        rows = self.num_perm // self.bands
+        bands = signatures[:, : self.bands * rows].reshape(
+            len(signatures), self.bands, rows
+        )
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(rows):
+            keys = (keys ^ bands[:, :, row].astype(np.uint64)) * _FNV_PRIME
+        return keys
+
+    def _bucket_pairs(self, order, keys):
+        """
+        밴드 키로 정렬한 텍스트에서 같은 버킷 안의 모든 쌍
+        max_bucket_size보다 큰 버킷은 정렬 순서대로 max_bucket_size개씩 나눈 구간 안의 모든 쌍과
+        이웃한 구간의 경계 쌍만 비교한다.
+        반환: (u, v) 고유 텍스트 번호 배열 목록, max_bucket_size를 넘어 나눈 버킷 수
+        """
+        positions = np.arange(len(keys))
+        new_bucket = np.r_[True, keys[1:] != keys[:-1]]
+        bucket_starts = np.flatnonzero(new_bucket)
+        bucket_sizes = np.diff(np.r_[bucket_starts, len(keys)])
+        truncated = int((bucket_sizes > self.max_bucket_size).sum())
+        in_bucket = positions - bucket_starts[np.cumsum(new_bucket) - 1]
+        window_starts = np.flatnonzero(in_bucket % self.max_bucket_size == 0)
+        window_sizes = np.diff(np.r_[window_starts, len(keys)])
+        # 같은 버킷의 이웃한 구간은 경계의 두 텍스트로 잇기
+        boundaries = window_starts[in_bucket[window_starts] > 0]
+        u, v = [order[boundaries - 1]], [order[boundaries]]
+        # 크기가 같은 구간끼리 모아 상삼각 인덱스로 한 번에 쌍 생성
+        for size in np.unique(window_sizes[window_sizes > 1]):
+            first, second = np.triu_indices(size, 1)
+            starts = window_starts[window_sizes == size][:, None]
+            u.append(order[(starts + first).ravel()])
+            v.append(order[(starts + second).ravel()])
+        return u, v, truncated
+
+    def _clusters(self, signatures):
+        """
+        고유 텍스트별 근사 중복 군집 레이블
+        반환: (군집 레이블, max_bucket_size를 넘어 나눈 (밴드, 버킷) 수)
+        """
+        num_texts = len(signatures)
+        band_keys = self._band_keys(signatures)
+        labels = np.arange(num_texts)
+        truncated = 0
+        for band in range(self.bands):
+            # 버킷 키로 정렬하되 버킷 안에서는 다음 밴드 키 순으로 정렬하여
+            # 큰 버킷을 나눌 때 두 밴드를 공유하는(더 비슷한) 텍스트끼리 같은 구간에 들도록 함
+            following = band_keys[:, (band + 1) % self.bands]
+            order = np.lexsort((following, band_keys[:, band]))
+            pairs_u, pairs_v, band_truncated = self._bucket_pairs(
+                order, band_keys[order, band]
+            )
+            truncated += band_truncated
+            edges_u, edges_v = [], []
+            for u, v in zip(pairs_u, pairs_v):
+                # 앞 밴드에서 이미 같은 군집이 된 쌍은 비교하지 않음
+                pending = labels[u] != labels[v]
+                u, v = u[pending], v[pending]
+                # 유사도 추정의 임시 메모리(쌍당 서명 2개)를 제한하도록 _PAIR_BATCH 쌍씩 비교
+                for start in range(0, len(u), _PAIR_BATCH):
+                    batch_u = u[start : start + _PAIR_BATCH]
+                    batch_v = v[start : start + _PAIR_BATCH]
+                    similar = (
+                        estimate_similarity(signatures, batch_u, batch_v)
+                        >= self.threshold
+                    )
+                    edges_u.append(batch_u[similar])
+                    edges_v.append(batch_v[similar])
+            if edges_u:
+                labels = _connected_components(
+                    num_texts, np.concatenate(edges_u), np.concatenate(edges_v), labels
+                )
+        return labels, truncated
+
+    def result(self):
+        """duplicate_report 형식의 결과 반환"""
+        parameters = {
+            "shingle_size": self.shingle_size,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "similarity_threshold": self.threshold,
+            "max_bucket_size": self.max_bucket_size,
+        }
+        hashes = (
+            np.concatenate(self.text_hashes)
+            if self.text_hashes
+            else np.zeros(0, dtype=np.uint64)
+        )
+        num_rows = len(hashes)
+        if num_rows == 0:
+            return {
+                "exact_duplicate_rows": 0,
+                "exact_duplicate_rate": 0.0,
+                "near_duplicate_clusters": 0,
+                "near_duplicate_rows": 0,
+                "near_duplicate_rate": 0.0,
+                "largest_cluster_size": 0,
+                "truncated_buckets": 0,
+                "per_class": {},
+                "parameters": parameters,
+            }
+
+        # 완전 중복: 앞에서 이미 나온 텍스트와 같은 행
+        _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        exact = np.ones(num_rows, dtype=bool)
+        exact[first] = False
+
+        # 근사 중복: 고유 텍스트끼리 군집을 만든 뒤 행으로 펼침, 군집의 첫 행이 아니면 중복
+        signatures = np.concatenate(self.signatures)[first]
+        clusters, truncated = self._clusters(signatures)
+        clusters = clusters[inverse]
+        _, cluster_first, cluster_sizes = np.unique(
+            clusters, return_index=True, return_counts=True
+        )
+        near = np.ones(num_rows, dtype=bool)
+        near[cluster_first] = False
+
+        rates = (
+            pd.DataFrame(
+                {
+                    "target": np.concatenate(self.targets),
+                    "exact_duplicate_rate": exact,
+                    "near_duplicate_rate": near,
+                }
+            )
+            .groupby("target", sort=False, dropna=False)
+            .mean()
+        )
+        return {
+            "exact_duplicate_rows": int(exact.sum()),
+            "exact_duplicate_rate": float(exact.mean()),
+            "near_duplicate_clusters": int((cluster_sizes > 1).sum()),
+            "near_duplicate_rows": int(near.sum()),
+            "near_duplicate_rate": float(near.mean()),
+            "largest_cluster_size": int(cluster_sizes.max()),
+            # max_bucket_size를 넘어 모든 쌍을 비교하지 못한 (밴드, 버킷) 수
+            "truncated_buckets": truncated,
+            "per_class": {
+                str(label): {name: float(value) for name, value in row.items()}
+                for label, row in rates.iterrows()
+            },
+            "parameters": parameters,
+        }
@@ -0,0 +1,297 @@
+"""
+로컬 테스트용 가짜 Google Drive v3 HTTP 서버
+
+GoogleDriveManager가 사용하는 API(폴더 생성, 재개 가능한 업로드, 목록 조회, 다운로드,
+삭제, changes 피드)만 메모리에 구현한다. settings.yaml의 gdrive.api_endpoint를 이 서버 주소로 지정해서 사용한다.
+
+    python fake_drive.py --port 8080 --fail-rate 0.3
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeDriveState:
+    """가짜 Drive 서버의 파일 및 업로드 세션 저장소"""
+
+    def __init__(self, fail_rate=0.0, keep_contents=True):
+        self.fail_rate = fail_rate
+        # False면 업로드 내용은 버리고 크기만 기록 (벤치마크 등 큰 업로드용)
+        self.keep_contents = keep_contents
+        self.files = {}
+        self.contents = {}
+        self.sessions = {}
+        # 실패를 주입한 청크 수 (응답 종류별)
+        self.failures = {308: 0, 503: 0}
+        # changes 피드: 변경 순서대로 (파일 ID, 삭제 여부, 시각), 페이지 토큰은 1부터 시작하는 위치
+        self.changes = []
+        self.lock = threading.Lock()
+
+    def _record_change(self, file_id, removed=False):
+        self.changes.append((file_id, removed, _now()))
+
+    def create_file(self, metadata, content=None, size=None):
+        file_id = uuid.uuid4().hex
+        now = _now()
+        with self.lock:
+            self.files[file_id] = {
+                "id": file_id,
+                "name": metadata.get("name"),
+                "mimeType": metadata.get("mimeType", "application/octet-stream"),
+                "parents": metadata.get("parents", []),
+                "createdTime": now,
+                "modifiedTime": now,
+                "trashed": False,
+            }
+            if metadata.get("appProperties"):
+                self.files[file_id]["appProperties"] = metadata["appProperties"]
+            if content is not None:
+                self.contents[file_id] = bytes(content)
+                self.files[file_id]["md5Checksum"] = hashlib.md5(content).hexdigest()
+                size = len(content)
+            if size is not None:
+                self.files[file_id]["size"] = str(size)
+            self._record_change(file_id)
+        return self.files[file_id]
+
+    def update_file(self, file_id, **fields):
+        """파일 정보 변경 (드라이브 UI에서의 이름 변경, 휴지통 이동 같은 외부 변경 재현용)"""
+        with self.lock:
+            file = self.files[file_id]
+            file.update(fields, modifiedTime=_now())
+            self._record_change(file_id)
+        return file
+
+    def delete_file(self, file_id):
+        with self.lock:
+            file = self.files.pop(file_id, None)
+            self.contents.pop(file_id, None)
+            if file is not None:
+                self._record_change(file_id, removed=True)
+        return file
+
+    def list_changes(self, page_token, page_size):
+        """page_token 위치부터 최대 page_size개의 변경 사항 (changes.list 응답 형식)"""
+        start = int(page_token) - 1
+        with self.lock:
+            page = self.changes[start : start + page_size]
+            end = start + len(page)
+            changes = []
+            for file_id, removed, time in page:
+                change = {"fileId": file_id, "removed": removed, "time": time}
+                # 실제 Drive처럼 변경 시점이 아닌 현재 파일 상태를 돌려줌
+                if not removed and file_id in self.files:
+                    change["file"] = self.files[file_id]
+                elif not removed:
+                    change["removed"] = True
+                changes.append(change)
+            response = {"changes": changes}
+            if end < len(self.changes):
+                response["nextPageToken"] = str(end + 1)
+            else:
+                response["newStartPageToken"] = str(len(self.changes) + 1)
+        return response
+
+    def receive(self, session, start, body):
+        """업로드 세션의 start 위치부터 받은 청크를 기록하고 지금까지 받은 바이트 수 반환"""
+        if self.keep_contents:
+            del session["data"][start:]
+            session["data"] += body
+            return len(session["data"])
+        session["received"] = start + len(body)
+        return session["received"]
+
+    def received(self, session):
+        if self.keep_contents:
+            return len(session["data"])
+        return session["received"]
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z"
+
+
+class FakeDriveHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _fields(self, file):
+        # fields 파라미터와 관계없이 파일 정보 전체를 반환
+        return dict(file)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        body = self._read_body()
+        metadata = json.loads(body) if body else {}
+        if url.path.endswith("/upload/drive/v3/files"):
+            # 재개 가능한 업로드 세션 시작
+            session_id = uuid.uuid4().hex
+            self.state.sessions[session_id] = {
+                "metadata": metadata,
+                "data": bytearray(),
+                "received": 0,
+            }
+            location = (
+                f"http://{self.headers['Host']}/upload/drive/v3/files"
+                f"?uploadType=resumable&upload_id={session_id}"
+            )
+            self._send_json(200, {}, {"Location": location})
+        elif url.path.endswith("/drive/v3/files"):
+            self._send_json(200, self._fields(self.state.create_file(metadata)))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_PUT(self):
+        query = parse_qs(urlparse(self.path).query)
+        session = self.state.sessions.get(query.get("upload_id", [None])[0])
+        body = self._read_body()
+        if session is None:
+            self._send_json(404, {"error": {"code": 404, "message": "no session"}})
+            return
+        match = re.match(r"bytes (\d+)-(\d+)/(\d+|\*)", self.headers["Content-Range"])
+        if match and body and random.random() < self.state.fail_rate:
+            # 청크 앞부분만 저장한 채 실패: 절반은 받은 위치(Range)를 알려주는 308로 이어서 보내게 하고,
+            # 절반은 일시적 서버 오류(503)로 같은 청크를 다시 보내게 함
+            received = self.state.receive(
+                session, int(match.group(1)), body[: random.randrange(len(body))]
+            )
+            if random.random() < 0.5:
+                self.state.failures[503] += 1
+                self._send_json(503, {"error": {"code": 503, "message": "unavailable"}})
+            else:
+                self.state.failures[308] += 1
+                self._send_incomplete(received)
+            return
+
+        if match:
+            start, total = int(match.group(1)), match.group(3)
+            received = self.state.receive(session, start, body)
+        else:
+            # "bytes */total": 현재까지 받은 위치 조회
+            total = self.headers["Content-Range"].split("/")[-1]
+            received = self.state.received(session)
+
+        if total != "*" and received >= int(total):
+            if self.state.keep_contents:
+                file = self.state.create_file(session["metadata"], session["data"])
+            else:
+                file = self.state.create_file(session["metadata"], size=received)
+            self._send_json(200, self._fields(file))
+            return
+        self._send_incomplete(received)
+
+    def _send_incomplete(self, received):
+        """업로드가 끝나지 않았음을 알리는 308 응답 (지금까지 받은 구간을 Range로 전달)"""
+        self.send_response(308)
+        if received:
+            self.send_header("Range", f"bytes=0-{received - 1}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        match = re.match(r".*/drive/v3/files/([^/]+)$", url.path)
+        if match:
+            file = self.state.files.get(match.group(1))
+            if file is None:
+                self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+            elif query.get("alt") == ["media"]:
+                content = self.state.contents.get(file["id"], b"")
+                self.send_response(200)
+                self.send_header("Content-Type", file["mimeType"])
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            else:
+                self._send_json(200, file)
+        elif url.path.endswith("/drive/v3/files"):
+            files = list(self.state.files.values())
+            parent = re.match(r"'([^']+)' in parents", query.get("q", [""])[0])
+            if parent:
+                files = [f for f in files if parent.group(1) in f["parents"]]
+            # pageToken은 다음 페이지의 시작 위치
+            start = int(query.get("pageToken", ["0"])[0])
+            page_size = int(query.get("pageSize", ["100"])[0])
+            response = {"files": files[start : start + page_size]}
+            if start + page_size < len(files):
+                response["nextPageToken"] = str(start + page_size)
+            self._send_json(200, response)
+        elif url.path.endswith("/drive/v3/changes/startPageToken"):
+            with self.state.lock:
+                token = str(len(self.state.changes) + 1)
+            self._send_json(200, {"startPageToken": token})
+        elif url.path.endswith("/drive/v3/changes"):
+            page_size = int(query.get("pageSize", ["100"])[0])
+            self._send_json(
+                200, self.state.list_changes(query["pageToken"][0], page_size)
+            )
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_DELETE(self):
+        match = re.match(r".*/drive/v3/files/([^/?]+)$", urlparse(self.path).path)
+        if match and self.state.delete_file(match.group(1)) is not None:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+
+def serve(host="localhost", port=8080, fail_rate=0.0, keep_contents=True):
+    """가짜 Drive 서버를 백그라운드 스레드로 시작하고 (서버, 상태)를 반환"""
+    state = FakeDriveState(fail_rate, keep_contents)
+    handler = type("Handler", (FakeDriveHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 테스트용 가짜 Google Drive 서버")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="업로드 청크 실패 확률"
+    )
+    parser.add_argument(
+        "--discard-contents",
+        action="store_true",
+        help="업로드 내용을 메모리에 보관하지 않고 크기만 기록",
+    )
+    args = parser.parse_args()
+
+    server, _ = serve(
+        args.host, args.port, args.fail_rate, keep_contents=not args.discard_contents
+    )
+    print(f"Fake Drive server running on http://{args.host}:{args.port}/")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,5 +1,7 @@
 import streamlit as st
+import hashlib
 import json
+import time
 import requests
 from components import (
     create_custom_input,
@@ -9,11 +11,59 @@ from components import (
     augmentation_options,
 )
 
+API_URL = "http://localhost:8000"
+# 작업 상태 조회 주기 (초)
+POLL_INTERVAL = 1.0
+
+
+def _display_preview(preview):
+    """표본 미리보기와 신뢰구간 표시"""
+    info = preview["preview"]
+    scope = "전체" if info["complete"] else f"앞부분 {info['rows_scanned']:,}행"
+    st.subheader("표본 미리보기")
+    st.caption(
+        f"{scope}에서 뽑은 {info['sample_size']:,}행 표본 기준 추정치 "
+        f"(신뢰수준 {info['confidence_level']:.0%}), 전체 결과를 계산하는 중입니다"
+    )
+    if info["scope"] == "prefix":
+        st.warning(
+            "파일을 끝까지 읽지 못해 신뢰구간과 비율은 읽은 앞부분에 대한 값입니다 "
+            "(정렬된 파일 등은 전체와 다를 수 있음)"
+        )
+    text_statistics = preview["text_statistics"]
+    columns = st.columns(3)
+    columns[0].metric("전체 행 수 (추정)", f"{preview['total_samples']:,}")
+    for column, name, label in (
+        (columns[1], "avg_length", "평균 길이"),
+        (columns[2], "avg_words", "평균 단어 수"),
+    ):
+        interval = text_statistics.get(f"{name}_ci")
+        column.metric(
+            label,
+            f"{text_statistics[name]:.2f}",
+            help=f"{interval[0]:.2f} ~ {interval[1]:.2f}" if interval else None,
+        )
+    target_distribution = preview["target_distribution"]
+    st.dataframe(
+        [
+            {
+                "레이블": label,
+                "비율": balance,
+                "신뢰구간 하한": target_distribution["class_balance_ci"][label][0],
+                "신뢰구간 상한": target_distribution["class_balance_ci"][label][1],
+            }
+            for label, balance in target_distribution["class_balance"].items()
+        ]
+    )
+
 
 def main():
     st.title("데이터셋 메타데이터 생성기")
     # 파일 업로드
-    uploaded_file = st.file_uploader("데이터셋 CSV 파일을 업로드하세요", type=["csv"])
+    uploaded_file = st.file_uploader(
+        "데이터셋 파일을 업로드하세요 (CSV, Parquet, Feather, Arrow)",
+        type=["csv", "parquet", "feather", "arrow"],
+    )
 
     # 실험 정보
     st.header("실험 정보")
@@ -68,11 +118,33 @@ def main():
             if method_name and method_desc:
                 augmentation_methods.append({method_name: method_desc})
 
+    # 근사 통계
+    approximate = st.checkbox("근사 통계 추가 (분위수, 고유 텍스트 수, 최빈 텍스트)")
+    duplicates = st.checkbox("중복 보고서 추가 (완전 중복, 근사 중복 군집)")
+    vocabulary = st.checkbox("어휘 통계 추가 (어휘 크기, 빈출 토큰, 빈출 문자 bigram)")
+    quality = st.checkbox(
+        "품질 검사 추가 (ID 중복, 빈/문장부호만 있는 텍스트, 텍스트-레이블 충돌)"
+    )
+    expected_labels = None
+    if quality:
+        expected_labels = st.text_input(
+            "허용 레이블 (쉼표로 구분, 비워 두면 레이블 검사 생략)", placeholder="0,1,2"
+        )
+    preview = st.checkbox(
+        "표본 미리보기 (전체 결과가 나오기 전에 표본 통계와 신뢰구간 표시)"
+    )
+
     # 클라우드 업로드
     st.header("클라우드 업로드")
     is_gdrive_upload = False
+    compression = None
     if st.checkbox("구글 드라이브 업로드"):
         is_gdrive_upload = True
+        compression = st.selectbox(
+            "데이터셋 압축",
+            [None, "gzip", "zstd"],
+            format_func=lambda c: c or "압축 안 함",
+        )
 
     if st.button("메타데이터 생성"):
         if not uploaded_file:
@@ -99,17 +171,54 @@ def main():
                 "preprocessing_steps": preprocessing_steps_json,
                 "augmentation_methods": augmentation_methods_json,
                 "is_gdrive_upload": is_gdrive_upload if is_gdrive_upload else None,
+                "compression": compression,
+                "approximate": approximate if approximate else None,
+                "duplicates": duplicates if duplicates else None,
+                "vocabulary": vocabulary if vocabulary else None,
+                "quality": quality if quality else None,
+                "expected_labels": expected_labels if expected_labels else None,
+                "preview": preview if preview else None,
             }
 
+            # 먼저 내용 해시만 보내고, 서버에 없는 데이터셋일 때만 파일 본문을 전송
+            file_bytes = uploaded_file.getvalue()
             response = requests.post(
-                "http://localhost:8000/generate_metadata",
-                files=files,
-                data=data,
+                f"{API_URL}/jobs",
+                data=dict(
+                    data,
+                    content_hash=hashlib.sha256(file_bytes).hexdigest(),
+                    content_md5=hashlib.md5(file_bytes).hexdigest(),
+                ),
             )
+            if response.status_code == 404 and response.json().get("upload_required"):
+                response = requests.post(f"{API_URL}/jobs", files=files, data=data)
+
+            # 작업 제출 후 완료될 때까지 상태 조회
+            if response.status_code != 202:
+                st.error(f"에러 발생: {response.text}")
+                return
+            job_id = response.json()["job_id"]
+
+            progress_bar = st.progress(0.0, text="메타데이터 생성 대기 중")
+            # 표본 미리보기는 전체 결과가 나올 때까지만 표시
+            preview_area = st.empty()
+            while True:
+                job = requests.get(f"{API_URL}/jobs/{job_id}").json()
+                progress_bar.progress(
+                    job["progress"], text=f"{job['status']} ({job['stage'] or '-'})"
+                )
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                if job.get("preview"):
+                    with preview_area.container():
+                        _display_preview(job["preview"])
+                time.sleep(POLL_INTERVAL)
+            preview_area.empty()
+            response = requests.get(f"{API_URL}/jobs/{job_id}/result")
 
             def _display_metadata(metadata, datasetname):
                 """메타데이터 표시 및 다운로드 버튼 생성"""
-                metadata_str = json.dumps(metadata, indent=2, ensure_ascii=False)
+                metadata_str = json.dumps(metadata, indent=4, ensure_ascii=False)
 
                 # 다운로드 버튼
                 st.download_button(
@@ -125,12 +234,20 @@ def main():
             if response.status_code == 200:
                 response_data = response.json()
                 gdrive_url = response_data.pop("gdrive_url", None)
+                response_data.pop("gdrive_dataset_id", None)
+                dataset_url = response_data.pop("gdrive_dataset_url", None)
+                response_data.pop("gdrive_uploads", None)
                 metadata = response_data
                 st.write(f"드라이브 업로드 성공: {gdrive_url}")
+                if dataset_url:
+                    st.write(f"데이터셋 파일: {dataset_url}")
                 _display_metadata(metadata, datasetname)
             elif response.status_code == 207:
                 st.write("드라이브 업로드 실패! 직접 업로드하세요.")
                 metadata = response.json()
+                for upload in metadata.pop("gdrive_uploads", []):
+                    if upload["status"] not in ("uploaded", "reused"):
+                        st.write(f"- {upload['name']}: {upload.get('error')}")
                 _display_metadata(metadata, datasetname)
             else:
                 st.error(f"에러 발생: {response.text}")
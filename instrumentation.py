@@ -0,0 +1,257 @@
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 지연 시간 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss():
+    """현재 프로세스의 상주 메모리(RSS) 바이트 (/proc이 없는 환경에서는 0)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """레이블 값 조합별로 증가만 하는 Prometheus 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # 레이블이 없는 카운터는 증가 전에도 0으로 노출
+        self._values = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [
+                (f"{self.name}{_format_labels(self.labelnames, key)}", value)
+                for key, value in self._values.items()
+            ]
+
+
+class Histogram:
+    """레이블 값 조합별 누적 버킷 개수, 합계, 관측 횟수를 가진 Prometheus 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            samples = []
+            for key, (counts, total) in self._values.items():
+                for bound, count in zip(self.buckets, counts):
+                    labels = _format_labels(
+                        self.labelnames, key, [("le", _format_value(bound))]
+                    )
+                    samples.append((f"{self.name}_bucket{labels}", count))
+                labels = _format_labels(self.labelnames, key)
+                samples.append((f"{self.name}_sum{labels}", total))
+                samples.append((f"{self.name}_count{labels}", counts[-1]))
+            return samples
+
+
+class MetricsRegistry:
+    """프로세스 전체 지표 모음 (Prometheus 텍스트 형식으로 출력)"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식(0.0.4) 문자열"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+REQUESTS = registry.register(
+    Counter(
+        "metadata_requests_total",
+        "HTTP requests by method, route and status code",
+        ["method", "route", "status"],
+    )
+)
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "metadata_request_duration_seconds",
+        "HTTP request latency by method and route",
+        ["method", "route"],
+    )
+)
+STAGE_LATENCY = registry.register(
+    Histogram(
+        "metadata_stage_duration_seconds",
+        "Duration of metadata pipeline stages",
+        ["stage"],
+    )
+)
+ROWS_PROCESSED = registry.register(
+    Counter("metadata_rows_processed_total", "Dataset rows scanned for statistics")
+)
+BYTES_UPLOADED = registry.register(
+    Counter("metadata_bytes_uploaded_total", "Bytes uploaded to Google Drive")
+)
+
+
+class Profile:
+    """
+    요청 하나의 단계별 소요 시간과 메모리(RSS) 변화 기록
+    같은 단계가 여러 번 기록되면 합산한다. 단계는 중첩될 수 있으며(scan 안의 decode 등)
+    RSS는 프로세스 전체 값이므로 동시에 실행되는 다른 작업의 영향도 포함된다.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._start = time.perf_counter()
+        self._start_rss = current_rss()
+        self._peak_rss = self._start_rss
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, memory_delta, rss):
+        with self._lock:
+            entry = self.stages.setdefault(
+                stage, {"seconds": 0.0, "calls": 0, "memory_delta_bytes": 0}
+            )
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+            entry["memory_delta_bytes"] += memory_delta
+            self._peak_rss = max(self._peak_rss, rss)
+
+    def to_dict(self):
+        """응답의 _profile 형식"""
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self._start, 6),
+                "peak_rss_mb": round(self._peak_rss / 2**20, 3),
+                "stages": {
+                    stage: {
+                        "seconds": round(entry["seconds"], 6),
+                        "calls": entry["calls"],
+                        "memory_delta_mb": round(
+                            entry["memory_delta_bytes"] / 2**20, 3
+                        ),
+                    }
+                    for stage, entry in self.stages.items()
+                },
+            }
+
+
+_current_profile = contextvars.ContextVar("metadata_profile", default=None)
+
+
+@contextmanager
+def activate(profile):
+    """with 블록 안에서 기록되는 단계를 profile에 모음 (None이면 지표만 기록)"""
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def _record(name, start, start_rss):
+    seconds = time.perf_counter() - start
+    rss = current_rss()
+    STAGE_LATENCY.observe(seconds, stage=name)
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(name, seconds, rss - start_rss, rss)
+
+
+@contextmanager
+def stage(name):
+    """with 블록의 소요 시간과 RSS 변화를 단계 지표와 현재 프로필에 기록"""
+    start_rss = current_rss()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, start, start_rss)
+
+
+def timed_iter(name, iterable):
+    """항목 하나를 꺼낼 때마다(CSV 덩어리 디코딩 등) 걸린 시간을 단계로 기록하며 순회"""
+    iterator = iter(iterable)
+    while True:
+        start_rss = current_rss()
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _record(name, start, start_rss)
+        yield item
@@ -0,0 +1,96 @@
+import contextvars
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Job:
+    """백그라운드에서 실행되는 메타데이터 생성 작업 하나의 상태"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = QUEUED
+        self.stage = None
+        self.progress = 0.0
+        self.status_code = None
+        self.result = None
+        # 전체 결과보다 먼저 공개하는 표본 미리보기 (요청한 경우)
+        self.preview = None
+        self.error = None
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.future = None
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def update(self, stage=None, progress=None):
+        """작업 단계와 진행률(0~1) 갱신"""
+        if stage is not None:
+            self.stage = stage
+        if progress is not None:
+            self.progress = min(max(float(progress), 0.0), 1.0)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "error": self.error,
+            "preview": self.preview,
+        }
+
+
+class JobManager:
+    """작업을 스레드 풀에서 실행하고 상태를 보관하는 관리자"""
+
+    def __init__(self, max_workers=4, max_finished_jobs=1000):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        fn(job, *args, **kwargs)를 풀에 제출하고 Job을 반환
+        fn은 (status_code, content)를 반환해야 함
+        """
+        job = Job()
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        # 제출한 쪽의 컨텍스트 변수(단계 기록용 Profile 등)를 작업 스레드에서도 사용
+        job.future = self.executor.submit(
+            contextvars.copy_context().run, self._run, job, fn, args, kwargs
+        )
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = RUNNING
+        try:
+            job.status_code, job.result = fn(job, *args, **kwargs)
+            job.status = SUCCEEDED
+            job.update(progress=1.0)
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        return job
+
+    def _prune(self):
+        """완료된 작업이 너무 많이 쌓이면 오래된 것부터 제거"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(len(finished) - self.max_finished_jobs, 0)]:
+            del self._jobs[job_id]
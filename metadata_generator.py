@@ -1,45 +1,233 @@
 import os
+import sys
 import pandas as pd
 from datetime import datetime
+from accumulators import (
+    CSV_DTYPES,
+    DatasetAccumulator,
+    accumulate,
+    load_state,
+    read_csv_chunks,
+    save_state,
+    state_path_for,
+)
+from columnar import STAT_COLUMNS, detect_format, iter_columnar_chunks, schema_columns
+from instrumentation import ROWS_PROCESSED, stage, timed_iter
+from metadata_model import DatasetMetadata, to_native
+from parallel import accumulate_parallel
+from quality import DEFAULT_ID_COLUMN
 
 
 class MetadataGenerator:
-    def __init__(self, dataset, output_path=None):
+    def __init__(
+        self,
+        dataset,
+        output_path=None,
+        chunksize=None,
+        num_workers=None,
+        progress_callback=None,
+        statistics=None,
+        approximate=False,
+        duplicates=False,
+        vocabulary=False,
+        quality=False,
+        base_state=None,
+        removed=None,
+    ):
+        """
+        dataset: pandas DataFrame, CSV 경로/파일 객체 또는 Parquet/Feather/Arrow 파일 경로
+                 (컬럼 기반 포맷은 통계에 필요한 컬럼만 메모리 맵으로 읽음)
+        chunksize: 지정하면 CSV를 chunksize 행 단위로 스트리밍하며 통계를 누적
+        num_workers: 지정하면 CSV 경로를 바이트 범위 샤드로 나누어 프로세스 풀에서 병렬 처리
+        progress_callback: 스트리밍 시 덩어리 하나를 처리할 때마다 누적 상태를 인자로 호출
+        statistics: 미리 계산된 compute_statistics() 결과 (지정하면 데이터셋을 스캔하지 않음)
+        approximate: True면 스케치 기반 근사 통계(분위수, 고유/빈출 텍스트)도 생성
+        duplicates: True면 완전 중복/근사 중복(MinHash LSH) 보고서도 생성
+        vocabulary: True면 어휘 크기/빈출 토큰/빈출 문자 bigram 통계(전체, 레이블별)도 생성
+                    (VocabularyAccumulator 옵션 dict로 메모리 상한 등을 지정 가능)
+        quality: True면 품질 검사(ID 중복, 결측/빈 텍스트, 공백/문장부호만 있는 텍스트,
+                 텍스트-레이블 충돌) 보고서도 생성
+                 (QualityAccumulator 옵션 dict로 expected_labels, id_column을 지정 가능)
+        base_state: 증분 모드 - 기준 데이터셋의 통계 상태 파일 경로 또는 DatasetAccumulator
+                    (지정하면 dataset은 기준 데이터셋 뒤에 추가된 행만 담음, 없으면 None)
+        removed: 증분 모드에서 기준 데이터셋에서 제거된 행 (DataFrame 또는 CSV 경로/파일 객체)
+        """
+        if base_state is None and removed is not None:
+            raise ValueError("removed는 base_state와 함께 지정해야 합니다")
+        if base_state is not None and (
+            approximate or duplicates or vocabulary or quality
+        ):
+            raise ValueError(
+                "증분 모드는 근사 통계, 중복 보고서, 어휘 통계, 품질 검사를 지원하지 않습니다"
+            )
         self.dataset = dataset
         self.output_path = output_path
+        self.chunksize = chunksize
+        self.num_workers = num_workers
+        self.progress_callback = progress_callback
         self.metadata = {}
+        self._state = None
+        self._statistics = to_native(statistics) if statistics is not None else None
+        self.options = {
+            "approximate": approximate,
+            "duplicates": duplicates,
+            "vocabulary": vocabulary,
+            "quality": quality,
+        }
+        self.base_state = base_state
+        self.removed = removed
+
+    def _iter_chunks(self, source):
+        """통계 계산에 사용할 DataFrame 덩어리 순회 (읽는 시간은 decode 단계로 기록)"""
+        if isinstance(source, pd.DataFrame):
+            return [source]
+        if detect_format(source):
+            return timed_iter(
+                "decode",
+                iter_columnar_chunks(
+                    source, self.chunksize, self._columnar_columns(source)
+                ),
+            )
+        if self.chunksize is None:
+            with stage("decode"):
+                return [pd.read_csv(source, dtype=CSV_DTYPES)]
+        return timed_iter("decode", read_csv_chunks(source, self.chunksize))
+
+    def _columnar_columns(self, source):
+        """컬럼 기반 포맷에서 읽을 컬럼 (품질 검사를 하면 파일에 있는 ID 컬럼도 함께 읽음)"""
+        quality = self.options["quality"]
+        if not quality:
+            return STAT_COLUMNS
+        id_column = (quality if isinstance(quality, dict) else {}).get(
+            "id_column", DEFAULT_ID_COLUMN
+        )
+        if id_column in STAT_COLUMNS or id_column not in schema_columns(source):
+            return STAT_COLUMNS
+        return [id_column] + STAT_COLUMNS
+
+    def _load_base_state(self):
+        """증분 모드의 기준 통계 상태 (전달된 객체는 변경하지 않도록 복사)"""
+        if isinstance(self.base_state, DatasetAccumulator):
+            return DatasetAccumulator.from_dict(self.base_state.to_dict())
+        return load_state(self.base_state)
+
+    def _scan(self):
+        """데이터셋을 한 번만 순회하여 병합 가능한 통계 상태를 계산"""
+        if self._state is None:
+            with stage("scan"):
+                self._state = self._scan_dataset()
+        return self._state
+
+    def _scan_dataset(self):
+        """_scan의 본체: 새로 스캔한 행 수는 rows processed 지표에 반영"""
+        if self.dataset is None:
+            state = DatasetAccumulator(**self.options)
+        elif (
+            self.num_workers
+            and isinstance(self.dataset, (str, os.PathLike))
+            and not detect_format(self.dataset)
+        ):
+            state = accumulate_parallel(
+                self.dataset, self.num_workers, self.chunksize, **self.options
+            )
+        else:
+            state = accumulate(
+                self._iter_chunks(self.dataset),
+                self.progress_callback,
+                **self.options,
+            )
+        ROWS_PROCESSED.inc(state.num_rows)
+        if detect_format(self.dataset):
+            # 일부 컬럼만 읽었으므로 전체 컬럼 목록은 스키마에서 가져옴
+            state.columns = schema_columns(self.dataset)
+        if self.base_state is not None:
+            # 증분 모드: 기준 상태 + 추가된 행 - 제거된 행 (변경분만 스캔)
+            state = self._load_base_state().merge(state)
+            if self.removed is not None:
+                state.subtract(accumulate(self._iter_chunks(self.removed)))
+        return state
+
+    def compute_statistics(self):
+        """데이터셋 스캔이 필요한 통계만 모아서 반환 (캐시 대상, NumPy 값은 파이썬 기본 타입으로 변환됨)"""
+        if self._statistics is None:
+            state = self._scan()
+            with stage("summarize"):
+                target_distribution = state.target.result()
+                statistics = {
+                    "total_samples": state.num_rows,
+                    "columns": state.columns,
+                    "text_statistics": state.text.result(),
+                    "target_distribution": target_distribution,
+                    "class_text_statistics": state.class_text.result(
+                        list(target_distribution["class_distribution"])
+                    ),
+                }
+            if state.sketches:
+                with stage("summarize_approximate"):
+                    statistics["approximate_statistics"] = state.sketches.result()
+            if state.duplicates:
+                with stage("summarize_duplicates"):
+                    statistics["duplicate_report"] = state.duplicates.result()
+            if state.vocabulary:
+                with stage("summarize_vocabulary"):
+                    statistics["vocabulary_statistics"] = state.vocabulary.result()
+            if state.quality:
+                with stage("summarize_quality"):
+                    statistics["quality_report"] = state.quality.result(
+                        state.target.counts, state.num_rows
+                    )
+            self._statistics = to_native(statistics)
+        return self._statistics
 
     def generate_basic_info(self, creator, datasetname, description):
         """기본 데이터셋 정보 생성"""
+        statistics = self.compute_statistics()
         self.metadata["creation_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.metadata["creator"] = creator
         self.metadata["datasetname"] = datasetname
         self.metadata["description"] = description
-        self.metadata["total_samples"] = len(self.dataset)
-        self.metadata["columns"] = list(self.dataset.columns)
+        self.metadata["total_samples"] = statistics["total_samples"]
+        self.metadata["columns"] = statistics["columns"]
 
     def generate_text_statistics(self):
         """텍스트 데이터 통계 생성"""
-        text_stats = {
-            "avg_length": self.dataset["text"].str.len().mean(),
-            "max_length": self.dataset["text"].str.len().max(),
-            "min_length": self.dataset["text"].str.len().min(),
-            "total_words": sum(self.dataset["text"].str.split().str.len()),
-            "avg_words": self.dataset["text"].str.split().str.len().mean(),
-        }
-        self.metadata["text_statistics"] = text_stats
+        self.metadata["text_statistics"] = self.compute_statistics()["text_statistics"]
 
     def generate_target_distribution(self):
         """타겟 레이블 분포 분석"""
-        target_counts = self.dataset["target"].value_counts().to_dict()
-        self.metadata["target_distribution"] = {
-            "class_distribution": target_counts,
-            "num_classes": len(target_counts),
-            "class_balance": {
-                str(label): count / len(self.dataset)
-                for label, count in target_counts.items()
-            },
-        }
+        self.metadata["target_distribution"] = self.compute_statistics()[
+            "target_distribution"
+        ]
+
+    def generate_class_text_statistics(self):
+        """타겟 레이블별 텍스트 길이/단어 수 통계 생성"""
+        class_text_statistics = self.compute_statistics().get("class_text_statistics")
+        if class_text_statistics:
+            self.metadata["class_text_statistics"] = class_text_statistics
+
+    def generate_approximate_statistics(self):
+        """스케치 기반 근사 통계 생성 (approximate 모드에서만)"""
+        approximate_statistics = self.compute_statistics().get("approximate_statistics")
+        if approximate_statistics:
+            self.metadata["approximate_statistics"] = approximate_statistics
+
+    def generate_duplicate_report(self):
+        """완전/근사 중복 보고서 생성 (duplicates 모드에서만)"""
+        duplicate_report = self.compute_statistics().get("duplicate_report")
+        if duplicate_report:
+            self.metadata["duplicate_report"] = duplicate_report
+
+    def generate_vocabulary_statistics(self):
+        """어휘/빈출 토큰/bigram 통계 생성 (vocabulary 모드에서만)"""
+        vocabulary_statistics = self.compute_statistics().get("vocabulary_statistics")
+        if vocabulary_statistics:
+            self.metadata["vocabulary_statistics"] = vocabulary_statistics
+
+    def generate_quality_report(self):
+        """데이터셋 품질 검사 보고서 생성 (quality 모드에서만)"""
+        quality_report = self.compute_statistics().get("quality_report")
+        if quality_report:
+            self.metadata["quality_report"] = quality_report
 
     def add_preprocessing_info(self, preprocessing_steps):
         """전처리 정보 추가"""
@@ -56,6 +244,11 @@ class MetadataGenerator:
         if augmentation_methods:
             self.metadata["augmentation_methods"] = augmentation_methods
 
+    def add_compression_info(self, compression):
+        """데이터셋 저장 시 사용한 압축 코덱 정보 추가"""
+        if compression:
+            self.metadata["compression"] = compression
+
     def generate_full_metadata(
         self,
         creator=None,
@@ -64,22 +257,36 @@ class MetadataGenerator:
         preprocessing_steps=None,
         labeling_methods=None,
         augmentation_methods=None,
+        compression=None,
     ):
         """전체 메타데이터 생성"""
         self.generate_basic_info(creator, datasetname, description)
         self.generate_text_statistics()
         self.generate_target_distribution()
+        self.generate_class_text_statistics()
+        self.generate_approximate_statistics()
+        self.generate_duplicate_report()
+        self.generate_vocabulary_statistics()
+        self.generate_quality_report()
         self.add_preprocessing_info(preprocessing_steps)
         self.add_labeling_info(labeling_methods)
         self.add_augmentation_info(augmentation_methods)
+        self.add_compression_info(compression)
         return self.metadata
 
+    def to_model(self):
+        """생성한 메타데이터를 스키마 버전이 붙은 DatasetMetadata로 반환"""
+        return DatasetMetadata.from_dict(self.metadata)
+
     def save_metadata(self):
-        """메타데이터를 JSON 파일로 저장"""
+        """메타데이터를 JSON 파일로 저장 (API가 드라이브에 올리는 JSON과 같은 형식)"""
         if self.output_path:
-            pd.DataFrame([self.metadata]).to_json(
-                self.output_path, orient="records", indent=4, force_ascii=False
-            )
+            with stage("save_metadata"):
+                with open(self.output_path, "w", encoding="utf-8") as f:
+                    f.write(self.to_model().to_json())
+                # 이후 증분 모드에서 사용할 수 있도록 병합 가능한 통계 상태도 함께 저장
+                if self._state is not None:
+                    save_state(self._state, state_path_for(self.output_path))
 
 
 if __name__ == "__main__":
@@ -97,7 +304,8 @@ if __name__ == "__main__":
     BASE_DIR = os.getcwd()
     DATA_DIR = os.path.join(BASE_DIR, "./data")
     OUTPUT_DIR = os.path.join(BASE_DIR, "./output")
-    dataset = pd.read_csv(os.path.join(DATA_DIR, "train.csv"))
+    # CSV, Parquet, Feather, Arrow 파일 경로를 인자로 지정할 수 있음
+    dataset = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATA_DIR, "train.csv")
 
     metadata_generator = MetadataGenerator(
         dataset, output_path=os.path.join(OUTPUT_DIR, "metadata.json")
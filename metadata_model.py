@@ -0,0 +1,232 @@
+import json
+import math
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, TypedDict
+import numpy as np
+
+# 메타데이터 JSON 스키마 버전 (항목을 추가하면 부 버전, 기존 항목의 의미가 바뀌면 주 버전을 올림)
+SCHEMA_VERSION = "1.2"
+
+
+def to_native(value):
+    """
+    NumPy 스칼라/배열이 섞인 중첩 dict/list를 JSON으로 바로 직렬화할 수 있는 파이썬 타입으로 변환
+    NaN/inf(빈 데이터셋의 평균 등)는 표준 JSON에 없으므로 None으로 바꾼다.
+    """
+    if isinstance(value, dict):
+        return {to_native(key): to_native(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_native(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_native(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# 메타데이터 JSON의 항목별 형식 (값이 없으면 None: 텍스트가 없는 데이터셋의 평균 등)
+class TextStatistics(TypedDict):
+    avg_length: Optional[float]
+    max_length: Optional[int]
+    min_length: Optional[int]
+    total_words: int
+    avg_words: Optional[float]
+
+
+class TargetDistribution(TypedDict):
+    class_distribution: Dict[str, int]
+    num_classes: int
+    class_balance: Dict[str, float]
+
+
+class Percentiles(TypedDict):
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+
+class DistributionSummary(Percentiles):
+    mean: Optional[float]
+    min: Optional[int]
+    max: Optional[int]
+
+
+class ClassTextStatistics(TypedDict):
+    """레이블 하나의 텍스트 길이/단어 수 통계 (class_text_statistics는 레이블별 이 형식의 dict)"""
+
+    num_samples: int
+    length: DistributionSummary
+    words: DistributionSummary
+
+
+class TextCount(TypedDict):
+    text: str
+    count: int
+
+
+class ApproximateErrorBounds(TypedDict):
+    percentile_relative_error: float
+    distinct_texts_relative_std_error: float
+    top_text_count_max_overestimate: int
+    top_text_count_confidence: float
+
+
+class ApproximateStatistics(TypedDict):
+    length_percentiles: Percentiles
+    word_percentiles: Percentiles
+    distinct_texts: int
+    top_texts: List[TextCount]
+    error_bounds: ApproximateErrorBounds
+
+
+class ClassDuplicateRates(TypedDict):
+    exact_duplicate_rate: Optional[float]
+    near_duplicate_rate: Optional[float]
+
+
+class DuplicateParameters(TypedDict):
+    shingle_size: int
+    num_perm: int
+    bands: int
+    similarity_threshold: float
+    max_bucket_size: int
+
+
+class DuplicateReport(TypedDict):
+    exact_duplicate_rows: int
+    exact_duplicate_rate: Optional[float]
+    near_duplicate_clusters: int
+    near_duplicate_rows: int
+    near_duplicate_rate: Optional[float]
+    largest_cluster_size: int
+    truncated_buckets: int
+    per_class: Dict[str, ClassDuplicateRates]
+    parameters: DuplicateParameters
+
+
+class TokenCount(TypedDict):
+    token: str
+    count: int
+    max_overestimate: int
+
+
+class BigramCount(TypedDict):
+    bigram: str
+    count: int
+    max_overestimate: int
+
+
+class ClassVocabulary(TypedDict):
+    vocabulary_size: int
+    top_tokens: List[TokenCount]
+    top_bigrams: List[BigramCount]
+
+
+class VocabularyErrorBounds(TypedDict):
+    vocabulary_size_relative_std_error: float
+    class_vocabulary_size_relative_std_error: float
+    unlisted_token_max_count: int
+    unlisted_bigram_max_count: int
+
+
+class VocabularyMemoryCaps(TypedDict):
+    capacity: int
+    class_capacity: int
+
+
+class VocabularyStatistics(ClassVocabulary):
+    per_class: Dict[str, ClassVocabulary]
+    error_bounds: VocabularyErrorBounds
+    memory_caps: VocabularyMemoryCaps
+
+
+class _QualityChecks(TypedDict):
+    total_rows: int
+    id_column: Optional[str]
+    duplicate_ids: Optional[int]
+    duplicate_id_rows: Optional[int]
+    missing_id_rows: Optional[int]
+    null_text_rows: int
+    empty_text_rows: int
+    whitespace_only_rows: int
+    punctuation_only_rows: int
+    null_target_rows: int
+    conflicting_texts: int
+    conflicting_text_rows: int
+    issues: List[str]
+
+
+class QualityReport(_QualityChecks, total=False):
+    """품질 검사 보고서 (expected_labels를 지정한 경우에만 예상 밖 레이블 항목 포함)"""
+
+    expected_labels: List[str]
+    unexpected_labels: Dict[str, int]
+    unexpected_label_rows: int
+
+
+def _optional():
+    """값이 없으면 JSON에서 생략하는 항목"""
+    return field(default=None, metadata={"optional": True})
+
+
+@dataclass
+class DatasetMetadata:
+    """
+    메타데이터 JSON 한 건 (필드 순서가 곧 출력 순서, 통계 항목은 위 TypedDict 형식의 dict)
+    통계 값은 compute_statistics에서 이미 to_native로 변환되어 있으므로 별도 인코더 없이
+    to_json 한 번으로 직렬화되며, 파일 저장과 드라이브 업로드는 같은 바이트를 쓴다.
+    """
+
+    creation_date: str
+    creator: Optional[str]
+    datasetname: Optional[str]
+    description: Optional[str]
+    total_samples: int
+    columns: List[str]
+    text_statistics: TextStatistics
+    target_distribution: TargetDistribution
+    class_text_statistics: Optional[Dict[str, ClassTextStatistics]] = _optional()
+    approximate_statistics: Optional[ApproximateStatistics] = _optional()
+    duplicate_report: Optional[DuplicateReport] = _optional()
+    vocabulary_statistics: Optional[VocabularyStatistics] = _optional()
+    quality_report: Optional[QualityReport] = _optional()
+    preprocessing_steps: Any = _optional()
+    labeling_methods: Any = _optional()
+    augmentation_methods: Any = _optional()
+    compression: Optional[str] = _optional()
+    schema_version: str = SCHEMA_VERSION
+
+    @classmethod
+    def from_dict(cls, data):
+        """dict(저장된 메타데이터 JSON 등)에서 생성 (주 버전이 다르거나 모르는 항목이 있으면 ValueError)"""
+        data = dict(data)
+        version = str(data.pop("schema_version", SCHEMA_VERSION))
+        if version.split(".")[0] != SCHEMA_VERSION.split(".")[0]:
+            raise ValueError(
+                f"지원하지 않는 메타데이터 스키마 버전: {version} (현재 {SCHEMA_VERSION})"
+            )
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(
+                f"알 수 없는 메타데이터 항목: {', '.join(sorted(unknown))}"
+            )
+        return cls(schema_version=version, **data)
+
+    def to_dict(self):
+        """schema_version을 맨 앞에 둔 JSON 형식의 dict (값이 없는 선택 항목 제외)"""
+        result = {"schema_version": self.schema_version}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name == "schema_version" or (
+                value is None and f.metadata.get("optional")
+            ):
+                continue
+            result[f.name] = value
+        # 이전 버전이 디스크 캐시에 남긴 NaN 등도 표준 JSON 값으로 맞춤
+        return to_native(result)
+
+    def to_json(self):
+        """파일 저장/드라이브 업로드에 쓰는 JSON 문자열"""
+        return json.dumps(self.to_dict(), indent=4, ensure_ascii=False, allow_nan=False)
@@ -0,0 +1,126 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from accumulators import DatasetAccumulator, accumulate, read_csv_chunks
+
+DEFAULT_CHUNKSIZE = 100_000
+_BLOCK_SIZE = 1 << 20
+
+
+def _record_boundaries(path, targets, block_size=_BLOCK_SIZE):
+    """
+    각 target 위치 이후 처음 나오는, 따옴표 밖의 줄바꿈 바로 다음 바이트 위치 탐색
+
+    CSV의 따옴표 안 줄바꿈은 레코드 경계가 아니므로 파일 처음부터 따옴표 개수의
+    홀짝을 추적한다. 이스케이프된 따옴표("")는 두 개로 세어지므로 홀짝에 영향이 없다.
+    """
+    boundaries = []
+    pending = iter(sorted(targets))
+    target = next(pending, None)
+    in_quotes = False
+    base = 0
+    with open(path, "rb") as f:
+        while target is not None:
+            block = f.read(block_size)
+            if not block:
+                break
+            pos = 0
+            while target is not None:
+                start = max(target - base, pos)
+                if start >= len(block):
+                    break
+                in_quotes ^= bool(block.count(b'"', pos, start) & 1)
+                pos = start
+                newline = block.find(b"\n", pos)
+                while newline != -1:
+                    in_quotes ^= bool(block.count(b'"', pos, newline) & 1)
+                    pos = newline + 1
+                    if not in_quotes:
+                        break
+                    newline = block.find(b"\n", pos)
+                if newline == -1:
+                    break
+                boundaries.append(base + pos)
+                target = next(pending, None)
+            in_quotes ^= bool(block.count(b'"', pos) & 1)
+            base += len(block)
+    return boundaries
+
+
+def split_csv_shards(path, num_shards):
+    """
+    CSV 파일을 레코드 경계에 맞춘 바이트 범위 샤드로 분할
+
+    반환: (header_end, [(start, end), ...]) - header_end는 헤더 줄의 끝 위치
+    """
+    size = os.path.getsize(path)
+    header = _record_boundaries(path, [0])
+    header_end = header[0] if header else size
+    body = size - header_end
+    targets = [header_end + body * i // num_shards for i in range(1, num_shards)]
+    # 각 목표 위치 직전의 줄바꿈부터 탐색해야 목표 위치에서 시작하는 레코드를 놓치지 않음
+    cuts = _record_boundaries(path, [max(t - 1, header_end) for t in targets])
+    cuts = sorted(set(c for c in cuts if header_end < c < size))
+    edges = [header_end] + cuts + [size]
+    return header_end, list(zip(edges[:-1], edges[1:]))
+
+
+class _ByteRangeFile(io.RawIOBase):
+    """헤더 바이트 뒤에 파일의 [start, end) 범위를 이어붙여 읽는 파일 객체"""
+
+    def __init__(self, path, header, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._header = header
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._header:
+            n = min(len(buffer), len(self._header))
+            buffer[:n] = self._header[:n]
+            self._header = self._header[n:]
+            return n
+        if self._remaining <= 0:
+            return 0
+        n = self._file.readinto(memoryview(buffer)[: min(len(buffer), self._remaining)])
+        self._remaining -= n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _accumulate_shard(path, header_end, start, end, chunksize, options):
+    """프로세스 풀 워커: 샤드 하나의 통계 상태 계산"""
+    with open(path, "rb") as f:
+        header = f.read(header_end)
+    # read_csv_chunks가 컬럼 타입을 고정하므로 샤드마다 추론한 레이블 타입이 달라지지 않음
+    with io.BufferedReader(_ByteRangeFile(path, header, start, end)) as shard:
+        return accumulate(
+            read_csv_chunks(shard, chunksize, encoding="utf-8"), **options
+        )
+
+
+def accumulate_parallel(path, num_workers, chunksize=None, **options):
+    """
+    CSV 파일을 샤드로 나누어 프로세스 풀에서 통계를 계산하고 순서대로 병합
+    options: DatasetAccumulator 옵션
+    """
+    chunksize = chunksize or DEFAULT_CHUNKSIZE
+    header_end, shards = split_csv_shards(path, num_workers)
+    state = DatasetAccumulator(**options)
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(
+                _accumulate_shard, path, header_end, start, end, chunksize, options
+            )
+            for start, end in shards
+        ]
+        # 레이블 등장 순서가 직렬 처리와 같도록 샤드 순서대로 병합
+        for future in futures:
+            state.merge(future.result())
+    return state
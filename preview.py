@@ -0,0 +1,183 @@
+import contextlib
+import math
+import os
+import time
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from accumulators import accumulate, read_csv_chunks
+from columnar import detect_format, iter_columnar_chunks, row_count, schema_columns
+from metadata_model import to_native
+from text_kernel import text_lengths_and_word_counts
+
+# 표본 최대 행 수, 입력을 읽는 시간 상한(초), 한 번에 읽는 행 수
+DEFAULT_SAMPLE_SIZE = 10000
+DEFAULT_BUDGET_SECONDS = 2.0
+PREVIEW_CHUNKSIZE = 10000
+
+
+class ReservoirSampler:
+    """
+    스트리밍으로 읽는 행 중 최대 size개를 같은 확률로 뽑는 저수지 표본
+    Algorithm R을 덩어리 단위로 벡터화: 전체 i번째(0부터) 행은 확률 size/(i+1)로 임의의 자리를 대체한다.
+    """
+
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.rows_seen = 0
+        self.sample = None
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk):
+        """DataFrame 한 덩어리를 표본에 반영"""
+        start = self.rows_seen
+        self.rows_seen += len(chunk)
+        # 저수지가 찰 때까지는 그대로 채움
+        fill = min(max(self.size - start, 0), len(chunk))
+        if fill:
+            head = chunk.iloc[:fill]
+            self.sample = (
+                head
+                if self.sample is None
+                else pd.concat([self.sample, head], ignore_index=True)
+            )
+        if fill == len(chunk):
+            return self
+
+        positions = np.arange(start + fill, self.rows_seen)
+        slots = np.floor(self._rng.random(len(positions)) * (positions + 1))
+        slots = slots.astype(np.int64)
+        rows = np.flatnonzero(slots < self.size)
+        if len(rows) == 0:
+            return self
+        slots = slots[rows]
+        # 덩어리 안에서 같은 자리를 여러 번 대체하면 마지막 행만 남음 (순차 처리와 같은 결과)
+        _, last = np.unique(slots[::-1], return_index=True)
+        last = len(slots) - 1 - last
+        keep = np.ones(len(self.sample), dtype=bool)
+        keep[slots[last]] = False
+        # 자리 순서는 결과 분포와 무관하므로 대체된 행을 빼고 새 행을 뒤에 붙임
+        self.sample = pd.concat(
+            [self.sample[keep], chunk.iloc[fill:].iloc[rows[last]]],
+            ignore_index=True,
+        )
+        return self
+
+
+def _mean_interval(values, z, fpc):
+    """평균의 정규 근사 신뢰구간 (값이 2개 미만이면 None)"""
+    if len(values) < 2:
+        return None
+    mean = float(values.mean())
+    half = z * float(values.std(ddof=1)) / math.sqrt(len(values)) * fpc
+    return [mean - half, mean + half]
+
+
+def _proportion_interval(count, n, z, fpc):
+    """비율의 Wilson 점수 신뢰구간 (유한 모집단 보정은 유효 표본 크기 n / fpc^2로 반영)"""
+    p = count / n
+    if fpc == 0:
+        return [p, p]
+    n = n / fpc**2
+    denominator = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denominator
+    half = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+    return [max(center - half, 0.0), min(center + half, 1.0)]
+
+
+@contextlib.contextmanager
+def _open_chunks(path):
+    """
+    미리보기용 DataFrame 덩어리 이터레이터와, 읽기를 중간에 멈췄을 때 전체 행 수를 추정하는 함수
+    컬럼 기반 포맷은 파일 메타데이터의 행 수를, CSV는 읽은 바이트 비율을 사용 (추정할 수 없으면 None)
+    """
+    if detect_format(path):
+        rows = row_count(path)
+        yield iter_columnar_chunks(path, PREVIEW_CHUNKSIZE), (
+            None if rows is None else lambda rows_seen: rows
+        )
+        return
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        yield read_csv_chunks(f, PREVIEW_CHUNKSIZE), (
+            lambda rows_seen: round(rows_seen * size / max(f.tell(), 1))
+        )
+
+
+def preview_metadata(
+    path,
+    sample_size=DEFAULT_SAMPLE_SIZE,
+    budget_seconds=DEFAULT_BUDGET_SECONDS,
+    confidence=0.95,
+    seed=None,
+):
+    """
+    입력을 읽으며 저수지 표본을 뽑아 text_statistics, target_distribution을 추정 (파일 크기와 무관하게
+    budget_seconds 안에 읽기를 멈춤)
+    path: CSV 또는 Parquet/Feather/Arrow 파일 경로
+    반환: 평균과 클래스 비율의 신뢰구간(*_ci)과 표본 정보(preview)를 더한 메타데이터 일부
+          (읽기를 중간에 멈추면 신뢰구간과 개수는 읽은 앞부분 기준이며 preview.scope가 "prefix")
+    """
+    start = time.perf_counter()
+    sampler = ReservoirSampler(sample_size, seed)
+    complete = True
+    with _open_chunks(path) as (chunks, estimate_total_rows):
+        for chunk in chunks:
+            sampler.update(chunk)
+            if time.perf_counter() - start >= budget_seconds:
+                complete = False
+                break
+        # 멈추기 전에 추정해야 읽은 위치가 유지됨
+        total_samples = sampler.rows_seen
+        if not complete and estimate_total_rows is not None:
+            total_samples = max(
+                estimate_total_rows(sampler.rows_seen), sampler.rows_seen
+            )
+    sample = sampler.sample if sampler.sample is not None else pd.DataFrame()
+    n = len(sample)
+    if n == 0:
+        raise ValueError("미리보기할 행이 없습니다")
+
+    # 끝까지 읽지 못하면 표본은 읽은 앞부분에서만 뽑힌 것이므로, 신뢰구간과 개수는 파일 전체가 아니라
+    # 읽은 rows_seen행(전부 읽었으면 파일 전체)에 대한 값으로 계산 (total_samples만 파일 전체 추정)
+    population = sampler.rows_seen
+    # 유한 모집단 보정 (전수 표본이면 구간 폭 0)
+    fpc = math.sqrt((population - n) / (population - 1)) if population > 1 else 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    scale = population / n
+
+    state = accumulate([sample])
+    text_statistics = state.text.result()
+    lengths, word_counts = text_lengths_and_word_counts(sample["text"].dropna())
+    text_statistics["avg_length_ci"] = _mean_interval(lengths, z, fpc)
+    text_statistics["avg_words_ci"] = _mean_interval(word_counts, z, fpc)
+    text_statistics["total_words"] = round(text_statistics["total_words"] * scale)
+
+    target_distribution = state.target.result()
+    target_distribution["class_distribution"] = {
+        label: round(count * scale)
+        for label, count in target_distribution["class_distribution"].items()
+    }
+    target_distribution["class_balance_ci"] = {
+        str(label): _proportion_interval(state.target.counts[label], n, z, fpc)
+        for label in target_distribution["class_distribution"]
+    }
+
+    return to_native(
+        {
+            "total_samples": total_samples,
+            "columns": (schema_columns(path) if detect_format(path) else state.columns),
+            "text_statistics": text_statistics,
+            "target_distribution": target_distribution,
+            "preview": {
+                "sample_size": n,
+                "rows_scanned": sampler.rows_seen,
+                "complete": complete,
+                # 신뢰구간과 개수가 나타내는 범위: file(파일 전체) 또는 prefix(읽은 앞부분 rows_scanned행)
+                "scope": "file" if complete else "prefix",
+                "confidence_level": confidence,
+                "budget_seconds": budget_seconds,
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+            },
+        }
+    )
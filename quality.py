@@ -0,0 +1,237 @@
+import functools
+import numpy as np
+import pandas as pd
+from sketches import hash_texts
+from text_kernel import hash_code_points
+
+# 품질 검사에서 ID 중복/결측을 확인하는 기본 컬럼 이름
+DEFAULT_ID_COLUMN = "ID"
+# 문자 종류 (행 안에서 가장 큰 값이 그 행의 종류): 공백 < 문장부호/기호 < 문자/숫자
+_SPACE, _SYMBOL, _CONTENT = 0, 1, 2
+# 문자 종류 테이블의 범위 (공백/문장부호/기호/이모지는 모두 U+2FFFF 이하이므로 그 이상은 문자로 봄)
+_MAX_TABLE_CODEPOINT = 0x2FFFF
+
+
+@functools.lru_cache(maxsize=None)
+def _class_table():
+    """코드포인트별 문자 종류 조회 테이블 (처음 사용할 때 한 번만 생성, 마지막 칸은 문자)"""
+    classes = [
+        _CONTENT if ch.isalnum() else _SPACE if ch.isspace() else _SYMBOL
+        for ch in map(chr, range(_MAX_TABLE_CODEPOINT + 1))
+    ]
+    return np.array(classes + [_CONTENT], dtype=np.uint8)
+
+
+def _canonical_strings(values):
+    """
+    ID/레이블 값을 정규 문자열 배열로 변환 (정수 값인 float은 정수로 적어 1, 1.0, "1"이 모두 "1")
+    덩어리마다 컬럼 dtype이 달라져도(결측치 때문에 float, 숫자가 아닌 값 때문에 object) 같은 값은 같은 문자열이 된다.
+    """
+    values = values.to_numpy()
+    if values.dtype.kind == "f":
+        integral = np.isfinite(values) & (values == np.floor(values))
+        canonical = values.astype(object)
+        canonical[integral] = values[integral].astype(np.int64)
+        values = canonical
+    elif values.dtype.kind == "O" and pd.api.types.infer_dtype(
+        values, skipna=True
+    ) not in ("string", "empty"):
+        # 숫자와 문자열이 섞인 object 컬럼만 값별로 변환
+        values = np.array(
+            [
+                int(value) if isinstance(value, float) and value.is_integer() else value
+                for value in values
+            ],
+            dtype=object,
+        )
+    return values.astype(str)
+
+
+def factorize_labels(values):
+    """
+    레이블을 정규 문자열 기준으로 정수 코드화 (결측 레이블은 코드 -1)
+    입력마다 dtype이 달라도(CSV의 "2", DataFrame의 2, 결측치가 있는 컬럼의 2.0) 같은 레이블은 같은 코드가 되며,
+    고유값만 변환하므로 비용은 행 수가 아닌 레이블 수에 비례한다.
+    반환: (codes, labels) - labels는 최초 등장 순서의 정규 문자열 object 배열
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    canonical_codes, labels = pd.factorize(
+        _canonical_strings(pd.Series(uniques, dtype=object))
+    )
+    valid = codes >= 0
+    codes[valid] = canonical_codes[codes[valid]]
+    return codes, np.asarray(labels, dtype=object)
+
+
+def _hash_values(values):
+    """결측치를 제외한 ID/레이블 Series의 64비트 해시 (정규 문자열의 해시이므로 덩어리별 dtype과 무관)"""
+    return hash_texts(_canonical_strings(values))
+
+
+def _count_pairs(texts, targets, counts):
+    """
+    (텍스트 해시, 레이블 해시) 쌍별로 행 수를 합침
+    반환: 텍스트 해시, 레이블 해시 순으로 정렬된 (texts, targets, counts) 배열
+    """
+    if len(texts) == 0:
+        return texts, targets, counts
+    order = np.lexsort((targets, texts))
+    texts, targets, counts = texts[order], targets[order], counts[order]
+    starts = np.flatnonzero(
+        np.r_[True, (texts[1:] != texts[:-1]) | (targets[1:] != targets[:-1])]
+    )
+    return texts[starts], targets[starts], np.add.reduceat(counts, starts)
+
+
+def blank_text_masks(codepoints, lengths):
+    """
+    code_points 결과에서 빈 문자열, 공백만 있는 텍스트, 문장부호/기호만 있는 텍스트 마스크
+
+    코드포인트마다 문자 종류를 조회한 뒤 행 단위 최댓값(np.maximum.reduceat) 한 번으로
+    행에 문자/숫자가 있는지, 공백 외의 문자가 있는지 판정한다 (행별 정규식 매칭 없음).
+    반환: (empty, whitespace_only, punctuation_only) bool numpy 배열
+    """
+    empty = lengths == 0
+    row_classes = np.full(len(lengths), _CONTENT, dtype=np.uint8)
+    if len(codepoints):
+        classes = _class_table()[np.minimum(codepoints, _MAX_TABLE_CODEPOINT + 1)]
+        # 빈 행을 빼면 각 행의 시작 위치부터 다음 행 시작 전까지가 그 행의 구간
+        starts = (np.cumsum(lengths) - lengths)[~empty]
+        row_classes[~empty] = np.maximum.reduceat(classes, starts)
+    return (
+        empty,
+        ~empty & (row_classes == _SPACE),
+        row_classes == _SYMBOL,
+    )
+
+
+class QualityAccumulator:
+    """
+    데이터셋 품질 검사(ID 중복, 결측/빈 텍스트, 공백/문장부호만 있는 텍스트, 예상 밖 레이블,
+    같은 텍스트에 다른 레이블이 붙은 충돌)를 위한 병합 가능한 누적기
+
+    행 단위 검사는 덩어리마다 마스크 개수만 더하고, 행 사이 검사는 ID 해시와 덩어리 안에서
+    (텍스트 해시, 레이블 해시) 쌍별로 줄인 행 수만 보관한다. 텍스트 검사와 해시는 통계 계산에 쓴
+    코드포인트 배열을 재사용한다. 예상 밖 레이블은 레이블 빈도에서 계산한다.
+    expected_labels: 허용하는 레이블 목록 (문자열로 비교, 없으면 검사하지 않음)
+    id_column: ID 컬럼 이름 (데이터셋에 없으면 ID 검사 생략)
+    """
+
+    def __init__(self, expected_labels=None, id_column=DEFAULT_ID_COLUMN):
+        self.expected_labels = (
+            None
+            if expected_labels is None
+            else [str(label) for label in expected_labels]
+        )
+        self.id_column = id_column
+        self.has_ids = False
+        self.missing_ids = 0
+        self.id_hashes = []
+        self.counts = dict.fromkeys(
+            [
+                "null_text_rows",
+                "empty_text_rows",
+                "whitespace_only_rows",
+                "punctuation_only_rows",
+                "null_target_rows",
+            ],
+            0,
+        )
+        self.pairs = []
+
+    def update(self, chunk, texts, codepoints, lengths):
+        """
+        DataFrame 한 덩어리를 누적
+        texts: 결측치를 제외한 텍스트 Series, codepoints/lengths: texts의 code_points 결과
+        """
+        if self.id_column in chunk:
+            self.has_ids = True
+            ids = chunk[self.id_column]
+            present = ids.notna()
+            self.missing_ids += int(len(ids) - present.sum())
+            self.id_hashes.append(_hash_values(ids[present]))
+
+        empty, whitespace_only, punctuation_only = blank_text_masks(codepoints, lengths)
+        self.counts["null_text_rows"] += len(chunk) - len(texts)
+        self.counts["empty_text_rows"] += int(empty.sum())
+        self.counts["whitespace_only_rows"] += int(whitespace_only.sum())
+        self.counts["punctuation_only_rows"] += int(punctuation_only.sum())
+
+        targets = chunk["target"]
+        self.counts["null_target_rows"] += int(targets.isna().sum())
+        # 충돌 검사는 텍스트와 레이블이 모두 있는 행만 대상으로, 덩어리 안에서 쌍별 행 수로 줄여 보관
+        # (인덱스가 중복될 수 있으므로 texts와 같은 행을 위치로 선택)
+        targets = targets[chunk["text"].notna().to_numpy()]
+        labeled = targets.notna().to_numpy()
+        self.pairs.append(
+            _count_pairs(
+                hash_code_points(codepoints, lengths)[labeled],
+                _hash_values(targets[labeled]),
+                np.ones(int(labeled.sum()), dtype=np.int64),
+            )
+        )
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합"""
+        self.has_ids = self.has_ids or other.has_ids
+        self.missing_ids += other.missing_ids
+        self.id_hashes.extend(other.id_hashes)
+        for name, count in other.counts.items():
+            self.counts[name] += count
+        self.pairs.extend(other.pairs)
+        return self
+
+    def _id_result(self):
+        if not self.has_ids:
+            return {"duplicate_ids": None, "duplicate_id_rows": None}
+        hashes = np.concatenate(self.id_hashes)
+        _, id_counts = np.unique(hashes, return_counts=True)
+        return {
+            "duplicate_ids": int((id_counts > 1).sum()),
+            "duplicate_id_rows": int(len(hashes) - len(id_counts)),
+        }
+
+    def _conflict_result(self):
+        texts, _, counts = _count_pairs(
+            *(np.concatenate(arrays) for arrays in zip(*self.pairs))
+        )
+        if len(texts) == 0:
+            return {"conflicting_texts": 0, "conflicting_text_rows": 0}
+        # 쌍이 텍스트 해시 순으로 정렬되어 있으므로 텍스트별 레이블 수와 행 수를 구간 단위로 계산
+        starts = np.flatnonzero(np.r_[True, texts[1:] != texts[:-1]])
+        num_targets = np.diff(np.r_[starts, len(texts)])
+        conflicting = num_targets > 1
+        return {
+            "conflicting_texts": int(conflicting.sum()),
+            "conflicting_text_rows": int(
+                np.add.reduceat(counts, starts)[conflicting].sum()
+            ),
+        }
+
+    def result(self, target_counts, num_rows):
+        """
+        quality_report 형식의 결과 반환
+        target_counts: 레이블별 행 수 (TargetAccumulator.counts), num_rows: 전체 행 수
+        """
+        report = {
+            "id_column": self.id_column if self.has_ids else None,
+            **self._id_result(),
+            "missing_id_rows": self.missing_ids if self.has_ids else None,
+            **self.counts,
+            **self._conflict_result(),
+        }
+        if self.expected_labels is not None:
+            expected = set(self.expected_labels)
+            unexpected = {
+                str(label): count
+                for label, count in target_counts.items()
+                if str(label) not in expected
+            }
+            report["expected_labels"] = self.expected_labels
+            report["unexpected_labels"] = unexpected
+            report["unexpected_label_rows"] = sum(unexpected.values())
+        # 문제가 발견된 검사 (행 수 항목 중 0보다 큰 것)
+        issues = [
+            name for name, value in report.items() if name.endswith("_rows") and value
+        ]
+        return {"total_rows": num_rows, **report, "issues": issues}
@@ -0,0 +1,246 @@
+import math
+import numpy as np
+import pandas as pd
+
+# 해시 행마다 다른 multiply-shift 해시를 만들기 위한 홀수 곱셈 상수
+_HASH_MULTIPLIERS = np.array(
+    [
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+        0xFF51AFD7ED558CCD,
+        0xC4CEB9FE1A85EC53,
+        0x94D049BB133111EB,
+        0xBF58476D1CE4E5B9,
+    ],
+    dtype=np.uint64,
+)
+
+
+def hash_texts(texts):
+    """텍스트 목록을 64비트 해시 배열로 변환 (벡터화, 문자열 dtype과 무관하게 같은 해시)"""
+    return pd.util.hash_array(np.asarray(texts, dtype=object))
+
+
+class QuantileSketch:
+    """
+    상대 오차 보장 분위수 스케치 (DDSketch)
+    양수 값 x를 ceil(log_gamma(x)) 버킷에 세므로 어떤 분위수든 상대 오차 relative_accuracy 이내이며,
+    버킷 수가 max_buckets를 넘으면 가장 작은 버킷들을 합쳐 메모리를 고정한다.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def update(self, values):
+        """0 이상의 값 배열을 누적"""
+        values = np.asarray(values, dtype=np.float64)
+        self.count += len(values)
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        if len(positive) == 0:
+            return
+        keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        unique, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+
+    def merge(self, other):
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+        return self
+
+    def _collapse(self):
+        if len(self.buckets) <= self.max_buckets:
+            return
+        keys = sorted(self.buckets)
+        excess = keys[: len(keys) - self.max_buckets + 1]
+        self.buckets[excess[-1]] += sum(self.buckets.pop(key) for key in excess[:-1])
+
+    def quantile(self, q):
+        """q 분위수 추정값 (비어 있으면 nan)"""
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma**key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class HyperLogLog:
+    """서로 다른 값의 개수를 추정하는 HyperLogLog (레지스터 2^precision개, uint8)"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """추정값의 상대 표준 오차"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update_hashes(self, hashes):
+        """64비트 해시 배열을 누적"""
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << (64 - p)) - 1)
+        # 남은 (64 - p)비트에서 첫 1비트의 위치 (상위 32비트 / 하위 32비트로 나누어 정확히 계산)
+        high = (remaining >> np.uint64(32)).astype(np.float64)
+        low = (remaining & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(
+            high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1]
+        ).astype(np.int64)
+        rank = (64 - p) - bit_length + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # 작은 범위에서는 linear counting으로 보정
+            return m * math.log(m / zeros)
+        return float(raw)
+
+
+class HeavyHitters:
+    """
+    Count-Min 스케치와 후보 집합으로 가장 자주 등장하는 텍스트를 추적
+    각 빈도 추정값은 확률 1 - e^-depth 이상으로 실제 빈도보다 최대 (e / width) * N 만큼만 크다.
+    """
+
+    def __init__(self, width=1 << 14, depth=4, capacity=100):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.candidates = {}
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def confidence(self):
+        return 1 - math.exp(-self.depth)
+
+    def _indices(self, hashes):
+        shift = np.uint64(64 - int(math.log2(self.width)))
+        return [
+            ((hashes * _HASH_MULTIPLIERS[row]) >> shift).astype(np.int64)
+            for row in range(self.depth)
+        ]
+
+    def _query(self, hashes):
+        indices = self._indices(hashes)
+        return np.min(
+            [self.table[row][index] for row, index in enumerate(indices)], axis=0
+        )
+
+    def update(self, texts):
+        """텍스트 Series 한 덩어리를 누적"""
+        counts = texts.value_counts(sort=False)
+        if counts.empty:
+            return
+        hashes = hash_texts(counts.index)
+        for row, index in enumerate(self._indices(hashes)):
+            self.table[row] += np.bincount(
+                index, weights=counts.to_numpy(), minlength=self.width
+            ).astype(np.int64)
+        self.total += int(counts.sum())
+        self._refresh(list(counts.index))
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        self._refresh(list(other.candidates))
+        return self
+
+    def _refresh(self, new_candidates):
+        """기존 후보와 새 후보의 추정 빈도를 다시 구해 상위 capacity개만 유지"""
+        texts = list(dict.fromkeys(list(self.candidates) + new_candidates))
+        hashes = hash_texts(texts)
+        estimates = self._query(hashes)
+        # 추정 빈도가 같으면 텍스트 해시로 골라 덩어리 도착 순서(직렬/병렬)와 무관한 후보를 남기고,
+        # 남긴 후보는 (빈도 내림차순, 텍스트) 순으로 정렬
+        keep = np.lexsort((hashes, -estimates))[: self.capacity]
+        order = sorted(keep.tolist(), key=lambda i: (-estimates[i], texts[i]))
+        self.candidates = {texts[i]: int(estimates[i]) for i in order}
+
+    def top(self, k):
+        return [
+            {"text": text, "count": count}
+            for text, count in list(self.candidates.items())[:k]
+        ]
+
+
+class SketchAccumulator:
+    """근사 통계 모드에서 사용하는 병합 가능한 스케치 모음"""
+
+    QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.length = QuantileSketch()
+        self.words = QuantileSketch()
+        self.distinct = HyperLogLog()
+        self.frequent = HeavyHitters()
+
+    def update(self, texts, lengths, word_counts):
+        """결측치를 제외한 텍스트와 미리 계산된 길이/단어 수 배열을 누적"""
+        self.length.update(lengths)
+        self.words.update(word_counts)
+        self.distinct.update_hashes(hash_texts(texts))
+        self.frequent.update(texts)
+
+    def merge(self, other):
+        self.length.merge(other.length)
+        self.words.merge(other.words)
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        return self
+
+    def result(self):
+        """approximate_statistics 형식의 결과 반환"""
+        return {
+            "length_percentiles": {
+                name: self.length.quantile(q) for name, q in self.QUANTILES.items()
+            },
+            "word_percentiles": {
+                name: self.words.quantile(q) for name, q in self.QUANTILES.items()
+            },
+            "distinct_texts": round(self.distinct.estimate()),
+            "top_texts": self.frequent.top(self.top_k),
+            "error_bounds": {
+                "percentile_relative_error": self.length.relative_accuracy,
+                "distinct_texts_relative_std_error": self.distinct.relative_error,
+                "top_text_count_max_overestimate": math.ceil(
+                    self.frequent.epsilon * self.frequent.total
+                ),
+                "top_text_count_confidence": self.frequent.confidence,
+            },
+        }
@@ -0,0 +1,402 @@
+"""
+데이터셋/메타데이터 파일 저장소 백엔드
+
+backend.py는 get_storage()로 설정된 백엔드를 가져오며, 구현 모듈(구글 API 클라이언트 등)은
+처음 사용할 때 임포트한다. settings.yaml의 storage 항목으로 선택하고, 나머지 항목은 백엔드 생성 인자로 전달된다.
+
+    storage:
+      backend: local          # gdrive(기본값), local, fake
+      root: ./output/storage  # local 백엔드의 저장 디렉토리
+"""
+
+import abc
+import contextvars
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from compression import CODECS, compressor
+from config import load_settings
+
+# 백엔드 이름: (모듈, 클래스) - 모듈은 처음 사용할 때 임포트
+BACKENDS = {
+    "gdrive": ("drive_manager", "GoogleDriveManager"),
+    "local": ("storage", "LocalStorage"),
+    "fake": ("storage", "FakeStorage"),
+}
+FOLDER_MIMETYPE = "application/vnd.google-apps.folder"
+# changes 피드 한 페이지의 최대 항목 수
+CHANGES_PAGE_SIZE = 1000
+# 스트림을 저장할 때 한 번에 읽는 바이트 수
+_BLOCK_SIZE = 1 << 20
+
+
+class StorageBackend(abc.ABC):
+    """
+    저장소 백엔드 인터페이스 (파일 정보는 Drive v3 파일 리소스 형식의 dict)
+    구현은 _upload_stream, create_folder, get_file, delete_file, get_start_page_token,
+    iter_changes, folder_url, file_url을 제공한다.
+    """
+
+    @abc.abstractmethod
+    def _upload_stream(
+        self,
+        stream,
+        filename,
+        mimetype,
+        folder_id=None,
+        progress_callback=None,
+        compression=None,
+        properties=None,
+    ):
+        """스트림 하나를 저장하고 파일 정보 반환 (실패 시 예외 발생)"""
+
+    @abc.abstractmethod
+    def create_folder(self, folder_name, parent_folder_id=None):
+        """폴더를 만들고 ID 반환 (실패 시 None)"""
+
+    @abc.abstractmethod
+    def get_file(self, file_id):
+        """파일 정보 조회 (없으면 None)"""
+
+    @abc.abstractmethod
+    def delete_file(self, file_id):
+        """파일 삭제 (성공 여부 반환)"""
+
+    @abc.abstractmethod
+    def get_start_page_token(self):
+        """지금 이후의 변경 사항부터 읽는 changes 피드 페이지 토큰"""
+
+    @abc.abstractmethod
+    def iter_changes(self, page_token):
+        """page_token 이후의 변경 사항을 페이지 단위 (변경 목록, 다음 페이지 토큰)으로 반환"""
+
+    @abc.abstractmethod
+    def folder_url(self, folder_id):
+        """사용자에게 보여줄 폴더 위치"""
+
+    @abc.abstractmethod
+    def file_url(self, file_id):
+        """사용자에게 보여줄 파일 위치"""
+
+    def upload_streams(self, uploads, folder_id=None, progress_callback=None):
+        """
+        여러 스트림을 재직렬화 없이 동시에 업로드하고 파일별 결과 요약 반환
+        uploads: (바이너리 파일 객체, 파일명, mimetype[, 압축 코덱[, appProperties]]) 목록
+        progress_callback: 파일별 진행률이 바뀔 때마다 (파일명, 진행률)을 인자로 호출
+        """
+
+        def _upload(stream, filename, mimetype, compression=None, properties=None):
+            summary = {"name": filename, "id": None, "status": "uploaded"}
+            start = time.perf_counter()
+            try:
+                file = self._upload_stream(
+                    stream,
+                    filename,
+                    mimetype,
+                    folder_id,
+                    progress_callback=(
+                        (lambda progress: progress_callback(filename, progress))
+                        if progress_callback
+                        else None
+                    ),
+                    compression=compression,
+                    properties=properties,
+                )
+                summary["id"] = file.get("id")
+                summary["name"] = file.get("name", filename)
+                # 카탈로그에 기록할 수 있도록 저장소가 돌려준 파일 정보도 포함
+                for key in ("mimeType", "size", "md5Checksum", "createdTime"):
+                    if key in file:
+                        summary[key] = file[key]
+                if compression:
+                    summary["compression"] = compression
+                print(f"File uploaded successfully: {filename} (ID: {summary['id']})")
+            except Exception as e:
+                print(f"Error uploading {filename}: {str(e)}")
+                summary["status"] = "failed"
+                summary["error"] = str(e)
+            summary["seconds"] = round(time.perf_counter() - start, 3)
+            return summary
+
+        with ThreadPoolExecutor(max_workers=max(len(uploads), 1)) as executor:
+            # 작업 스레드에서도 호출한 쪽의 프로필에 업로드 단계가 기록되도록 컨텍스트 복사
+            futures = [
+                executor.submit(contextvars.copy_context().run, _upload, *upload)
+                for upload in uploads
+            ]
+            return [future.result() for future in futures]
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z"
+
+
+def _file_metadata(filename, mimetype, compression, properties):
+    """압축 코덱에 맞춘 파일명/mimetype과 appProperties"""
+    if compression:
+        extension, mimetype = CODECS[compression]
+        filename += extension
+    metadata = {"name": filename, "mimeType": mimetype}
+    if properties:
+        metadata["appProperties"] = {
+            key: str(value) for key, value in properties.items() if value
+        }
+    return metadata
+
+
+def _iter_blocks(stream, compression=None, progress_callback=None):
+    """스트림을 블록 단위로 읽어 (압축한) 바이트를 순서대로 반환하고 읽은 비율로 진행률 보고"""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell() or 1
+    stream.seek(0)
+    codec = compressor(compression) if compression else None
+    while True:
+        block = stream.read(_BLOCK_SIZE)
+        if not block:
+            break
+        yield codec.compress(block) if codec else block
+        if progress_callback:
+            progress_callback(min(stream.tell() / size, 1.0))
+    if codec:
+        yield codec.flush()
+    if progress_callback:
+        progress_callback(1.0)
+
+
+class LocalStorage(StorageBackend):
+    """
+    로컬 파일 시스템 저장소 (파일 ID는 root 기준 상대 경로)
+    파일 정보는 root/.metadata 아래에, 변경 사항은 root/.metadata/changes.jsonl에 한 줄씩 추가해 기록하므로
+    같은 디렉토리를 쓰는 여러 워커 프로세스의 업로드도 카탈로그 동기화로 반영된다.
+    """
+
+    def __init__(self, root="./output/storage"):
+        self.root = os.path.abspath(root)
+        self._metadata_dir = os.path.join(self.root, ".metadata")
+        self._changes_path = os.path.join(self._metadata_dir, "changes.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(self._metadata_dir, exist_ok=True)
+
+    def _path(self, file_id):
+        path = os.path.normpath(os.path.join(self.root, file_id or ""))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"저장소 밖의 경로: {file_id}")
+        return path
+
+    def _metadata_path(self, file_id):
+        relative = os.path.relpath(self._path(file_id), self.root)
+        return os.path.join(self._metadata_dir, f"{relative}.json")
+
+    def _record_change(self, file_id, removed=False):
+        line = json.dumps({"fileId": file_id, "removed": removed, "time": _now()})
+        with self._lock, open(self._changes_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def create_folder(self, folder_name, parent_folder_id=None):
+        """폴더 생성 (같은 이름의 폴더가 있으면 그대로 사용)"""
+        try:
+            folder_id = os.path.join(parent_folder_id or "", folder_name)
+            os.makedirs(self._path(folder_id), exist_ok=True)
+            print(f"Folder created successfully with ID: {folder_id}")
+            return folder_id
+        except Exception as e:
+            print(f"Error creating folder: {str(e)}")
+            return None
+
+    def _upload_stream(
+        self,
+        stream,
+        filename,
+        mimetype,
+        folder_id=None,
+        progress_callback=None,
+        compression=None,
+        properties=None,
+    ):
+        file = _file_metadata(filename, mimetype, compression, properties)
+        file_id = os.path.join(folder_id or "", file["name"])
+        path = self._path(file_id)
+        md5 = hashlib.md5()
+        size = 0
+        # 다른 워커가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        with open(f"{path}.tmp", "wb") as f:
+            for block in _iter_blocks(stream, compression, progress_callback):
+                f.write(block)
+                md5.update(block)
+                size += len(block)
+        os.replace(f"{path}.tmp", path)
+
+        now = _now()
+        file.update(
+            id=file_id,
+            parents=[folder_id] if folder_id else [],
+            size=str(size),
+            md5Checksum=md5.hexdigest(),
+            createdTime=now,
+            modifiedTime=now,
+            trashed=False,
+        )
+        metadata_path = self._metadata_path(file_id)
+        os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(file, f, ensure_ascii=False)
+        self._record_change(file_id)
+        return file
+
+    def get_file(self, file_id):
+        """파일 정보 조회 (저장소 밖에서 지워진 파일도 None)"""
+        try:
+            with open(self._metadata_path(file_id), encoding="utf-8") as f:
+                file = json.load(f)
+        except FileNotFoundError:
+            return None
+        return file if os.path.exists(self._path(file_id)) else None
+
+    def delete_file(self, file_id):
+        """파일 삭제"""
+        try:
+            os.remove(self._path(file_id))
+            if os.path.exists(self._metadata_path(file_id)):
+                os.remove(self._metadata_path(file_id))
+            self._record_change(file_id, removed=True)
+            print(f"File with ID {file_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"Error deleting file: {str(e)}")
+            return False
+
+    def _read_changes(self):
+        try:
+            with open(self._changes_path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.endswith("\n")]
+        except FileNotFoundError:
+            return []
+
+    def get_start_page_token(self):
+        return str(len(self._read_changes()) + 1)
+
+    def iter_changes(self, page_token):
+        """변경 사항 페이지 (페이지 토큰은 1부터 시작하는 changes.jsonl 줄 위치)"""
+        entries = self._read_changes()
+        start = int(page_token) - 1
+        while True:
+            page = entries[start : start + CHANGES_PAGE_SIZE]
+            start += len(page)
+            changes = []
+            for change in page:
+                # Drive처럼 변경 시점이 아닌 현재 파일 상태를 돌려줌
+                file = None if change["removed"] else self.get_file(change["fileId"])
+                if file is None:
+                    change = dict(change, removed=True)
+                else:
+                    change = dict(change, file=file)
+                changes.append(change)
+            yield changes, str(start + 1)
+            if start >= len(entries):
+                return
+
+    def folder_url(self, folder_id):
+        return self._path(folder_id)
+
+    def file_url(self, file_id):
+        return self._path(file_id)
+
+
+class FakeStorage(StorageBackend):
+    """
+    테스트용 프로세스 내 가짜 저장소 (HTTP 없이 fake_drive.FakeDriveState를 직접 사용)
+    state: 여러 인스턴스가 공유할 FakeDriveState (기본값: 새로 생성)
+    """
+
+    def __init__(self, state=None, root_folder_id="ROOT"):
+        from fake_drive import FakeDriveState
+
+        self.state = state or FakeDriveState()
+        self.root_folder_id = root_folder_id
+
+    def create_folder(self, folder_name, parent_folder_id=None):
+        folder = self.state.create_file(
+            {
+                "name": folder_name,
+                "mimeType": FOLDER_MIMETYPE,
+                "parents": [parent_folder_id or self.root_folder_id],
+            }
+        )
+        print(f"Folder created successfully with ID: {folder['id']}")
+        return folder["id"]
+
+    def _upload_stream(
+        self,
+        stream,
+        filename,
+        mimetype,
+        folder_id=None,
+        progress_callback=None,
+        compression=None,
+        properties=None,
+    ):
+        metadata = _file_metadata(filename, mimetype, compression, properties)
+        metadata["parents"] = [folder_id or self.root_folder_id]
+        content = b"".join(_iter_blocks(stream, compression, progress_callback))
+        return dict(self.state.create_file(metadata, content))
+
+    def get_file(self, file_id):
+        file = self.state.files.get(file_id)
+        return dict(file) if file is not None else None
+
+    def delete_file(self, file_id):
+        return self.state.delete_file(file_id) is not None
+
+    def get_start_page_token(self):
+        return str(len(self.state.changes) + 1)
+
+    def iter_changes(self, page_token):
+        while True:
+            response = self.state.list_changes(page_token, CHANGES_PAGE_SIZE)
+            page_token = response.get("nextPageToken")
+            yield response["changes"], page_token or response["newStartPageToken"]
+            if page_token is None:
+                return
+
+    def folder_url(self, folder_id):
+        return f"fake://{folder_id}"
+
+    def file_url(self, file_id):
+        return f"fake://{file_id}"
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    설정된 저장소 백엔드 (처음 호출할 때 구현 모듈을 임포트해 만들고 이후 같은 인스턴스 재사용)
+    METADATA_STORAGE_BACKEND 환경 변수로 settings.yaml의 storage.backend를 덮어쓸 수 있다.
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            options = dict(load_settings().get("storage") or {})
+            configured = options.pop("backend", "gdrive")
+            name = os.getenv("METADATA_STORAGE_BACKEND", configured)
+            if name != configured:
+                # 설정 파일의 생성 인자는 설정 파일에서 고른 백엔드에만 적용
+                options = {}
+            if name not in BACKENDS:
+                raise ValueError(f"지원하지 않는 저장소 백엔드: {name}")
+            module, cls = BACKENDS[name]
+            _storage = getattr(importlib.import_module(module), cls)(**options)
+        return _storage
+
+
+def set_storage(storage):
+    """get_storage()가 반환할 백엔드 지정 (테스트에서 FakeStorage 주입 등, None이면 설정에서 다시 생성)"""
+    global _storage
+    with _storage_lock:
+        _storage = storage
@@ -0,0 +1,55 @@
+import importlib
+import os
+import random
+import sys
+import tempfile
+import time
+import pytest
+import yaml
+
+# 저장소 최상위의 모듈(metadata_generator 등)을 테스트에서 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# backend 테스트에서 앱 시작 시 여는 캐시/카탈로그의 테스트용 위치
+os.environ.setdefault("METADATA_CACHE_DIR", tempfile.mkdtemp())
+os.environ.setdefault("METADATA_CATALOG_PATH", ":memory:")
+os.environ.setdefault("METADATA_STORAGE_BACKEND", "fake")
+
+
+@pytest.fixture(scope="module")
+def drive(tmp_path_factory):
+    """청크 실패를 주입하는 가짜 드라이브 서버를 가리키도록 설정한 GoogleDriveManager와 서버 상태"""
+    import benchmark
+    import config
+    import fake_drive
+
+    server, state = fake_drive.serve(port=0, fail_rate=0.3)
+    workdir = str(tmp_path_factory.mktemp("drive"))
+    benchmark._write_stub_settings(
+        workdir, f"http://localhost:{server.server_address[1]}/"
+    )
+    path = os.path.join(workdir, "settings", "settings.yaml")
+    with open(path) as f:
+        settings = yaml.safe_load(f)
+    # 작은 파일로도 여러 청크를 보내도록 최소 청크 크기 사용
+    settings["gdrive"]["upload_chunksize"] = 256 * 1024
+    # 목록/changes 피드도 여러 페이지로 나누어 읽도록 작은 페이지 크기 사용
+    settings["gdrive"]["list_page_size"] = 2
+    with open(path, "w") as f:
+        yaml.safe_dump(settings, f)
+
+    with pytest.MonkeyPatch.context() as patch:
+        # drive_manager는 import할 때 설정을 읽으므로 설정 경로를 바꾼 뒤 다시 로드
+        patch.setattr(config, "SETTINGS_PATH", path)
+        import drive_manager
+
+        importlib.reload(drive_manager)
+        yield drive_manager.GoogleDriveManager(), state
+    server.shutdown()
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """재시도 백오프 대기 생략"""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    random.seed(0)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from accumulators import ClassTextStatsAccumulator
+from metadata_generator import MetadataGenerator
+
+# 결측 레이블이 한 행에만 있는 CSV (타입을 추론하면 그 행이 든 덩어리만 float 레이블이 됨)
+CSV = """ID,text,target
+1,안녕하세요,0
+2,반갑습니다 여러분,1
+3,샘플 데이터,2
+4,결측 레이블,
+5,입니다,3
+6,분류 문제를 위한 데이터,2
+7,마지막 행,1
+"""
+
+
+def _metadata(source, **options):
+    metadata = MetadataGenerator(source, **options).generate_full_metadata()
+    metadata.pop("creation_date")
+    return metadata
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "train.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_chunked_matches_in_memory(csv_path, chunksize):
+    assert _metadata(csv_path, chunksize=chunksize) == _metadata(csv_path)
+
+
+def test_missing_label_keeps_label_keys(csv_path):
+    distribution = _metadata(csv_path, chunksize=3)["target_distribution"]
+    assert list(distribution["class_balance"]) == ["1", "2", "0", "3"]
+    assert sum(distribution["class_distribution"].values()) == 6
+
+
+def _class_stats(values):
+    """np.percentile 기본 보간으로 계산한 레이블 하나의 기대 통계"""
+    return {
+        "mean": float(np.mean(values)),
+        "min": int(np.min(values)),
+        "max": int(np.max(values)),
+        **{
+            name: float(np.percentile(values, q * 100))
+            for name, q in ClassTextStatsAccumulator.QUANTILES.items()
+        },
+    }
+
+
+def test_class_text_statistics_with_duplicate_index():
+    base = pd.DataFrame(
+        {
+            "text": ["가 나", "다라마 바 사", None, "아", "자차 카타 파하 갸"],
+            "target": [0, 1, 0, 0, 1],
+        }
+    )
+    augmented = pd.DataFrame(
+        {"text": ["역번역 문장", "동의어", "긴 증강 문장 하나 더"], "target": [1, 0, 2]}
+    )
+    # concat 결과는 인덱스 0~2가 두 번씩 나옴
+    frame = pd.concat([base, augmented])
+
+    result = _metadata(frame)["class_text_statistics"]
+
+    texts = frame.dropna(subset=["text"])
+    assert list(result) == ["0", "1", "2"]
+    for label, rows in texts.groupby("target"):
+        stats = result[str(label)]
+        assert stats["num_samples"] == len(rows)
+        assert stats["length"] == pytest.approx(_class_stats(rows["text"].str.len()))
+        assert stats["words"] == pytest.approx(
+            _class_stats(rows["text"].str.split().str.len())
+        )
+
+
+@pytest.mark.filterwarnings("error")
+def test_incremental_state_matches_full_rescan(tmp_path):
+    base = pd.DataFrame(
+        {
+            "ID": range(8),
+            "text": ["가", "가나", "가나다", "라 마", "바 사 아", "자", "차 카", "타"],
+            "target": [0, 0, 0, 1, 1, 2, 2, 0],
+        }
+    )
+    base_path = tmp_path / "base.csv"
+    base.to_csv(base_path, index=False)
+    generator = MetadataGenerator(
+        str(base_path), output_path=str(tmp_path / "metadata.json")
+    )
+    generator.generate_full_metadata()
+    generator.save_metadata()
+
+    # 기준 상태는 CSV에서 읽은 문자열 레이블, 변경분은 정수 레이블 DataFrame
+    added = pd.DataFrame(
+        {
+            "ID": [8, 9, 10, 11],
+            "text": ["하 하 하", "파도", "새 레이블", "또 새 레이블"],
+            "target": [2, 2, 3, 3],
+        }
+    )
+    removed = base.iloc[[0, 3]]
+    incremental = _metadata(
+        added,
+        base_state=str(tmp_path / "metadata.state.json"),
+        removed=removed,
+    )
+
+    full_path = tmp_path / "full.csv"
+    pd.concat([base.drop(index=[0, 3]), added]).to_csv(full_path, index=False)
+    assert incremental == _metadata(str(full_path))
+    assert list(incremental["class_text_statistics"]) == ["2", "0", "3", "1"]
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+import backend
+
+DATA = open(
+    os.path.join(os.path.dirname(__file__), "..", "data", "train.csv"), "rb"
+).read()
+
+
+@pytest.fixture
+def client():
+    with TestClient(backend.app) as client:
+        yield client
+
+
+def test_import_creates_no_files(tmp_path):
+    """backend import만으로는 실행 디렉토리에 캐시/카탈로그 파일을 만들지 않음"""
+    code = "import os, sys; sys.path.insert(0, sys.argv[1]); import backend"
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith("METADATA_")
+    }
+    subprocess.run(
+        [sys.executable, "-c", code, os.path.dirname(os.path.dirname(__file__))],
+        cwd=tmp_path,
+        env=env,
+        check=True,
+    )
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def rolled(monkeypatch):
+    """_spool_upload에 전달된 업로드 파일이 디스크로 넘어갔는지 기록"""
+    seen = []
+    spool_upload = backend._spool_upload
+
+    def spy(fileobj, *args, **kwargs):
+        seen.append(fileobj._rolled)
+        return spool_upload(fileobj, *args, **kwargs)
+
+    monkeypatch.setattr(backend, "_spool_upload", spy)
+    return seen
+
+
+def test_spool_limit_is_per_app(client, rolled, monkeypatch):
+    default = MultiPartParser.spool_max_size
+    response = client.post(
+        "/generate_metadata", files={"file": ("t.csv", DATA)}, data={"datasetname": "t"}
+    )
+    assert response.status_code == 200
+    monkeypatch.setattr(backend, "SPOOL_MAX_SIZE", 16)
+    response = client.post(
+        "/generate_metadata", files={"file": ("t.csv", DATA)}, data={"datasetname": "t"}
+    )
+    assert response.json()["total_samples"] == 8
+    assert rolled == [False, True]
+    assert MultiPartParser.spool_max_size == default
+
+
+def test_malformed_multipart_is_rejected(client):
+    response = client.post(
+        "/preview",
+        content=b"--x\r\nbroken",
+        headers={"content-type": "multipart/form-data"},
+    )
+    assert response.status_code == 400
+
+
+def test_handshake_hit_points_to_existing_dataset(client):
+    form = {"creator": "c", "datasetname": "handshake", "is_gdrive_upload": "true"}
+    first = client.post(
+        "/generate_metadata", files={"file": ("t.csv", DATA)}, data=form
+    )
+    assert first.status_code == 200
+    dataset_id = first.json()["gdrive_dataset_id"]
+
+    second = client.post(
+        "/generate_metadata",
+        data=dict(form, content_hash=hashlib.sha256(DATA).hexdigest()),
+    )
+    assert second.status_code == 200
+    body = second.json()
+    assert [upload["status"] for upload in body["gdrive_uploads"]] == [
+        "reused",
+        "uploaded",
+    ]
+    # 새 폴더에는 메타데이터만 있으므로 기존 데이터셋 파일을 직접 가리켜야 함
+    assert body["gdrive_dataset_id"] == dataset_id
+    assert body["gdrive_dataset_url"] == backend.get_storage().file_url(dataset_id)
+
+
+def test_job_result_without_text_is_valid_json(client):
+    csv = b"ID,text,target\n1,,0\n2,,1\n"
+    job = client.post("/jobs", files={"file": ("empty.csv", csv)}).json()
+    backend.job_manager.get(job["job_id"]).future.result()
+
+    response = client.get(f"/jobs/{job['job_id']}/result")
+
+    assert response.status_code == 200
+    assert response.json()["text_statistics"]["avg_length"] is None
+
+
+def test_preview_runs_alongside_scan(client):
+    # 캐시된 통계가 있으면 미리보기를 생략하므로 다른 테스트와 겹치지 않는 내용 사용
+    csv = b"ID,text,target\n" + b"".join(
+        b"%d,text %d,%d\n" % (i, i, i % 2) for i in range(9)
+    )
+    job = client.post(
+        "/jobs", files={"file": ("preview.csv", csv)}, data={"preview": "true"}
+    ).json()
+    job = backend.job_manager.get(job["job_id"])
+    job.future.result()
+
+    assert client.get(f"/jobs/{job.id}/result").json()["total_samples"] == 9
+    assert job.preview["preview"]["scope"] == "file"
+
+
+def test_cache_key_changes_with_schema_version_and_options(monkeypatch):
+    content_hash = hashlib.sha256(b"data").hexdigest()
+    key = backend.cache_key_for(content_hash, quality={"expected_labels": ["0"]})
+
+    assert backend.cache_key_for(content_hash, approximate=None) == (
+        backend.cache_key_for(content_hash)
+    )
+    assert key != backend.cache_key_for(content_hash, quality=True)
+    assert key != backend.cache_key_for(
+        content_hash, quality={"expected_labels": ["1"]}
+    )
+    assert key != backend.cache_key_for(
+        content_hash, quality={"expected_labels": ["0"]}, vocabulary=True
+    )
+    monkeypatch.setattr(backend, "SCHEMA_VERSION", "99.0")
+    assert key != backend.cache_key_for(
+        content_hash, quality={"expected_labels": ["0"]}
+    )
+
+
+def test_cache_stats_count_hits_and_misses(client):
+    csv = b"ID,text,target\n1,cache stats,0\n2,hit or miss,1\n"
+
+    def _memory_stats():
+        return client.get("/cache/stats").json()["memory"]
+
+    def _generate(**data):
+        response = client.post(
+            "/generate_metadata", files={"file": ("c.csv", csv)}, data=data
+        )
+        assert response.status_code == 200
+
+    before = _memory_stats()
+    _generate()
+    _generate()
+    # 통계 옵션이 다르면 캐시 키가 달라 다시 스캔
+    _generate(approximate="true")
+    after = _memory_stats()
+
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 2
+    assert after["entries"] - before["entries"] == 2
+
+
+def test_stuck_preview_does_not_block_job(client, monkeypatch):
+    release = threading.Event()
+    spooled = []
+
+    def stuck_preview(path, *args):
+        spooled.append(path)
+        release.wait(10)
+
+    monkeypatch.setattr(backend, "preview_metadata", stuck_preview)
+    monkeypatch.setattr(backend, "PREVIEW_BUDGET_SECONDS", 0.1)
+    csv = b"ID,text,target\n1,stuck preview,0\n2,does not block,1\n"
+    try:
+        job = client.post(
+            "/jobs", files={"file": ("stuck.csv", csv)}, data={"preview": "true"}
+        ).json()
+        job = backend.job_manager.get(job["job_id"])
+        job.future.result(timeout=5)
+
+        assert job.status == "succeeded" and job.preview is None
+        assert not os.path.exists(spooled[0])
+    finally:
+        release.set()
@@ -0,0 +1,69 @@
+import json
+import os
+import pytest
+import yaml
+from batch import load_config, run_batch
+
+CSV = """ID,text,target
+1,가 나 다,0
+2,나 다 라,1
+3,다 라 마,0
+"""
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    root = tmp_path / "data"
+    (root / "sub").mkdir(parents=True)
+    for name in ["a.csv", "b.csv", "sub/c.csv"]:
+        (root / name).write_text(CSV, encoding="utf-8")
+    return root
+
+
+def test_load_config_rejects_unknown_keys(tmp_path):
+    path = tmp_path / "batch.yaml"
+    path.write_text(yaml.safe_dump({"creator": "c", "vocab": True}), encoding="utf-8")
+    with pytest.raises(ValueError, match="vocab"):
+        load_config(str(path))
+    assert load_config(None) == {}
+
+
+def test_batch_generates_in_parallel_and_skips_up_to_date(datasets, tmp_path):
+    output_dir = str(tmp_path / "out")
+    config = {"creator": "c", "vocabulary": {"top_k": 1}, "chunksize": 2}
+
+    manifest = run_batch([str(datasets)], config, output_dir, num_workers=2)
+
+    statuses = {entry["metadata"]: entry["status"] for entry in manifest["datasets"]}
+    assert statuses == {
+        "a_metadata.json": "generated",
+        "b_metadata.json": "generated",
+        os.path.join("sub", "c_metadata.json"): "generated",
+    }
+    with open(os.path.join(output_dir, "a_metadata.json"), encoding="utf-8") as f:
+        metadata = json.load(f)
+    assert metadata["creator"] == "c" and metadata["total_samples"] == 3
+    # 설정의 vocabulary 옵션(top_k)이 그대로 적용됨
+    assert len(metadata["vocabulary_statistics"]["top_tokens"]) == 1
+
+    # 바뀐 파일만 다시 생성
+    (datasets / "b.csv").write_text(CSV + "4,바,1\n", encoding="utf-8")
+    manifest = run_batch([str(datasets)], config, output_dir, num_workers=2)
+    statuses = {entry["metadata"]: entry["status"] for entry in manifest["datasets"]}
+    assert statuses["a_metadata.json"] == "skipped"
+    assert statuses["b_metadata.json"] == "generated"
+
+    # 설정이 바뀌면 모두 다시 생성
+    manifest = run_batch(
+        [str(datasets)], dict(config, creator="d"), output_dir, num_workers=2
+    )
+    assert {entry["status"] for entry in manifest["datasets"]} == {"generated"}
+
+
+def test_batch_records_failed_dataset(datasets, tmp_path):
+    (datasets / "broken.csv").write_text("ID,label\n1,0\n", encoding="utf-8")
+
+    manifest = run_batch([str(datasets / "*.csv")], {}, str(tmp_path / "out"), 2)
+
+    (failed,) = [e for e in manifest["datasets"] if e["status"] == "failed"]
+    assert failed["dataset"].endswith("broken.csv") and failed["error"]
@@ -0,0 +1,20 @@
+import os
+import pytest
+import benchmark
+
+pytestmark = pytest.mark.usefixtures("no_sleep")
+
+
+def test_benchmark_endpoint_scenario(tmp_path, monkeypatch):
+    # 다른 테스트가 지정한 저장소/캐시 설정 대신 벤치마크가 띄운 가짜 드라이브 서버를 사용
+    for name in list(os.environ):
+        if name.startswith("METADATA_"):
+            monkeypatch.delenv(name)
+
+    results = benchmark.run_benchmarks(
+        [500], scenarios=["endpoint"], data_dir=str(tmp_path)
+    )
+
+    (run,) = results["runs"]
+    assert "error" not in run
+    assert run["rows"] == 500 and run["rows_per_second"] > 0
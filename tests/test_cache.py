@@ -0,0 +1,61 @@
+import os
+from cache import DiskTier, MemoryTier, MetadataCache
+
+
+def test_memory_tier_evicts_least_recently_used_by_size():
+    tier = MemoryTier(max_bytes=25)
+    tier.put("a", b"a" * 10)
+    tier.put("b", b"b" * 10)
+    assert tier.get("a") == b"a" * 10
+    # a를 방금 사용했으므로 크기를 넘으면 b부터 제거
+    tier.put("c", b"c" * 10)
+
+    assert tier.get("b") is None
+    assert tier.get("a") is not None and tier.get("c") is not None
+    assert tier.size == 20 and len(tier) == 2
+    # 한도보다 큰 항목은 저장하지 않음
+    tier.put("big", b"x" * 26)
+    assert tier.get("big") is None
+    assert tier.stats() == {
+        "hits": 3,
+        "misses": 2,
+        "entries": 2,
+        "bytes": 20,
+        "max_bytes": 25,
+    }
+
+
+def test_memory_tier_replaces_existing_key():
+    tier = MemoryTier(max_bytes=100)
+    tier.put("a", b"a" * 10)
+    tier.put("a", b"a" * 30)
+    assert tier.size == 30 and len(tier) == 1
+
+
+def test_disk_tier_evicts_oldest_files(tmp_path):
+    tier = DiskTier(str(tmp_path), max_bytes=25)
+    for i, key in enumerate(["a", "b"]):
+        tier.put(key, b"x" * 10)
+        os.utime(tier._path(key), (1000 + i, 1000 + i))
+    # 읽으면 마지막 사용 시각이 갱신되어 a가 가장 최근 항목이 됨
+    assert tier.get("a") is not None
+    tier.put("c", b"x" * 10)
+
+    assert sorted(entry.name for entry in os.scandir(tmp_path)) == ["a.json", "c.json"]
+    assert tier.get("b") is None
+    assert tier.size == 20
+    assert (tier.hits, tier.misses) == (1, 1)
+
+
+def test_metadata_cache_promotes_disk_hits_to_memory(tmp_path):
+    cache = MetadataCache(str(tmp_path), memory_bytes=1024, disk_bytes=1024)
+    cache.put("key", {"total_samples": 3, "avg": float("nan")})
+    # 새로 연 캐시(재시작)는 메모리가 비어 있으므로 디스크에서 읽고 메모리에 올림
+    reopened = MetadataCache(str(tmp_path), memory_bytes=1024, disk_bytes=1024)
+
+    assert reopened.get("key") == {"total_samples": 3, "avg": None}
+    assert reopened.get("key") == {"total_samples": 3, "avg": None}
+    assert reopened.get("missing") is None
+    stats = reopened.stats()
+    assert (stats["memory"]["hits"], stats["memory"]["misses"]) == (1, 2)
+    assert (stats["disk"]["hits"], stats["disk"]["misses"]) == (1, 1)
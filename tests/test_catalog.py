@@ -0,0 +1,123 @@
+import io
+import pytest
+import storage
+from catalog import DatasetCatalog
+from storage import FakeStorage
+
+
+def _upload(backend, name, kind="dataset", **properties):
+    """카탈로그 속성(kind)을 붙여 업로드하고 파일 정보 반환"""
+    if kind:
+        properties["kind"] = kind
+    return backend._upload_stream(
+        io.BytesIO(name.encode()), name, "text/csv", properties=properties
+    )
+
+
+def _names(catalog, **conditions):
+    _, files = catalog.search(**conditions)
+    return sorted(file["name"] for file in files)
+
+
+@pytest.fixture
+def fake():
+    return FakeStorage()
+
+
+@pytest.fixture
+def catalog():
+    return DatasetCatalog(":memory:")
+
+
+def test_initial_sync_only_stores_start_token(fake, catalog):
+    _upload(fake, "before.csv")
+
+    result = catalog.sync(fake)
+
+    # 첫 동기화 이전의 업로드는 record로 기록되므로 changes 피드를 처음부터 읽지 않음
+    assert result == {"applied": 0, "page_token": fake.get_start_page_token()}
+    assert catalog.page_token == result["page_token"]
+    assert _names(catalog) == []
+
+
+def test_incremental_sync_reads_pages_from_saved_token(fake, catalog, monkeypatch):
+    monkeypatch.setattr(storage, "CHANGES_PAGE_SIZE", 2)
+    catalog.sync(fake)
+    for name in ["a.csv", "b.csv", "c.csv"]:
+        _upload(fake, name, creator="kim")
+    # 카탈로그 속성이 없는 파일은 반영하지 않음
+    _upload(fake, "unrelated.csv", kind=None)
+
+    result = catalog.sync(fake)
+
+    assert result == {"applied": 3, "page_token": fake.get_start_page_token()}
+    assert _names(catalog, creator="kim") == ["a.csv", "b.csv", "c.csv"]
+    assert catalog.sync(fake)["applied"] == 0
+
+
+def test_interrupted_sync_resumes_after_last_page(fake, catalog, monkeypatch):
+    monkeypatch.setattr(storage, "CHANGES_PAGE_SIZE", 2)
+    catalog.sync(fake)
+    for name in ["a.csv", "b.csv", "c.csv"]:
+        _upload(fake, name)
+
+    class Interrupted(Exception):
+        pass
+
+    class FlakyStorage(FakeStorage):
+        def iter_changes(self, page_token):
+            pages = super().iter_changes(page_token)
+            yield next(pages)
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        catalog.sync(FlakyStorage(fake.state))
+
+    # 첫 페이지는 커밋되었고 토큰도 그 다음 위치로 저장됨
+    assert _names(catalog) == ["a.csv", "b.csv"]
+    assert catalog.sync(fake)["applied"] == 1
+    assert _names(catalog) == ["a.csv", "b.csv", "c.csv"]
+
+
+def test_sync_removes_deleted_and_trashed_files(fake, catalog):
+    catalog.sync(fake)
+    files = {name: _upload(fake, name) for name in ["a.csv", "b.csv", "c.csv"]}
+    assert catalog.sync(fake)["applied"] == 3
+
+    fake.delete_file(files["a.csv"]["id"])
+    fake.state.update_file(files["b.csv"]["id"], trashed=True)
+    fake.state.update_file(files["c.csv"]["id"], name="renamed.csv")
+    catalog.sync(fake)
+
+    assert _names(catalog) == ["renamed.csv"]
+
+
+def test_record_then_sync_keeps_properties(fake, catalog):
+    catalog.sync(fake)
+    file = _upload(fake, "d.csv", kind=None)
+    # 업로드한 쪽이 직접 기록한 파일은 속성이 없어도 변경 사항을 반영
+    catalog.record(file, kind="dataset", creator="lee", content_hash="h")
+    fake.state.update_file(file["id"], name="d2.csv")
+    catalog.sync(fake)
+
+    _, (row,) = catalog.search(content_hash="h")
+    assert (row["name"], row["kind"], row["creator"]) == ("d2.csv", "dataset", "lee")
+
+
+@pytest.mark.usefixtures("no_sleep")
+def test_sync_against_fake_drive_server(drive, catalog):
+    manager, state = drive
+    catalog.sync(manager)
+    files = [_upload(manager, f"{name}.csv") for name in "abcde"]
+    # 가짜 드라이브 서버의 changes 피드는 페이지당 2개씩 반환
+    assert catalog.sync(manager) == {
+        "applied": 5,
+        "page_token": manager.get_start_page_token(),
+    }
+
+    assert manager.delete_file(files[0]["id"])
+    state.update_file(files[1]["id"], trashed=True)
+    result = catalog.sync(manager)
+
+    assert result["applied"] == 2
+    assert _names(catalog) == ["c.csv", "d.csv", "e.csv"]
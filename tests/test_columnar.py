@@ -0,0 +1,85 @@
+import json
+import pandas as pd
+import pytest
+from columnar import STAT_COLUMNS, iter_columnar_chunks, row_count, schema_columns
+from metadata_generator import MetadataGenerator
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.feather  # noqa: E402
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet  # noqa: E402
+
+FRAME = pd.DataFrame(
+    {
+        "ID": range(10),
+        "text": [
+            "가 나",
+            "다라",
+            None,
+            "마 바 사",
+            "아",
+            "아",
+            "자 차",
+            "카",
+            "타 파",
+            "하",
+        ],
+        "target": ["0", "1", "0", None, "2", "1", "0", "2", "1", "0"],
+        "extra": [1.5] * 10,
+    }
+)
+
+
+def _write(frame, path):
+    """확장자에 맞는 포맷으로 저장 (.arrow는 여러 레코드 배치를 가진 Arrow IPC 파일)"""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if path.endswith(".parquet"):
+        pa.parquet.write_table(table, path, row_group_size=4)
+    elif path.endswith(".feather"):
+        pa.feather.write_feather(table, path)
+    else:
+        with pa.ipc.new_file(path, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=3):
+                writer.write_batch(batch)
+
+
+def _metadata(source, **options):
+    metadata = MetadataGenerator(source, **options).generate_full_metadata()
+    metadata.pop("creation_date")
+    return json.loads(json.dumps(metadata))
+
+
+@pytest.fixture(params=[".parquet", ".feather", ".arrow"])
+def columnar_path(request, tmp_path):
+    path = str(tmp_path / f"train{request.param}")
+    _write(FRAME, path)
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "train.csv"
+    FRAME.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunksize", [None, 3])
+def test_metadata_matches_csv(columnar_path, csv_path, chunksize):
+    options = {"approximate": True, "duplicates": True, "quality": True}
+    assert _metadata(columnar_path, chunksize=chunksize, **options) == _metadata(
+        csv_path, **options
+    )
+
+
+def test_projection_and_chunking(columnar_path):
+    chunks = list(iter_columnar_chunks(columnar_path, chunksize=3))
+
+    assert len(chunks) >= 4 and max(len(chunk) for chunk in chunks) == 3
+    assert all(list(chunk.columns) == STAT_COLUMNS for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), FRAME[STAT_COLUMNS]
+    )
+    (whole,) = iter_columnar_chunks(columnar_path, columns=["ID", "text"])
+    assert list(whole.columns) == ["ID", "text"] and len(whole) == len(FRAME)
+    assert schema_columns(columnar_path) == list(FRAME.columns)
+    assert row_count(columnar_path) == len(FRAME)
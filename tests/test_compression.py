@@ -0,0 +1,20 @@
+import gzip
+import io
+import pytest
+
+pytestmark = pytest.mark.usefixtures("no_sleep")
+
+
+def test_gzip_round_trip(drive, tmp_path):
+    manager, state = drive
+    text = "".join(f"{i},안녕하세요 세계 {i % 7}\n" for i in range(100_000)).encode()
+
+    file = manager._upload_stream(
+        io.BytesIO(text), "train.csv", "text/csv", compression="gzip"
+    )
+
+    assert file["name"] == "train.csv.gz"
+    assert gzip.decompress(state.contents[file["id"]]) == text
+    output = tmp_path / "train.csv"
+    assert manager.download_file(file["id"], str(output))
+    assert output.read_bytes() == text
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from duplicates import DuplicateAccumulator
+
+NUM_PERM, BANDS = 8, 2
+
+
+def _signatures():
+    """
+    첫 밴드가 모두 같은 버킷에 드는 서명: 0번과 1번은 8개 중 7개가 같은(근사 중복) 쌍이고,
+    나머지는 첫 밴드만 같은 방해 서명이라 버킷 안에서 0번과 1번이 이웃하지 않음
+    """
+    rows = [[1, 1, 1, 1, 2, 2, 2, 2], [1, 1, 1, 1, 3, 2, 2, 2]]
+    rows += [[1, 1, 1, 1, 10 + i, 20 + i, 30 + i, 40 + i] for i in range(30)]
+    return np.array(rows, dtype=np.uint8)
+
+
+def test_all_pairs_in_bucket_are_compared():
+    accumulator = DuplicateAccumulator(num_perm=NUM_PERM, bands=BANDS)
+    labels, truncated = accumulator._clusters(_signatures())
+
+    assert labels[0] == labels[1]
+    assert len(np.unique(labels)) == len(labels) - 1
+    assert truncated == 0
+
+
+def test_oversized_bucket_is_reported():
+    accumulator = DuplicateAccumulator(
+        num_perm=NUM_PERM, bands=BANDS, max_bucket_size=4
+    )
+    _, truncated = accumulator._clusters(_signatures())
+    assert truncated == 1
+
+
+def test_report_includes_truncated_buckets():
+    accumulator = DuplicateAccumulator()
+    texts = pd.Series(["같은 문장입니다", "같은 문장입니다!", "다른 내용"])
+    accumulator.update(texts, pd.Series(["0", "0", "1"]))
+    report = accumulator.result()
+
+    assert report["near_duplicate_clusters"] == 1
+    assert report["truncated_buckets"] == 0
+    assert report["parameters"]["max_bucket_size"] == accumulator.max_bucket_size
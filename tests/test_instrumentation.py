@@ -0,0 +1,159 @@
+import contextvars
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+import backend
+from instrumentation import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    Profile,
+    activate,
+    stage,
+    timed_iter,
+)
+from jobs import JobManager
+
+# Prometheus 텍스트 형식(0.0.4)의 HELP/TYPE 줄과 샘플 줄
+_COMMENT = re.compile(r"# (HELP|TYPE) ([a-zA-Z_:][a-zA-Z0-9_:]*) (.+)")
+_SAMPLE = re.compile(
+    r"([a-zA-Z_:][a-zA-Z0-9_:]*)"
+    r'(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\.)*",?)*\})? '
+    r"(\S+)"
+)
+
+
+def _parse(text):
+    """노출 형식을 검증하며 {메트릭 이름: 종류}와 [(샘플 이름, 레이블 문자열, 값)] 반환"""
+    assert text.endswith("\n")
+    kinds, samples = {}, []
+    for line in text.splitlines():
+        comment = _COMMENT.fullmatch(line)
+        if comment:
+            if comment.group(1) == "TYPE":
+                assert comment.group(3) in ("counter", "histogram")
+                kinds[comment.group(2)] = comment.group(3)
+            continue
+        sample = _SAMPLE.fullmatch(line)
+        assert sample, line
+        name, labels, value = sample.groups()
+        # 샘플은 TYPE으로 선언한 메트릭(히스토그램은 _bucket/_sum/_count 접미사)에 속해야 함
+        assert re.sub(r"_(bucket|sum|count)$", "", name) in kinds or name in kinds
+        samples.append((name, labels or "", float(value)))
+    return kinds, samples
+
+
+def test_profile_records_stages_and_memory():
+    profile = Profile()
+    with activate(profile):
+        with stage("outer"):
+            with stage("allocate"):
+                block = b"x" * (64 << 20)
+            for _ in timed_iter("decode", range(3)):
+                pass
+    del block
+    with stage("outside"):
+        pass
+
+    result = profile.to_dict()
+    assert list(result["stages"]) == ["allocate", "decode", "outer"]
+    assert result["stages"]["decode"]["calls"] == 4  # 항목 3개 + 끝을 확인한 호출
+    assert result["stages"]["allocate"]["memory_delta_mb"] >= 60
+    assert result["peak_rss_mb"] >= result["stages"]["allocate"]["memory_delta_mb"]
+    assert result["stages"]["outer"]["seconds"] >= (
+        result["stages"]["allocate"]["seconds"]
+    )
+
+
+def _record_stage(name):
+    with stage(name):
+        pass
+
+
+def _job(job, name):
+    _record_stage(name)
+    return 200, None
+
+
+def test_profile_follows_context_into_worker_threads():
+    profile = Profile()
+    jobs = JobManager(max_workers=1)
+    with activate(profile):
+        # 작업 풀과 컨텍스트를 복사해 넘긴 스레드의 단계는 제출한 쪽의 프로필에 기록
+        job = jobs.submit(_job, "job")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(
+                contextvars.copy_context().run, _record_stage, "copied"
+            ).result()
+        # 컨텍스트를 넘기지 않은 스레드의 단계는 기록되지 않음
+        thread = threading.Thread(target=_record_stage, args=("plain_thread",))
+        thread.start()
+        thread.join()
+    job.future.result()
+    # 프로필을 활성화하지 않고 제출한 작업도 기록되지 않음
+    jobs.submit(_job, "inactive").future.result()
+
+    assert set(profile.to_dict()["stages"]) == {"job", "copied"}
+
+
+def test_registry_renders_valid_exposition_format():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("c_total", "help text", ["route"]))
+    histogram = registry.register(Histogram("h_seconds", "help", ["stage"], (0.1, 1)))
+    counter.inc(route='/jobs/{job_id} "quoted"\\n')
+    histogram.observe(0.05, stage="scan")
+    histogram.observe(0.5, stage="scan")
+
+    kinds, samples = _parse(registry.render())
+
+    assert kinds == {"c_total": "counter", "h_seconds": "histogram"}
+    assert [value for _, _, value in samples] == [1, 1, 2, 2, 0.55, 2]
+
+
+@pytest.fixture
+def client():
+    with TestClient(backend.app) as client:
+        yield client
+
+
+def test_metrics_endpoint_exposes_stage_and_request_metrics(client):
+    csv = b"ID,text,target\n1,metrics endpoint,0\n2,stage timings,1\n"
+    response = client.post(
+        "/generate_metadata",
+        files={"file": ("m.csv", csv)},
+        data={"datasetname": "m", "profile": "true"},
+    )
+    assert response.status_code == 200
+    # 요청 처리(스풀)와 작업 스레드의 단계가 같은 프로필에 기록됨
+    stages = response.json()["_profile"]["stages"]
+    assert {"spool_upload", "generate_metadata", "scan", "decode"} <= set(stages)
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    kinds, samples = _parse(response.text)
+    assert kinds["metadata_stage_duration_seconds"] == "histogram"
+    values = {(name, labels): value for name, labels, value in samples}
+    assert (
+        values[
+            (
+                "metadata_requests_total",
+                '{method="POST",route="/generate_metadata",status="200"}',
+            )
+        ]
+        >= 1
+    )
+    assert values[("metadata_rows_processed_total", "")] >= 2
+    # 히스토그램 버킷은 누적 개수이고 +Inf 버킷은 관측 횟수와 같음
+    buckets = [
+        value
+        for name, labels, value in samples
+        if name == "metadata_stage_duration_seconds_bucket"
+        and labels.startswith('{stage="scan"')
+    ]
+    assert buckets == sorted(buckets)
+    assert (
+        buckets[-1]
+        == values[("metadata_stage_duration_seconds_count", '{stage="scan"}')]
+    )
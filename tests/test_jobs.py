@@ -0,0 +1,133 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+import backend
+from jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobManager
+
+
+@pytest.fixture
+def client():
+    with TestClient(backend.app) as client:
+        yield client
+
+
+def test_job_reports_stage_and_progress():
+    started, release = threading.Event(), threading.Event()
+
+    def work(job):
+        job.update(stage="statistics", progress=0.4)
+        started.set()
+        release.wait(5)
+        job.update(stage="done", progress=2.0)
+        return 200, {"ok": True}
+
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(work)
+    # 작업자가 하나뿐이므로 두 번째 작업은 대기열에 남음
+    queued = jobs.submit(lambda job: (200, None))
+    started.wait(5)
+
+    assert job.to_dict()["status"] == RUNNING
+    assert (job.stage, job.progress) == ("statistics", 0.4)
+    assert queued.status == QUEUED and not queued.done
+    release.set()
+    job.future.result()
+    queued.future.result()
+
+    assert job.status == SUCCEEDED and job.done
+    assert (job.stage, job.progress) == ("done", 1.0)
+    assert (job.status_code, job.result) == (200, {"ok": True})
+
+
+def test_failed_job_keeps_error():
+    def fail(job):
+        job.update(stage="statistics")
+        raise ValueError("bad input")
+
+    job = JobManager().submit(fail)
+    job.future.result()
+
+    assert job.status == FAILED and job.done
+    assert job.to_dict()["error"] == "bad input"
+    assert job.stage == "statistics"
+
+
+def test_finished_jobs_are_pruned():
+    jobs = JobManager(max_workers=1, max_finished_jobs=2)
+    submitted = [jobs.submit(lambda job: (200, None)) for _ in range(4)]
+    for job in submitted:
+        job.future.result()
+    jobs.submit(lambda job: (200, None)).future.result()
+
+    assert jobs.get(submitted[0].id) is None
+    assert jobs.get(submitted[-1].id) is not None
+
+
+def test_job_api_lifecycle(client, monkeypatch):
+    release = threading.Event()
+    generate = backend.MetadataGenerator.generate_full_metadata
+
+    def blocking_generate(self, **kwargs):
+        release.wait(5)
+        return generate(self, **kwargs)
+
+    monkeypatch.setattr(
+        backend.MetadataGenerator, "generate_full_metadata", blocking_generate
+    )
+    csv = b"ID,text,target\n1,job lifecycle,0\n2,polling api,1\n"
+    try:
+        response = client.post("/jobs", files={"file": ("j.csv", csv)})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        # 통계 계산 단계에서 멈춰 있는 동안의 상태
+        job = backend.job_manager.get(job_id)
+        for _ in range(500):
+            if job.stage is not None:
+                break
+            time.sleep(0.01)
+        status = client.get(f"/jobs/{job_id}").json()
+        assert (status["status"], status["stage"]) == (RUNNING, "statistics")
+        assert status["progress"] < 1.0
+        # 끝나지 않은 작업의 결과는 409와 현재 상태
+        response = client.get(f"/jobs/{job_id}/result")
+        assert response.status_code == 409
+        assert response.json()["job_id"] == job_id
+    finally:
+        release.set()
+    backend.job_manager.get(job_id).future.result()
+
+    status = client.get(f"/jobs/{job_id}").json()
+    assert (status["status"], status["stage"], status["progress"]) == (
+        SUCCEEDED,
+        "done",
+        1.0,
+    )
+    response = client.get(f"/jobs/{job_id}/result")
+    assert response.status_code == 200
+    assert response.json()["total_samples"] == 2
+
+
+def test_failed_job_api_returns_error(client):
+    # 잘못된 전처리 JSON은 작업 안에서 실패
+    response = client.post(
+        "/jobs",
+        files={"file": ("f.csv", b"ID,text,target\n1,failed job,0\n")},
+        data={"preprocessing_steps": "{not json"},
+    )
+    job_id = response.json()["job_id"]
+    backend.job_manager.get(job_id).future.result()
+
+    status = client.get(f"/jobs/{job_id}").json()
+    assert status["status"] == FAILED and status["error"]
+    response = client.get(f"/jobs/{job_id}/result")
+    assert response.status_code == 400
+    assert response.json() == {"error": status["error"]}
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get("/jobs/missing").status_code == 404
+    response = client.get("/jobs/missing/result")
+    assert response.status_code == 404
+    assert response.json() == {"error": "job not found"}
@@ -0,0 +1,27 @@
+import json
+import math
+import os
+import numpy as np
+from metadata_model import SCHEMA_VERSION, DatasetMetadata, to_native
+
+OUTPUT = os.path.join(os.path.dirname(__file__), "..", "output", "metadata.json")
+
+
+def test_non_finite_values_become_none():
+    value = {"a": np.float64("nan"), "b": [math.inf, np.array([1.0, -np.inf])]}
+    assert to_native(value) == {"a": None, "b": [None, [1.0, None]]}
+
+
+def test_to_json_is_standard_json():
+    metadata = DatasetMetadata.from_dict(json.load(open(OUTPUT, encoding="utf-8")))
+    metadata.text_statistics = dict(metadata.text_statistics, avg_length=math.nan)
+    encoded = metadata.to_json()
+    assert "NaN" not in encoded
+    assert json.loads(encoded)["text_statistics"]["avg_length"] is None
+
+
+def test_example_output_uses_current_schema():
+    with open(OUTPUT, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["schema_version"] == SCHEMA_VERSION
+    assert DatasetMetadata.from_dict(data).to_dict() == data
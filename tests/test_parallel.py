@@ -0,0 +1,35 @@
+import pytest
+from metadata_generator import MetadataGenerator
+from parallel import split_csv_shards
+
+# 결측 레이블과 따옴표 안 줄바꿈이 있는 CSV (샤드마다 타입을 추론하면 결측 레이블이 든 샤드만 float 레이블이 됨)
+ROWS = [f'{i},"텍스트 {i}\n둘째 줄",{i % 3}' for i in range(30)]
+ROWS[17] = '17,"결측 레이블",'
+CSV = "ID,text,target\n" + "\n".join(ROWS) + "\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "train.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def _statistics(csv_path, **options):
+    return MetadataGenerator(csv_path, **options).compute_statistics()
+
+
+def test_shards_cover_file(csv_path):
+    header_end, shards = split_csv_shards(csv_path, 4)
+    assert len(shards) == 4
+    assert shards[0][0] == header_end
+    assert all(end == start for (_, end), (start, _) in zip(shards, shards[1:]))
+
+
+@pytest.mark.parametrize("num_workers", [2, 4])
+def test_parallel_matches_serial(csv_path, num_workers):
+    serial = _statistics(csv_path)
+    parallel = _statistics(csv_path, num_workers=num_workers, chunksize=5)
+    assert parallel == serial
+    assert "2.0" not in parallel["target_distribution"]["class_balance"]
+    assert parallel["total_samples"] == 30
@@ -0,0 +1,40 @@
+import pytest
+from preview import PREVIEW_CHUNKSIZE, preview_metadata
+
+
+@pytest.fixture
+def sorted_csv(tmp_path):
+    """레이블 순으로 정렬되어 앞부분이 전체를 대표하지 않는 CSV"""
+    path = tmp_path / "sorted.csv"
+    rows = [
+        f"{i},text {i},{i * 3 // (3 * PREVIEW_CHUNKSIZE)}"
+        for i in range(3 * PREVIEW_CHUNKSIZE)
+    ]
+    path.write_text("ID,text,target\n" + "\n".join(rows) + "\n")
+    return str(path)
+
+
+def test_complete_preview_covers_file(sorted_csv):
+    preview = preview_metadata(sorted_csv, sample_size=1000, budget_seconds=60, seed=0)
+
+    assert preview["preview"]["complete"] and preview["preview"]["scope"] == "file"
+    assert preview["total_samples"] == 3 * PREVIEW_CHUNKSIZE
+    assert sorted(preview["target_distribution"]["class_distribution"]) == [
+        "0",
+        "1",
+        "2",
+    ]
+
+
+def test_truncated_preview_is_labeled_prefix(sorted_csv):
+    # 첫 덩어리만 읽고 멈춤
+    preview = preview_metadata(sorted_csv, sample_size=1000, budget_seconds=0, seed=0)
+    info = preview["preview"]
+    target_distribution = preview["target_distribution"]
+
+    assert not info["complete"] and info["scope"] == "prefix"
+    assert info["rows_scanned"] == PREVIEW_CHUNKSIZE
+    # 전체 행 수만 파일 전체 추정이고, 개수와 신뢰구간은 읽은 앞부분 기준
+    assert preview["total_samples"] > info["rows_scanned"]
+    assert target_distribution["class_distribution"] == {"0": info["rows_scanned"]}
+    assert list(target_distribution["class_balance_ci"]) == ["0"]
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+from metadata_generator import MetadataGenerator
+
+# 덩어리(2행)마다 ID 컬럼 dtype이 달라지는 CSV: int, float(결측치), object(숫자가 아닌 ID)
+CSV = """ID,text,target
+1,첫 문장,0
+2,둘째 문장,1
+,결측 ID,0
+1,중복 ID,1
+x7,문자 ID,0
+2,또 중복,1
+"""
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_duplicate_ids_match_across_chunk_dtypes(tmp_path, chunksize):
+    path = tmp_path / "ids.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    metadata = MetadataGenerator(
+        str(path), chunksize=chunksize, quality=True
+    ).generate_full_metadata()
+
+    report = metadata["quality_report"]
+    assert report["duplicate_ids"] == 2
+    assert report["duplicate_id_rows"] == 2
+    assert report["missing_id_rows"] == 1
+
+
+def test_conflicts_with_duplicate_index():
+    base = pd.DataFrame(
+        {"ID": [1, 2, 3], "text": ["같은 문장", None, "다른 문장"], "target": [0, 1, 0]}
+    )
+    augmented = pd.DataFrame(
+        {"ID": [4, 5], "text": ["증강 문장", "같은 문장"], "target": [1, 1]}
+    )
+    # concat 결과는 인덱스 0, 1이 두 번씩 나옴
+    frame = pd.concat([base, augmented])
+
+    report = MetadataGenerator(frame, quality=True).generate_full_metadata()[
+        "quality_report"
+    ]
+
+    assert report["null_text_rows"] == 1
+    assert report["conflicting_texts"] == 1
+    assert report["conflicting_text_rows"] == 2
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".arrow"])
+def test_duplicate_ids_in_columnar_input(tmp_path, extension):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    table = pa.table(
+        {
+            "ID": [1, 2, 1, 3, 2],
+            "text": ["가", "나", "다", "라", "마"],
+            "target": [0, 1, 0, 1, 0],
+        }
+    )
+    path = str(tmp_path / f"ids{extension}")
+    if extension == ".parquet":
+        pa.parquet.write_table(table, path)
+    else:
+        pa.feather.write_feather(table, path)
+
+    report = MetadataGenerator(
+        path, chunksize=2, quality=True
+    ).generate_full_metadata()["quality_report"]
+
+    assert report["id_column"] == "ID"
+    assert report["duplicate_ids"] == 2
+    assert report["duplicate_id_rows"] == 2
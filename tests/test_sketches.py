@@ -0,0 +1,94 @@
+import math
+import numpy as np
+import pandas as pd
+from sketches import HeavyHitters, HyperLogLog, QuantileSketch, hash_texts
+
+
+def _chunks(values, size):
+    return [values[start : start + size] for start in range(0, len(values), size)]
+
+
+def test_quantile_sketch_merge_is_associative_and_within_alpha():
+    values = np.random.default_rng(0).lognormal(3, 1, 30_000).round()
+    sketches = []
+    for chunk in _chunks(values, 10_000):
+        sketch = QuantileSketch()
+        sketch.update(chunk)
+        sketches.append(sketch)
+    a, b, c = sketches
+    left = QuantileSketch().merge(a).merge(b).merge(c)
+    right = QuantileSketch().merge(a).merge(QuantileSketch().merge(b).merge(c))
+    assert left.buckets == right.buckets
+    assert left.zero_count == right.zero_count and left.count == len(values)
+
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        actual = ordered[math.floor(q * (len(values) - 1))]
+        estimate = left.quantile(q)
+        assert abs(estimate - actual) <= left.relative_accuracy * actual
+
+
+def test_hyperloglog_merge_and_standard_error():
+    texts = np.array([f"문장 {i}" for i in range(50_000)], dtype=object)
+    sketches = []
+    for chunk in _chunks(texts, 20_000):
+        sketch = HyperLogLog()
+        sketch.update_hashes(hash_texts(chunk))
+        sketches.append(sketch)
+    a, b, c = sketches
+    left = HyperLogLog().merge(a).merge(b).merge(c)
+    right = HyperLogLog().merge(c).merge(HyperLogLog().merge(b).merge(a))
+    whole = HyperLogLog()
+    whole.update_hashes(hash_texts(texts))
+    np.testing.assert_array_equal(left.registers, right.registers)
+    np.testing.assert_array_equal(left.registers, whole.registers)
+
+    # 결정적인 해시이므로 표준 오차의 3배 이내
+    assert abs(left.estimate() - len(texts)) <= 3 * left.relative_error * len(texts)
+
+
+def test_count_min_merge_and_overestimate_bound():
+    rng = np.random.default_rng(1)
+    texts = pd.Series(rng.zipf(1.5, 20_000) % 2000).astype(str)
+    sketches = []
+    for chunk in _chunks(texts, 7_000):
+        sketch = HeavyHitters(width=1 << 8)
+        sketch.update(chunk)
+        sketches.append(sketch)
+    merged = HeavyHitters(width=1 << 8)
+    for sketch in sketches:
+        merged.merge(sketch)
+    whole = HeavyHitters(width=1 << 8)
+    whole.update(texts)
+    np.testing.assert_array_equal(merged.table, whole.table)
+
+    actual = texts.value_counts()
+    estimates = merged._query(hash_texts(actual.index))
+    overestimates = estimates - actual.to_numpy()
+    assert (overestimates >= 0).all()
+    # 최대 (e / width) * N 을 넘는 항목은 확률 e^-depth 이하
+    beyond = overestimates > merged.epsilon * merged.total
+    assert beyond.mean() <= math.exp(-merged.depth)
+
+
+def test_heavy_hitter_ties_do_not_depend_on_chunk_order():
+    # 모든 텍스트가 두 번씩 나와 빈도가 같음
+    texts = pd.Series([f"동률 {i}" for i in range(30)] * 2)
+    serial = HeavyHitters(capacity=10)
+    for chunk in _chunks(texts, 7):
+        serial.update(chunk)
+    # 병렬 처리처럼 샤드마다 따로 누적한 뒤 다른 순서로 병합
+    shards = []
+    for chunk in _chunks(texts[::-1].reset_index(drop=True), 13):
+        shard = HeavyHitters(capacity=10)
+        shard.update(chunk)
+        shards.append(shard)
+    parallel = HeavyHitters(capacity=10)
+    for shard in shards:
+        parallel.merge(shard)
+
+    assert parallel.top(10) == serial.top(10)
+    assert [entry["count"] for entry in serial.top(10)] == [2] * 10
+    assert [entry["text"] for entry in serial.top(10)] == sorted(
+        entry["text"] for entry in serial.top(10)
+    )
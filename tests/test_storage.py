@@ -0,0 +1,33 @@
+import io
+import pytest
+from storage import FakeStorage, LocalStorage, StorageBackend
+
+
+def test_backend_interface_is_abstract():
+    class Incomplete(StorageBackend):
+        def folder_url(self, folder_id):
+            return folder_id
+
+    with pytest.raises(TypeError):
+        StorageBackend()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("make_storage", [FakeStorage, LocalStorage])
+def test_backends_round_trip(make_storage, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = make_storage()
+    folder_id = storage.create_folder("c-d")
+    token = storage.get_start_page_token()
+
+    (upload,) = storage.upload_streams(
+        [(io.BytesIO(b"ID,text,target\n"), "d.csv", "text/csv")], folder_id
+    )
+
+    assert upload["status"] == "uploaded"
+    assert storage.get_file(upload["id"])["name"] == "d.csv"
+    changes = [change for page, _ in storage.iter_changes(token) for change in page]
+    assert [change["fileId"] for change in changes] == [upload["id"]]
+    assert storage.delete_file(upload["id"])
+    assert storage.get_file(upload["id"]) is None
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from metadata_generator import MetadataGenerator
+from text_kernel import text_lengths_and_word_counts
+
+# 유니코드(한글, 이모지, 결합 문자, 전각/줄바꿈 없는 공백), 공백만 있는 텍스트, 여러 칸 공백, 결측치
+TEXTS = [
+    "안녕하세요",
+    "이것은   여러 칸   공백",
+    "  앞뒤 공백  ",
+    "   ",
+    "\t\n",
+    "",
+    "이모지 🙂 포함",
+    "결합 문자 é",
+    "전각　공백과\xa0NBSP",
+    "줄\n바꿈\r\n포함",
+    None,
+    "a b c d e f g",
+]
+
+
+def test_matches_str_len_and_split():
+    texts = pd.Series([t for t in TEXTS if t is not None])
+    lengths, word_counts = text_lengths_and_word_counts(texts)
+    np.testing.assert_array_equal(lengths, texts.str.len().to_numpy())
+    np.testing.assert_array_equal(word_counts, texts.str.split().str.len().to_numpy())
+
+
+def test_empty_series():
+    lengths, word_counts = text_lengths_and_word_counts(pd.Series([], dtype=object))
+    assert len(lengths) == 0 and len(word_counts) == 0
+
+
+def _baseline_text_statistics(texts):
+    """기존 generate_text_statistics와 같은 계산 (결측 텍스트는 pandas 기본 동작대로 제외)"""
+    lengths = texts.str.len()
+    word_counts = texts.str.split().str.len()
+    return {
+        "avg_length": lengths.mean(),
+        "max_length": lengths.max(),
+        "min_length": lengths.min(),
+        "total_words": word_counts.sum(),
+        "avg_words": word_counts.mean(),
+    }
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 4])
+def test_metadata_matches_baseline(tmp_path, chunksize):
+    frame = pd.DataFrame(
+        {"ID": range(len(TEXTS)), "text": TEXTS, "target": [0, 1] * (len(TEXTS) // 2)}
+    )
+    source = frame
+    if chunksize:
+        source = str(tmp_path / "texts.csv")
+        frame.to_csv(source, index=False)
+        # CSV로 읽으면 빈 문자열과 공백만 있는 따옴표 필드가 pandas 규칙대로 바뀌므로 같은 방식으로 읽은 값과 비교
+        frame = pd.read_csv(source, dtype={"text": str})
+    statistics = MetadataGenerator(source, chunksize=chunksize).compute_statistics()
+    expected = _baseline_text_statistics(frame["text"])
+    assert statistics["text_statistics"] == pytest.approx(expected)
@@ -0,0 +1,19 @@
+import os
+import pytest
+
+pytestmark = pytest.mark.usefixtures("no_sleep")
+
+
+def test_chunked_upload_resumes_after_failures(drive, tmp_path):
+    manager, state = drive
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    before = dict(state.failures)
+
+    file = manager.upload_file(str(path))
+
+    assert state.contents[file["id"]] == data
+    # 받은 위치부터 이어 올리기(308)와 같은 청크 재시도(503)가 모두 일어났는지
+    assert state.failures[308] > before[308]
+    assert state.failures[503] > before[503]
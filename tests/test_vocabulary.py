@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from metadata_generator import MetadataGenerator
+from vocabulary import GroupedSpaceSaving
+
+
+def _summary(items, groups, capacity, chunksize=500):
+    """(그룹, 항목) 배열을 chunksize개 단위 정확한 개수 표로 나누어 누적한 요약"""
+    summary = GroupedSpaceSaving(capacity)
+    for start in range(0, len(items), chunksize):
+        counts = (
+            pd.DataFrame(
+                {
+                    "group": groups[start : start + chunksize],
+                    "item": items[start : start + chunksize],
+                }
+            )
+            .value_counts(sort=False)
+            .rename("count")
+            .reset_index()
+        )
+        summary.update(counts)
+    return summary
+
+
+def _random_items(seed, size=6000):
+    rng = np.random.default_rng(seed)
+    items = rng.zipf(1.3, size) % 500
+    groups = np.where(rng.random(size) < 0.3, "a", "b").astype(object)
+    return items.astype(object), groups
+
+
+def test_merged_summary_respects_error_bound():
+    items_a, groups_a = _random_items(0)
+    items_b, groups_b = _random_items(1)
+    capacity = 20
+    merged = _summary(items_a, groups_a, capacity).merge(
+        _summary(items_b, groups_b, capacity)
+    )
+
+    actual = (
+        pd.DataFrame(
+            {
+                "group": np.r_[groups_a, groups_b],
+                "item": np.r_[items_a, items_b],
+            }
+        )
+        .value_counts()
+        .rename("count")
+        .reset_index()
+    )
+    for group, rows in actual.groupby("group"):
+        table = merged.table[merged.table["group"] == group].set_index("item")
+        floor = merged.floors[group]
+        assert len(table) <= capacity
+        assert floor <= rows["count"].sum() / capacity
+        for item, count in zip(rows["item"], rows["count"]):
+            if item in table.index:
+                # 보관된 항목: count - error <= 실제 개수 <= count
+                assert table.at[item, "count"] - table.at[item, "error"] <= count
+                assert count <= table.at[item, "count"]
+            else:
+                assert count <= floor
+
+
+def test_merge_is_exact_within_capacity():
+    items_a, groups_a = _random_items(2, size=300)
+    items_b, groups_b = _random_items(3, size=300)
+    merged = _summary(items_a, groups_a, 1000).merge(_summary(items_b, groups_b, 1000))
+    whole = _summary(np.r_[items_a, items_b], np.r_[groups_a, groups_b], 1000)
+
+    def _counts(summary):
+        return summary.table.set_index(["group", "item"])["count"].sort_index()
+
+    pd.testing.assert_series_equal(_counts(merged), _counts(whole))
+    assert (merged.table["error"] == 0).all()
+    assert merged.floors == {"a": 0, "b": 0}
+
+
+def test_vocabulary_with_duplicate_index():
+    base = pd.DataFrame({"text": ["사과 배", None, "배 포도"], "target": [0, 1, 1]})
+    augmented = pd.DataFrame({"text": ["사과 사과", "포도"], "target": [1, 0]})
+    # concat 결과는 인덱스 0, 1이 두 번씩 나옴
+    frame = pd.concat([base, augmented])
+
+    result = MetadataGenerator(frame, vocabulary=True).generate_full_metadata()[
+        "vocabulary_statistics"
+    ]
+
+    def _tokens(summary):
+        return {entry["token"]: entry["count"] for entry in summary["top_tokens"]}
+
+    assert _tokens(result) == {"사과": 3, "배": 2, "포도": 2}
+    assert _tokens(result["per_class"]["0"]) == {"사과": 1, "배": 1, "포도": 1}
+    assert _tokens(result["per_class"]["1"]) == {"사과": 2, "배": 1, "포도": 1}
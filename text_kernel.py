@@ -0,0 +1,105 @@
+import numpy as np
+
+# str.split()과 동일한 공백 판정을 위한 코드포인트 조회 테이블
+# (유니코드 공백 문자는 모두 U+3000 이하이므로 그 이상은 마지막 칸(False)으로 보냄)
+_MAX_SPACE_CODEPOINT = 0x3000
+_IS_SPACE = np.array(
+    [chr(c).isspace() for c in range(_MAX_SPACE_CODEPOINT + 1)] + [False]
+)
+# hash_code_points의 위치별 키 (필요한 길이만큼 늘려 가며 재사용)
+_POSITION_KEYS = np.zeros(0, dtype=np.uint64)
+
+
+def code_points(texts):
+    """
+    텍스트 컬럼 전체를 하나의 코드포인트 배열로 이어붙여 반환
+
+    texts: 결측치가 없는 문자열 Series
+    반환: (codepoints uint32 배열, 행별 길이 int64 배열)
+    """
+    lengths = texts.str.len().to_numpy(dtype=np.int64)
+    joined = "".join(texts.to_numpy(dtype=object))
+    codepoints = np.frombuffer(
+        joined.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+    )
+    return codepoints, lengths
+
+
+def is_space(codepoints):
+    """코드포인트 배열의 각 문자가 str.isspace() 기준 공백인지 여부"""
+    return _IS_SPACE[np.minimum(codepoints, _MAX_SPACE_CODEPOINT + 1)]
+
+
+def count_words(codepoints, lengths):
+    """code_points 결과에서 행별 공백 기준 단어 수 계산 (str.split().str.len()과 동일)"""
+    num_rows = len(lengths)
+    if num_rows == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    spaces = is_space(codepoints)
+
+    # 각 행의 시작 위치에서는 직전 문자를 공백으로 간주
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    prev_is_space = np.empty_like(spaces)
+    prev_is_space[0] = True
+    prev_is_space[1:] = spaces[:-1]
+    prev_is_space[starts[lengths > 0]] = True
+
+    word_starts = np.flatnonzero(~spaces & prev_is_space)
+    rows = np.searchsorted(ends, word_starts, side="right")
+    return np.bincount(rows, minlength=num_rows).astype(np.int64)
+
+
+def text_lengths_and_word_counts(texts):
+    """
+    텍스트 컬럼 전체의 문자 길이와 공백 기준 단어 수를 한 번에 계산
+
+    행별 리스트를 만들지 않고 전체 텍스트를 하나의 코드포인트 배열로 이어붙여
+    단어 시작 위치(공백이 아닌 문자 중 행 시작이거나 직전 문자가 공백인 위치)를 센다.
+    결과는 str.len(), str.split().str.len()과 동일하다.
+
+    texts: 결측치가 없는 문자열 Series
+    반환: (lengths, word_counts) int64 numpy 배열
+    """
+    codepoints, lengths = code_points(texts)
+    return lengths, count_words(codepoints, lengths)
+
+
+def mix64(x):
+    """splitmix64 마무리 함수로 uint64 배열의 비트를 고르게 섞음 (첫 연산 이후는 제자리 연산)"""
+    x = x ^ (x >> np.uint64(30))
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _position_keys(size):
+    """
+    위치별 64비트 홀수 키 (위치 번호를 섞은 값이라 프로세스와 무관하게 같고, 더 긴 행이 나오면 늘림)
+    """
+    global _POSITION_KEYS
+    if len(_POSITION_KEYS) < size:
+        keys = mix64(np.arange(max(size, 1024), dtype=np.uint64))
+        keys |= np.uint64(1)
+        _POSITION_KEYS = keys
+    return _POSITION_KEYS
+
+
+def hash_code_points(codepoints, lengths):
+    """
+    code_points 결과에서 행별 64비트 텍스트 해시 계산 (행별 문자열 인코딩 없이 벡터화)
+
+    행마다 (코드포인트 + 1) x 위치별 키의 합(multilinear 해시)을 누적합 한 번으로 구한 뒤
+    길이와 함께 섞는다. 같은 텍스트는 덩어리/프로세스와 무관하게 같은 해시를 갖는다.
+    """
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    positions = np.arange(len(codepoints)) - np.repeat(starts, lengths)
+    terms = _position_keys(int(lengths.max(initial=0)))[positions]
+    terms *= codepoints.astype(np.uint64) + np.uint64(1)
+    sums = np.zeros(len(codepoints) + 1, dtype=np.uint64)
+    np.cumsum(terms, out=sums[1:])
+    return mix64((sums[ends] - sums[starts]) ^ mix64(lengths.astype(np.uint64)))
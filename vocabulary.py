@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+from sketches import HyperLogLog, hash_texts
+from text_kernel import code_points, is_space
+
+# 문자 bigram은 두 코드포인트(각 21비트)를 정수 하나로 묶어 세고 결과에서만 문자열로 변환
+_CODEPOINT_BITS = 21
+_CODEPOINT_MASK = (1 << _CODEPOINT_BITS) - 1
+# 전체 통계는 그룹이 하나뿐인 요약으로 관리
+_ALL = "all"
+
+
+class GroupedSpaceSaving:
+    """
+    그룹(타겟 레이블)별 SpaceSaving 빈도 요약을 하나의 표로 관리하는 병합 가능한 누적기
+
+    그룹마다 개수가 큰 항목을 최대 capacity개만 보관한다. 보관된 항목의 개수는 실제보다
+    최대 error만큼 크고, 보관되지 않은 항목의 실제 개수는 그룹의 floor 이하이며
+    floor는 그룹 전체 개수 / capacity를 넘지 않는다. 모든 그룹을 표 연산 한 번으로 병합한다.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.table = pd.DataFrame(
+            {
+                "group": pd.Series(dtype=object),
+                "item": pd.Series(dtype=object),
+                "count": pd.Series(dtype=np.int64),
+                "error": pd.Series(dtype=np.int64),
+            }
+        )
+        self.floors = {}
+
+    def update(self, counts):
+        """group, item, count 컬럼을 가진 덩어리 하나의 정확한 개수 표를 누적"""
+        chunk = GroupedSpaceSaving(self.capacity)
+        chunk.table = counts.assign(error=0)[["group", "item", "count", "error"]]
+        chunk.floors = dict.fromkeys(counts["group"].unique().tolist(), 0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """다른 요약을 병합 (한쪽에 없는 항목은 그쪽 floor만큼 있었다고 보고 추정)"""
+        merged = pd.merge(
+            self.table,
+            other.table,
+            on=["group", "item"],
+            how="outer",
+            sort=False,
+            suffixes=("_a", "_b"),
+        )
+        floor_a = merged["group"].map(self.floors).fillna(0)
+        floor_b = merged["group"].map(other.floors).fillna(0)
+        table = pd.DataFrame(
+            {
+                "group": merged["group"],
+                "item": merged["item"],
+                "count": merged["count_a"].fillna(floor_a)
+                + merged["count_b"].fillna(floor_b),
+                "error": merged["error_a"].fillna(floor_a)
+                + merged["error_b"].fillna(floor_b),
+            }
+        ).astype({"count": np.int64, "error": np.int64})
+
+        # 그룹별 상위 capacity개만 남기고, 버린 항목의 최대 개수를 floor에 반영
+        rank = table.groupby("group", sort=False)["count"].rank(
+            method="first", ascending=False
+        )
+        keep = rank <= self.capacity
+        dropped = table[~keep].groupby("group", sort=False)["count"].max().to_dict()
+        floors = {}
+        for group in dict.fromkeys(list(self.floors) + list(other.floors)):
+            floors[group] = max(
+                self.floors.get(group, 0) + other.floors.get(group, 0),
+                int(dropped.get(group, 0)),
+            )
+        self.table = table[keep].reset_index(drop=True)
+        self.floors = floors
+        return self
+
+    def top(self, k, key):
+        """그룹별 상위 k개 항목 목록 (항목은 key 이름으로 기록)"""
+        ordered = self.table.sort_values("count", ascending=False, kind="stable")
+        return {
+            group: [
+                {key: item, "count": int(count), "max_overestimate": int(error)}
+                for item, count, error in rows[["item", "count", "error"]]
+                .head(k)
+                .itertuples(index=False)
+            ]
+            for group, rows in ordered.groupby("group", sort=False)
+        }
+
+
+def _bigram_text(key):
+    return chr(key >> _CODEPOINT_BITS) + chr(key & _CODEPOINT_MASK)
+
+
+class VocabularyAccumulator:
+    """
+    어휘 크기, 빈출 토큰, 빈출 문자 bigram 통계를 위한 병합 가능한 누적기 (전체 및 타겟 레이블별)
+
+    메모리는 데이터 크기와 무관하게 capacity(전체), class_capacity(레이블별) 개 항목과
+    HyperLogLog 레지스터로 제한된다.
+    """
+
+    def __init__(
+        self,
+        capacity=1000,
+        class_capacity=200,
+        top_k=20,
+        precision=14,
+        class_precision=12,
+    ):
+        self.top_k = top_k
+        self.class_precision = class_precision
+        self.tokens = GroupedSpaceSaving(capacity)
+        self.class_tokens = GroupedSpaceSaving(class_capacity)
+        self.bigrams = GroupedSpaceSaving(capacity)
+        self.class_bigrams = GroupedSpaceSaving(class_capacity)
+        self.vocabulary = HyperLogLog(precision)
+        self.class_vocabulary = {}
+
+    def _class_vocabulary(self, label):
+        if label not in self.class_vocabulary:
+            self.class_vocabulary[label] = HyperLogLog(self.class_precision)
+        return self.class_vocabulary[label]
+
+    def update(self, texts, targets):
+        """결측치를 제외한 텍스트 Series와 같은 행의 타겟을 누적"""
+        # 토큰의 타겟은 행별 토큰 수만큼 위치로 반복 (인덱스가 중복될 수 있으므로 인덱스로 맞추지 않음)
+        split = texts.str.split()
+        tokens = split.explode().dropna()
+        token_targets = np.repeat(
+            targets.to_numpy(dtype=object),
+            split.str.len().fillna(0).to_numpy(dtype=np.int64),
+        )
+        class_counts = self._update_counts(
+            self.tokens, self.class_tokens, tokens.to_numpy(dtype=object), token_targets
+        )
+
+        # 어휘 크기: 덩어리의 고유 토큰 해시를 HyperLogLog에 누적
+        self.vocabulary.update_hashes(hash_texts(tokens.unique()))
+        for label, rows in class_counts.groupby("group", sort=False):
+            self._class_vocabulary(label).update_hashes(hash_texts(rows["item"]))
+
+        # 문자 bigram: 같은 행에서 이웃한 두 문자가 모두 공백이 아닌 위치
+        codepoints, lengths = code_points(texts)
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        spaces = is_space(codepoints)
+        valid = (rows[:-1] == rows[1:]) & ~spaces[:-1] & ~spaces[1:]
+        keys = (
+            codepoints[:-1][valid].astype(np.int64) << _CODEPOINT_BITS
+        ) | codepoints[1:][valid]
+        bigram_targets = targets.to_numpy(dtype=object)[rows[:-1][valid]]
+        self._update_counts(self.bigrams, self.class_bigrams, keys, bigram_targets)
+
+    def _update_counts(self, overall, per_class, items, item_targets):
+        """항목 배열의 덩어리 내 정확한 개수를 전체/레이블별 요약에 누적하고 레이블별 개수 표 반환"""
+        # 레이블과 항목을 정수 코드로 바꾸어 (레이블, 항목) 쌍을 한 번의 정수 정렬로 셈
+        # (결측 레이블은 코드 -1이므로 레이블별 집계에서 제외)
+        group_codes, groups = pd.factorize(item_targets)
+        item_codes, unique_items = pd.factorize(items)
+        valid = group_codes >= 0
+        pairs, pair_counts = np.unique(
+            group_codes[valid].astype(np.int64) * len(unique_items) + item_codes[valid],
+            return_counts=True,
+        )
+        counts = pd.DataFrame(
+            {
+                "group": np.asarray(groups, dtype=object)[pairs // len(unique_items)],
+                "item": np.asarray(unique_items, dtype=object)[
+                    pairs % len(unique_items)
+                ],
+                "count": pair_counts.astype(np.int64),
+            }
+        )
+        totals = np.bincount(item_codes, minlength=len(unique_items))
+        per_class.update(counts)
+        overall.update(
+            pd.DataFrame(
+                {
+                    "group": _ALL,
+                    "item": np.asarray(unique_items, dtype=object),
+                    "count": totals.astype(np.int64),
+                }
+            )
+        )
+        return counts
+
+    def merge(self, other):
+        """다른 누적기의 상태를 병합"""
+        self.tokens.merge(other.tokens)
+        self.class_tokens.merge(other.class_tokens)
+        self.bigrams.merge(other.bigrams)
+        self.class_bigrams.merge(other.class_bigrams)
+        self.vocabulary.merge(other.vocabulary)
+        for label, vocabulary in other.class_vocabulary.items():
+            self._class_vocabulary(label).merge(vocabulary)
+        return self
+
+    def _summary(self, vocabulary, tokens, bigrams):
+        return {
+            "vocabulary_size": round(vocabulary.estimate()),
+            "top_tokens": tokens,
+            "top_bigrams": [
+                dict(entry, bigram=_bigram_text(entry["bigram"])) for entry in bigrams
+            ],
+        }
+
+    def result(self):
+        """vocabulary_statistics 형식의 결과 반환"""
+        tokens = self.tokens.top(self.top_k, "token")
+        bigrams = self.bigrams.top(self.top_k, "bigram")
+        class_tokens = self.class_tokens.top(self.top_k, "token")
+        class_bigrams = self.class_bigrams.top(self.top_k, "bigram")
+        result = self._summary(
+            self.vocabulary, tokens.get(_ALL, []), bigrams.get(_ALL, [])
+        )
+        result["per_class"] = {
+            str(label): self._summary(
+                vocabulary,
+                class_tokens.get(label, []),
+                class_bigrams.get(label, []),
+            )
+            for label, vocabulary in self.class_vocabulary.items()
+        }
+        result["error_bounds"] = {
+            "vocabulary_size_relative_std_error": self.vocabulary.relative_error,
+            "class_vocabulary_size_relative_std_error": HyperLogLog(
+                self.class_precision
+            ).relative_error,
+            # 목록에 없는 항목의 실제 개수 상한 (목록의 항목은 count - max_overestimate 이상)
+            "unlisted_token_max_count": self.tokens.floors.get(_ALL, 0),
+            "unlisted_bigram_max_count": self.bigrams.floors.get(_ALL, 0),
+        }
+        result["memory_caps"] = {
+            "capacity": self.tokens.capacity,
+            "class_capacity": self.class_tokens.capacity,
+        }
+        return result